@@ -0,0 +1,386 @@
+"""
+benchmarks.py
+
+Medições de desempenho das buscas e operações de reserva.
+Execute com: python benchmarks.py [batch|pricing|trusted|memory|holds|seats ...]
+"""
+from datetime import datetime, timedelta
+import gc
+import sys
+import threading
+import tracemalloc
+from random import Random, choice, randint, seed
+from time import perf_counter
+
+from ycaro_airlines.models import Booking, BookingStatus, Flight, cities
+from ycaro_airlines.models.booking_store import BookingRecordStore
+from ycaro_airlines.models.timing_wheel import TimingWheel
+from ycaro_airlines.observers import DynamicPricingEngine
+from ycaro_airlines.strategies.fare_curves import (
+    CombinedFareCurve,
+    LoadFactorFareCurve,
+    TimeToDepartureFareCurve,
+)
+
+
+def popular_voos(quantidade: int):
+    """Cria voos aleatórios (sem o custo de mock_flight a cada chamada)"""
+    agora = datetime.now()
+    for _ in range(quantidade):
+        origem = choice(cities)
+        destino = choice([c for c in cities if c != origem])
+        partida = agora + timedelta(days=randint(1, 30), hours=randint(0, 23))
+        voo = Flight(
+            From=origem,
+            To=destino,
+            departure_date=partida,
+            arrival_date=partida + timedelta(hours=randint(1, 5)),
+            price=randint(100, 400),
+        )
+        Flight.flights[voo.id] = voo
+
+
+def benchmark_batch_search(total_voos: int = 20_000, total_buscas: int = 2_000):
+    """Compara batch_search com a execução sequencial de list_flights"""
+    print("=" * 60)
+    print(f"BATCH SEARCH - {total_buscas} buscas sobre {total_voos} voos")
+    print("=" * 60)
+
+    seed(42)
+    popular_voos(total_voos)
+    agora = datetime.now()
+
+    buscas = []
+    for _ in range(total_buscas):
+        origem = choice(cities)
+        destino = choice([c for c in cities if c != origem])
+        dia = agora + timedelta(days=randint(1, 30))
+        buscas.append({
+            "city_from": origem,
+            "city_to": destino,
+            "date_departure_gte": dia.replace(hour=0, minute=0, second=0, microsecond=0),
+            "date_departure_lte": dia.replace(hour=23, minute=59, second=59, microsecond=0),
+            "price_lte": float(randint(150, 400)),
+        })
+
+    inicio = perf_counter()
+    sequencial = [Flight.list_flights(**busca) for busca in buscas]
+    tempo_sequencial = perf_counter() - inicio
+
+    inicio = perf_counter()
+    lote = Flight.batch_search(buscas)
+    tempo_lote = perf_counter() - inicio
+
+    assert [sorted(v.id for v in r) for r in lote] == [sorted(v.id for v in r) for r in sequencial]
+
+    print(f"   Sequencial: {total_buscas / tempo_sequencial:,.0f} buscas/s ({tempo_sequencial:.3f}s)")
+    print(f"   Em lote:    {total_buscas / tempo_lote:,.0f} buscas/s ({tempo_lote:.3f}s)")
+    print(f"   Ganho:      {tempo_sequencial / tempo_lote:.2f}x\n")
+
+
+def benchmark_dynamic_pricing(total_voos: int = 1_000, operacoes: int = 200_000):
+    """Mede a reprecificação incremental durante uma rajada de reservas"""
+    print("=" * 60)
+    print(f"PRECIFICAÇÃO DINÂMICA - {operacoes} vendas/liberações em {total_voos} voos")
+    print("=" * 60)
+
+    seed(7)
+    Flight.flights.clear()
+    popular_voos(total_voos)
+    voos = list(Flight.flights.values())
+
+    motor = DynamicPricingEngine(
+        CombinedFareCurve(LoadFactorFareCurve(), TimeToDepartureFareCurve()),
+        Flight.events,
+    ).attach()
+
+    ocupados = {voo.id: [] for voo in voos}
+    inicio = perf_counter()
+    try:
+        for booking_id in range(operacoes):
+            voo = choice(voos)
+            assentos = ocupados[voo.id]
+            # 70% vendas, 30% liberações: a ocupação sobe ao longo da rajada
+            if assentos and randint(1, 10) <= 3:
+                voo.open_seat(assentos.pop())
+            elif voo.seats_available:
+                assento = voo.capacity - voo.seats_available
+                while voo.occupy_seat(booking_id, assento) is None:
+                    assento = (assento + 1) % voo.capacity
+                assentos.append(assento)
+    finally:
+        motor.detach()
+    tempo = perf_counter() - inicio
+
+    print(f"   Reprecificações: {motor.reprice_count:,} em {tempo:.3f}s")
+    print(f"   Vazão: {motor.reprice_count / tempo:,.0f} reprecificações/s\n")
+
+
+def benchmark_trusted_construction(total_voos: int = 20_000, total_reservas: int = 200_000):
+    """Compara a construção normal com a construção confiável (snapshots)"""
+    print("=" * 60)
+    print(f"CONSTRUÇÃO CONFIÁVEL - {total_voos} voos e {total_reservas} reservas")
+    print("=" * 60)
+
+    agora = datetime.now()
+    voos = [
+        {
+            "From": cities[i % len(cities)],
+            "To": cities[(i + 1) % len(cities)],
+            "capacity": 255,
+            "departure": agora + timedelta(days=1 + i % 30),
+            "arrival": agora + timedelta(days=1 + i % 30, hours=2),
+            "price": 100.0 + i % 300,
+        }
+        for i in range(total_voos)
+    ]
+
+    # Os dois lados mantêm os voos vivos: senão o coletor de lixo pesa só
+    # no lado que guarda o resultado
+    inicio = perf_counter()
+    construidos = [
+        Flight(
+            From=voo["From"],
+            To=voo["To"],
+            capacity=voo["capacity"],
+            departure_date=voo["departure"],
+            arrival_date=voo["arrival"],
+            price=voo["price"],
+        )
+        for voo in voos
+    ]
+    tempo_normal = perf_counter() - inicio
+    del construidos
+    gc.collect()
+
+    inicio = perf_counter()
+    carregados = Flight.bulk_load(voos)
+    tempo_confiavel = perf_counter() - inicio
+
+    # Flight() monta o mapa de assentos na hora; bulk_load() adia. Montar os
+    # mapas dos carregados separa o ganho da validação do ganho do adiamento
+    inicio = perf_counter()
+    for voo in carregados:
+        voo.seats
+    tempo_mapas = perf_counter() - inicio
+
+    tempo_completo = tempo_confiavel + tempo_mapas
+    print(f"   Flight():              {total_voos / tempo_normal:,.0f} voos/s")
+    print(f"   bulk_load() + mapas:   {total_voos / tempo_completo:,.0f} voos/s")
+    print(f"   Ganho (validação):     {tempo_normal / tempo_completo:.2f}x")
+    print(f"   bulk_load():           {total_voos / tempo_confiavel:,.0f} voos/s")
+    print(f"   Ganho (mapa adiado):   {tempo_completo / tempo_confiavel:.2f}x")
+
+    reservas = [
+        {
+            "owner_id": i % 1_000,
+            # Booking() vende a classe tarifária: o voo precisa estar registrado
+            "flight_id": carregados[i % total_voos].id,
+            "passenger_name": f"Passageiro {i}",
+            "passenger_cpf": "123.456.789-00",
+            "price": 100.0 + i % 300,
+            "seat_id": None,
+        }
+        for i in range(total_reservas)
+    ]
+
+    inicio = perf_counter()
+    criadas = [Booking(**reserva) for reserva in reservas]
+    tempo_normal = perf_counter() - inicio
+    for reserva in criadas:
+        Booking.repository.remove(reserva.id)
+
+    inicio = perf_counter()
+    criadas = Booking.bulk_load(
+        {**reserva, "status": BookingStatus.booked} for reserva in reservas
+    )
+    tempo_confiavel = perf_counter() - inicio
+    for reserva in criadas:
+        Booking.repository.remove(reserva.id)
+    for voo in carregados:
+        Flight.flights.pop(voo.id)
+
+    print(f"   Booking():             {total_reservas / tempo_normal:,.0f} reservas/s")
+    print(f"   Booking.bulk_load():   {total_reservas / tempo_confiavel:,.0f} reservas/s")
+    print(f"   Ganho:                 {tempo_normal / tempo_confiavel:.2f}x\n")
+
+
+def reservas_sinteticas(quantidade: int, nomes_distintos: int = 50_000):
+    """Gera registros de reserva; nomes se repetem (clientes frequentes)"""
+    for i in range(quantidade):
+        cpf = f"{i % 10**11:011d}"
+        yield {
+            "owner_id": i % 100_000,
+            "flight_id": i % 20_000,
+            "passenger_name": f"Passageiro {i % nomes_distintos}",
+            "passenger_cpf": f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}",
+            "price": 100.0 + i % 300,
+            "seat_id": i % 255,
+        }
+
+
+def medir_memoria(construir) -> tuple[object, int]:
+    """Executa construir() e devolve (resultado, bytes alocados que continuam vivos)"""
+    tracemalloc.start()
+    try:
+        inicio, _ = tracemalloc.get_traced_memory()
+        resultado = construir()
+        fim, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, fim - inicio
+
+
+def benchmark_booking_memory(tamanhos=(1_000_000, 10_000_000), amostra_modelos: int = 100_000):
+    """
+    Compara a memória por reserva do modelo pydantic com o armazenamento colunar.
+
+    O armazenamento compacto é medido no tamanho total (BookingRecordStore.nbytes);
+    o modelo Booking é medido com tracemalloc em uma amostra e extrapolado
+    (10M modelos não cabem em memória).
+    """
+    print("=" * 60)
+    print("MEMÓRIA - Booking (pydantic) x BookingRecordStore")
+    print("=" * 60)
+
+    amostra = list(reservas_sinteticas(amostra_modelos))
+    modelos, bytes_modelos = medir_memoria(lambda: Booking.bulk_load(amostra))
+    por_modelo = bytes_modelos / amostra_modelos
+    for reserva in modelos:
+        Booking.repository.remove(reserva.id)
+    del modelos, amostra
+
+    print(f"   Booking:  {por_modelo:,.0f} bytes/reserva (amostra de {amostra_modelos:,})")
+
+    for tamanho in tamanhos:
+        inicio = perf_counter()
+        store = BookingRecordStore()
+        store.extend(reservas_sinteticas(tamanho))
+        tempo = perf_counter() - inicio
+        bytes_store = store.nbytes()
+        por_registro = bytes_store / tamanho
+
+        print(f"   {tamanho:,} reservas:")
+        print(f"      Store:   {bytes_store / 2**20:,.1f} MiB ({por_registro:,.1f} bytes/reserva, carga em {tempo:.1f}s)")
+        print(f"      Booking: ~{por_modelo * tamanho / 2**20:,.1f} MiB (estimado)")
+        print(f"      Redução: {por_modelo / por_registro:.1f}x")
+        del store
+    print()
+
+
+def benchmark_seat_holds(pendentes: int = 1_000_000, ttl: int = 900, ticks: int = 60):
+    """
+    Custo por tick de expirar holds de pagamento: timing wheel x varredura
+    completa de um dicionário id -> prazo (o que um job periódico faria).
+    """
+    print("=" * 60)
+    print(f"HOLDS DE ASSENTO - {pendentes:,} pendentes, ttl de {ttl}s")
+    print("=" * 60)
+
+    agora = [0.0]
+    roda = TimingWheel(tick=1.0, slots=ttl + 1, clock=lambda: agora[0])
+    prazos = {}
+    inicio = perf_counter()
+    for i in range(pendentes):
+        atraso = 1 + i % ttl
+        roda.schedule(i, atraso, lambda: None)
+        prazos[i] = atraso
+    print(f"   Agendamento: {perf_counter() - inicio:.2f}s")
+
+    inicio = perf_counter()
+    expirados_roda = 0
+    for segundo in range(1, ticks + 1):
+        agora[0] = segundo
+        expirados_roda += roda.advance()
+    tempo_roda = perf_counter() - inicio
+
+    inicio = perf_counter()
+    expirados_varredura = 0
+    for segundo in range(1, ticks + 1):
+        vencidos = [i for i, prazo in prazos.items() if prazo <= segundo]
+        for i in vencidos:
+            del prazos[i]
+        expirados_varredura += len(vencidos)
+    tempo_varredura = perf_counter() - inicio
+
+    assert expirados_roda == expirados_varredura
+    print(f"   {ticks} ticks, {expirados_roda:,} expirados")
+    print(f"   Timing wheel: {tempo_roda / ticks * 1000:,.2f} ms/tick")
+    print(f"   Varredura:    {tempo_varredura / ticks * 1000:,.2f} ms/tick")
+    print(f"   Speedup:      {tempo_varredura / tempo_roda:.0f}x\n")
+
+
+def benchmark_seat_contention(total_voos: int = 50, capacidade: int = 200,
+                              threads=(1, 2, 4, 8), tentativas: int = 40_000):
+    """
+    Várias sessões disputando os mesmos assentos ao mesmo tempo.
+    Verifica que nenhum assento é vendido duas vezes e mede reservas/s.
+    """
+    print("=" * 60)
+    print(f"CONCORRÊNCIA - {total_voos} voos x {capacidade} assentos")
+    print("=" * 60)
+
+    # Trocas de thread frequentes tornam as corridas muito mais prováveis
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for quantidade in threads:
+            partida = datetime.now() + timedelta(days=1)
+            voos = [
+                Flight(From="Maceio", To="Recife", capacity=capacidade,
+                       departure_date=partida, arrival_date=partida + timedelta(hours=1))
+                for _ in range(total_voos)
+            ]
+            ganhos: list[list[tuple[int, int]]] = [[] for _ in range(quantidade)]
+            inicio_sinal = threading.Barrier(quantidade)
+
+            def sessao(indice: int):
+                sorteio = Random(indice)
+                meus = ganhos[indice]
+                inicio_sinal.wait()
+                for tentativa in range(tentativas // quantidade):
+                    voo = voos[sorteio.randrange(total_voos)]
+                    assento = sorteio.randrange(capacidade)
+                    reserva = indice * tentativas + tentativa
+                    if voo.occupy_seat(reserva, assento) is not None:
+                        meus.append((voo.id, assento))
+
+            trabalhadores = [threading.Thread(target=sessao, args=(i,)) for i in range(quantidade)]
+            inicio = perf_counter()
+            for trabalhador in trabalhadores:
+                trabalhador.start()
+            for trabalhador in trabalhadores:
+                trabalhador.join()
+            tempo = perf_counter() - inicio
+
+            vendidos = [assento for lista in ganhos for assento in lista]
+            ocupados = sum(voo.capacity - voo.seats_available for voo in voos)
+            duplicados = len(vendidos) - len(set(vendidos))
+            assert duplicados == 0 and ocupados == len(vendidos)
+
+            print(f"   {quantidade} thread(s): {len(vendidos):,} reservas, "
+                  f"{tentativas / tempo:,.0f} tentativas/s, "
+                  f"{len(vendidos) / tempo:,.0f} reservas/s, {duplicados} duplicadas")
+    finally:
+        sys.setswitchinterval(intervalo)
+    print()
+
+
+BENCHMARKS = {
+    "batch": benchmark_batch_search,
+    "pricing": benchmark_dynamic_pricing,
+    "trusted": benchmark_trusted_construction,
+    "memory": benchmark_booking_memory,
+    "holds": benchmark_seat_holds,
+    "seats": benchmark_seat_contention,
+}
+
+
+def main(nomes: list[str]):
+    """Executa os benchmarks pedidos (todos, se nenhum for informado)"""
+    for nome in nomes or BENCHMARKS:
+        BENCHMARKS[nome]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,6 +1,9 @@
 from ycaro_airlines.views.account_menus import AccountsMenu, accounts_menu
-from ycaro_airlines.models import Flight, Customer
+from ycaro_airlines.models import Flight, Customer, Booking
+from ycaro_airlines.models.customer_service import CustomerServiceWorker
+from ycaro_airlines.models.flight_archive import ArchivalJob, FlightArchive
 from ycaro_airlines.app import App
+from ycaro_airlines.composites import NotificationService
 
 
 def main():
@@ -10,6 +13,9 @@ def main():
     
     test_user2 = Customer(username="maria") 
     test_user2.gain_loyalty_points(150)
+
+    # Atendente (check-in por CPF no balcão)
+    CustomerServiceWorker(username="atendente")
     
     # Criar voos mock
     for _ in range(15):
@@ -17,12 +23,27 @@ def main():
         
     # Debug - mostrar usuários criados
     print("=== USUÁRIOS DE TESTE ===")
+    # O repositório de usuários é compartilhado: atendentes não têm pontos
     for user in Customer.list():
-        print(f"Username: {user.username}, Pontos: {user.loyalty_points.points}")
+        if isinstance(user, Customer):
+            print(f"Username: {user.username}, Pontos: {user.loyalty_points.points}")
+        else:
+            print(f"Username: {user.username}, Atendente")
     print("========================")
     
-    myapp = App(AccountsMenu())
-    myapp.run()
+    # Tira periodicamente da memória os voos que já partiram
+    archival_job = ArchivalJob(FlightArchive("flight_archive.db"), interval=600)
+    # Expira as reservas cujo pagamento não foi concluído no prazo
+    Booking.holds.start()
+
+    # Entre uma tela e outra: arquivamento (mexe nos repositórios da UI) e
+    # avisos gerados pelos jobs de fundo
+    myapp = App(AccountsMenu(), tasks=[archival_job.run_pending, NotificationService.outbox.flush])
+    try:
+        myapp.run()
+    finally:
+        Booking.holds.stop()
+        archival_job.archive.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,686 @@
+"""
+test_booking_operations.py
+
+Testa as operações sobre reservas:
+1. JUNÇÃO RESERVA + VOO - Linhas formatadas e índice por cliente
+2. ÍNDICE POR VOO - Manifesto e notificação de atraso
+3. ÍNDICE POR CPF - Busca normalizada para check-in
+4. ESTADOS FLYWEIGHT - Estados compartilhados e código compacto
+5. ARMAZENAMENTO COMPACTO - Reservas em colunas com visões leves
+6. EVENT SOURCING - Fluxo de eventos com snapshots e recuperação
+7. CANCELAMENTO DE VOO - Cancelamento e reacomodação em lote
+8. PRAZO DE PAGAMENTO - Holds de assento com expiração por timing wheel
+9. CONCORRÊNCIA - Reserva de assentos sem venda duplicada
+10. LISTA DE ESPERA - Promoção automática por nível de fidelidade
+"""
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from itertools import count
+
+import pytest
+from rich.console import Console
+
+from ycaro_airlines.composites import NotificationService
+from ycaro_airlines.models import Booking, Customer, Flight
+from ycaro_airlines.models.booking import BookingStatus, normalize_cpf
+from ycaro_airlines.models.booking_store import BookingRecordStore
+from ycaro_airlines.models.flight import SEAT_LOCK_STRIPES
+from ycaro_airlines.models.flight_disruption import disrupt_flight
+from ycaro_airlines.models.loyalty import LoyaltyTier
+from ycaro_airlines.models.seat_hold import SeatHoldManager
+from ycaro_airlines.models.timing_wheel import TimingWheel
+from ycaro_airlines.observers import BookingEvent, BookingJournal
+from ycaro_airlines.states.booking_state import (
+    BOOKED,
+    CANCELLED,
+    CHECKED_IN,
+    BookedState,
+    CancelledState,
+    CheckedInState,
+    can_transition,
+)
+from ycaro_airlines.strategies.concrete_filters import SeatsAvailableFilterStrategy
+from ycaro_airlines.views.actions.booking_actions import book_lowest_fare
+
+
+def criar_voo(From: str, To: str, price: float, days: int = 1, capacity: int = 255) -> Flight:
+    """Cria um voo de teste e registra no dicionário global"""
+    departure = datetime.now() + timedelta(days=days)
+    flight = Flight(
+        From=From,
+        To=To,
+        capacity=capacity,
+        departure_date=departure,
+        arrival_date=departure + timedelta(hours=2),
+        price=price,
+    )
+    Flight.flights[flight.id] = flight
+    return flight
+
+
+def criar_reserva(flight: Flight, owner_id: int, cpf: str = "123.456.789-00", name: str = "Passageiro") -> Booking:
+    """Cria uma reserva de teste"""
+    return Booking(
+        owner_id=owner_id,
+        flight_id=flight.id,
+        passenger_name=name,
+        passenger_cpf=cpf,
+        price=flight.price,
+    )
+
+
+def test_joined_booking_rows():
+    """Testa a junção em lote de reservas com voos"""
+    print("=" * 60)
+    print("1. JUNÇÃO RESERVA + VOO - Linhas formatadas")
+    print("=" * 60)
+
+    cliente = Customer(username="join_test")
+    outro = Customer(username="join_other")
+    ida = criar_voo("Join A", "Join B", 100)
+    volta = criar_voo("Join B", "Join A", 100, days=3)
+
+    reservas = [criar_reserva(ida, cliente.id), criar_reserva(volta, cliente.id),
+                criar_reserva(ida, cliente.id)]
+    criar_reserva(ida, outro.id)
+
+    # Repositórios separados: clientes não aparecem na lista de reservas
+    assert all(isinstance(b, Booking) for b in Booking.list())
+
+    # Índice por cliente devolve só as reservas dele
+    assert Booking.list_customer_bookings(cliente.id) == reservas
+
+    linhas = Booking.customer_booking_rows(cliente.id)
+    assert [l.booking for l in linhas] == [str(b.id) for b in reservas]
+    assert linhas[1].From == "Join B" and linhas[1].status == "booked"
+    assert linhas[0].seat == "N/A"
+
+    # Troca de dono mantém o índice consistente
+    reservas[2].owner_id = outro.id
+    assert Booking.list_customer_bookings(cliente.id) == reservas[:2]
+    assert reservas[2] in Booking.list_customer_bookings(outro.id)
+
+    # Voo fora da memória não quebra a listagem
+    Flight.flights.pop(volta.id)
+    assert Booking.customer_booking_rows(cliente.id)[1].From == "N/A"
+
+    console = Console(record=True, width=120)
+    Booking.print_bookings_table(cliente.id, console)
+    reservas[0].print_booking_table(console)
+    assert "Join A" in console.export_text()
+    print("   ✅ Voos resolvidos uma vez por lote\n")
+
+
+def test_flight_booking_index():
+    """Testa o índice de reservas por voo"""
+    print("=" * 60)
+    print("2. ÍNDICE POR VOO - Manifesto e atraso")
+    print("=" * 60)
+
+    voo = criar_voo("Manifest A", "Manifest B", 100)
+    outro = criar_voo("Manifest A", "Manifest B", 120, days=2)
+    reservas = [criar_reserva(voo, owner_id=1, name=f"P{i}") for i in range(3)]
+
+    assert Booking.list_flight_bookings(voo.id) == reservas
+    assert [l.booking for l in Booking.flight_manifest(voo.id)] == [str(b.id) for b in reservas]
+
+    # Cancelamento tira do manifesto (mas continua no histórico do voo)
+    reservas[0].cancel_booking()
+    assert Booking.list_flight_bookings(voo.id) == reservas[1:]
+    assert len(Booking.list_flight_bookings(voo.id, include_cancelled=True)) == 3
+
+    # Troca de voo move a reserva entre os índices
+    reservas[1].flight_id = outro.id
+    assert Booking.list_flight_bookings(voo.id) == [reservas[2]]
+    assert Booking.list_flight_bookings(outro.id) == [reservas[1]]
+
+    # Remoção do repositório (ex.: arquivamento) também
+    Booking.repository.remove(reservas[2].id)
+    assert Booking.list_flight_bookings(voo.id) == []
+
+    assert NotificationService.notify_flight_delay_by_flight(outro.id, "18:00", "Manutenção") == 1
+    assert NotificationService.notify_flight_delay_by_flight(voo.id, "18:00", "Manutenção") == 0
+    print("   ✅ Passageiros do voo sem varrer todas as reservas\n")
+
+
+def test_cpf_index():
+    """Testa o índice de reservas por CPF"""
+    print("=" * 60)
+    print("3. ÍNDICE POR CPF - Check-in por CPF")
+    print("=" * 60)
+
+    voo = criar_voo("Cpf A", "Cpf B", 100)
+    primeira = criar_reserva(voo, owner_id=1, cpf="987.654.321-00")
+    segunda = criar_reserva(voo, owner_id=2, cpf="98765432100")
+    criar_reserva(voo, owner_id=1, cpf="111.222.333-44")
+
+    # Com ou sem pontuação, o CPF cai no mesmo lugar do índice
+    assert normalize_cpf("987.654.321-00") == "98765432100"
+    assert Booking.find_by_cpf("987.654.321-00") == [primeira, segunda]
+    assert Booking.find_by_cpf("98765432100") == [primeira, segunda]
+    assert Booking.find_by_cpf("000.000.000-00") == []
+
+    segunda.cancel_booking()
+    assert Booking.find_by_cpf("98765432100") == [primeira]
+    assert len(Booking.find_by_cpf("98765432100", include_cancelled=True)) == 2
+
+    # Correção do CPF atualiza o índice
+    primeira.passenger_cpf = "555.666.777-88"
+    assert Booking.find_by_cpf("98765432100") == []
+    assert Booking.find_by_cpf("55566677788") == [primeira]
+    print("   ✅ Reservas encontradas pelo CPF sem varredura\n")
+
+
+def test_flyweight_states():
+    """Testa os estados compartilhados e o código de status"""
+    print("=" * 60)
+    print("4. ESTADOS FLYWEIGHT - Código compacto")
+    print("=" * 60)
+
+    voo = criar_voo("State A", "State B", 100)
+    a = criar_reserva(voo, owner_id=1)
+    b = criar_reserva(voo, owner_id=1)
+
+    # Um único objeto por estado, compartilhado entre reservas
+    assert BookedState() is BookedState()
+    assert a.state is b.state is BookedState()
+    assert a.status_code == BOOKED and a.status is BookingStatus.booked
+
+    # Só o código é armazenado
+    dump = a.model_dump()
+    assert dump["status_code"] == BOOKED
+    assert "state" not in dump and "status" not in dump
+
+    # Tabela de transições
+    assert can_transition(BOOKED, "cancel") and can_transition(BOOKED, "check_in")
+    assert not can_transition(CANCELLED, "check_in")
+    assert not can_transition(CHECKED_IN, "cancel")
+
+    assert a.cancel_booking()
+    assert a.state is CancelledState() and a.status is BookingStatus.cancelled
+    assert not a.can_check_in() and not a.cancel_booking()
+    assert b.state is BookedState()
+
+    # Atribuição pelo enum legado continua funcionando
+    b.status = BookingStatus.checked_in
+    assert b.status_code == CHECKED_IN and not b.can_change_seat()
+    print("   ✅ Estados compartilhados e status em um único campo\n")
+
+
+def test_compact_booking_store():
+    """Testa o armazenamento colunar de reservas"""
+    print("=" * 60)
+    print("5. ARMAZENAMENTO COMPACTO - Colunas e visões")
+    print("=" * 60)
+
+    voo = criar_voo("Store A", "Store B", 100, capacity=10)
+    store = BookingRecordStore()
+    a = store.add(owner_id=1, flight_id=voo.id, passenger_name="Maria Silva",
+                  passenger_cpf="12345678900", price=100.0)
+    b = store.add(owner_id=2, flight_id=voo.id, passenger_name="Maria Silva",
+                  passenger_cpf="111.222.333-44", price=120.0, fare_class="Q")
+
+    # Mesma API de Booking, lendo direto das colunas
+    assert len(store) == 2 and store.get(a.id) == a
+    assert a.passenger_cpf == "123.456.789-00" and a.seat_id is None
+    assert b.fare_class == "Q" and a.fare_class is None
+    assert a.status is BookingStatus.booked and a.can_check_in()
+
+    # Nomes repetidos são o mesmo objeto (internados)
+    assert a.passenger_name is b.passenger_name
+
+    # Operações do State Pattern funcionam sobre a visão
+    assert a.reserve_seat(3)
+    assert a.seat_id == 3 and voo.seats[3].booking == a.id
+    assert a.check_in() and a.status is BookingStatus.checked_in
+    assert b.cancel_booking() and store.get(b.id).status_code == b.status_code
+
+    assert store.find_by_flight(voo.id) == [a]
+    assert len(store.find_by_flight(voo.id, include_cancelled=True)) == 2
+
+    assert store.remove(b.id) and store.get(b.id) is None and len(store) == 1
+    assert store.list() == [a]
+
+    # Ids vêm da sequência de Booking: nunca colidem com reservas reais
+    modelo = criar_reserva(voo, owner_id=3)
+    assert a.id != b.id and modelo.id not in (a.id, b.id)
+    assert store.get(modelo.id) is None
+
+    # Reacomodação move a linha no índice por voo
+    outro = criar_voo("Store A", "Store C", 100, capacity=10)
+    a.flight_id = outro.id
+    assert store.find_by_flight(voo.id) == [] and store.find_by_flight(outro.id) == [a]
+
+    # Conversão a partir de modelos Booking, mantendo os ids
+    segundo = criar_reserva(voo, owner_id=4)
+    copia = BookingRecordStore.from_bookings([segundo, modelo])
+    assert copia.get(modelo.id).owner_id == 3 and copia.get(segundo.id).owner_id == 4
+    assert copia.get(modelo.id).to_booking_fields()["passenger_cpf"] == "123.456.789-00"
+    assert copia.find_by_flight(voo.id) == [copia.get(modelo.id), copia.get(segundo.id)]
+    with pytest.raises(ValueError):
+        copia.add(owner_id=5, flight_id=voo.id, passenger_name="X",
+                  passenger_cpf="12345678900", price=1.0, id=modelo.id)
+    assert store.nbytes() > 0
+    print("   ✅ Reservas compactas com a API de Booking\n")
+
+
+def test_booking_event_sourcing(tmp_path):
+    """Testa o fluxo de eventos das reservas e a reconstrução por snapshot"""
+    print("=" * 60)
+    print("6. EVENT SOURCING - Snapshots e recuperação")
+    print("=" * 60)
+
+    path = str(tmp_path / "bookings.jsonl")
+    journal = BookingJournal(snapshot_every=3, path=path).attach(Booking.events)
+    try:
+        voo = criar_voo("Event A", "Event B", 100, capacity=10)
+        a = criar_reserva(voo, owner_id=1, name="Ana")
+        b = criar_reserva(voo, owner_id=2, name="Bruno")
+        assert a.reserve_seat(2)
+        assert a.check_in()
+        assert b.cancel_booking()
+    finally:
+        journal.detach()
+
+    # Depois do detach nada mais é registrado
+    criar_reserva(voo, owner_id=3)
+    assert journal.sequence == 5
+
+    # Auditoria: "o que aconteceu com a reserva a?"
+    eventos = [record.event for record in journal.history(a.id)]
+    assert eventos == [BookingEvent.CREATED, BookingEvent.SEAT_RESERVED, BookingEvent.CHECKED_IN]
+    assert [r.sequence for r in journal.since(3)] == [4, 5]
+
+    # Snapshot a cada 3 eventos; reconstrução parte dele
+    assert [s.sequence for s in journal.snapshots] == [3]
+    estado = journal.rebuild()
+    assert estado[a.id]["status_code"] == CHECKED_IN and estado[a.id]["seat_id"] == 2
+    assert estado[b.id]["status_code"] == CANCELLED
+    assert journal.rebuild(upto=2)[a.id]["seat_id"] is None
+    assert journal.current(a.id) == estado[a.id]
+
+    # Recuperação a partir do disco: snapshot + cauda
+    recuperado = BookingJournal.recover(path)
+    assert recuperado.sequence == 5 and recuperado.rebuild() == estado
+    assert [r.event for r in recuperado.history(b.id)][-1] is BookingEvent.CANCELLED
+
+    # O snapshot guarda a posição do fluxo: a recuperação nem lê o que vem antes
+    with open(path + ".snapshot", encoding="utf-8") as file:
+        posicao = json.load(file)["offset"]
+    with open(path, "rb") as file:
+        conteudo = file.read()
+    assert posicao == len(b"".join(conteudo.splitlines(keepends=True)[:3]))
+    with open(path, "wb") as file:
+        file.write(b"x" * posicao + conteudo[posicao:])
+    assert BookingJournal.recover(path).rebuild() == estado
+    assert not os.path.exists(path + ".snapshot.tmp")
+
+    # Queda no meio de um append: o evento incompleto é descartado e cortado
+    with open(path, "ab") as file:
+        file.write(b'{"sequence": 6, "booking_id": ')
+    recuperado = BookingJournal.recover(path)
+    assert recuperado.sequence == 5 and recuperado.rebuild() == estado
+    assert os.path.getsize(path) == len(conteudo)
+
+    # As reservas voltam para a memória pelo caminho confiável
+    for booking in (a, b):
+        Booking.repository.remove(booking.id)
+    # Reserva criada antes do journal: só há o cancelamento, sem CREATED
+    anterior = criar_reserva(voo, owner_id=4)
+    recuperado.append(anterior.id, BookingEvent.CANCELLED)
+    assert recuperado.current(anterior.id) == {"status_code": CANCELLED}
+
+    restauradas = {booking.id: booking for booking in recuperado.restore_bookings()}
+    assert restauradas.keys() == {a.id, b.id}
+    assert Booking.get(anterior.id) is anterior
+    assert restauradas[a.id].state is CheckedInState() and restauradas[a.id].seat_id == 2
+    assert Booking.get(b.id).status is BookingStatus.cancelled
+    assert restauradas[a.id] in Booking.list_flight_bookings(voo.id)
+    print("   ✅ Histórico, snapshots e recuperação das reservas\n")
+
+
+def test_flight_disruption(monkeypatch):
+    """Testa o cancelamento de um voo com reacomodação em lote"""
+    print("=" * 60)
+    print("7. CANCELAMENTO DE VOO - Reacomodação em lote")
+    print("=" * 60)
+
+    cancelado = criar_voo("Disrupt A", "Disrupt B", 100, days=1, capacity=5)
+    proximo = criar_voo("Disrupt A", "Disrupt B", 120, days=2, capacity=2)
+    depois = criar_voo("Disrupt A", "Disrupt B", 150, days=3, capacity=1)
+    outra_rota = criar_voo("Disrupt A", "Disrupt C", 90, days=2, capacity=10)
+
+    reservas = [criar_reserva(cancelado, owner_id=i, name=f"P{i}") for i in range(4)]
+    for seat_id, booking in enumerate(reservas):
+        assert booking.reserve_seat(seat_id)
+    assert reservas[0].check_in()
+    ja_cancelada = criar_reserva(cancelado, owner_id=9)
+    ja_cancelada.cancel_booking()
+    # Um assento do próximo voo já está ocupado
+    criar_reserva(proximo, owner_id=8).reserve_seat(0)
+
+    # Reservas ainda não pagas: uma é reacomodada, a outra cancelada
+    agora = [0.0]
+    holds = SeatHoldManager(ttl=timedelta(minutes=15), clock=lambda: agora[0])
+    monkeypatch.setattr(Booking, "holds", holds)
+    holds.hold(reservas[1])
+    holds.hold(reservas[2])
+    agora[0] = 10 * 60
+
+    journal = BookingJournal(snapshot_every=0).attach(Booking.events)
+    try:
+        resultado = disrupt_flight(cancelado.id, rebook=True, notify=False)
+    finally:
+        journal.detach()
+
+    # Mapa de assentos liberado de uma vez e voo fechado para venda
+    assert cancelado.cancelled and cancelado.seats_available == cancelado.capacity
+    assert cancelado.seats_remaining == 0
+    assert all(seat.booking is None for seat in cancelado.seats.values())
+    assert cancelado.lowest_fare_class is None and cancelado.occupy_seat(1, 0) is None
+
+    # Voo cancelado some das buscas (inclusive por id e por assentos livres)
+    rota = Flight.list_flights(city_from="Disrupt A", city_to="Disrupt B")
+    assert cancelado not in rota and proximo in rota
+    assert Flight.list_flights(flight_id=cancelado.id) == []
+    assert SeatsAvailableFilterStrategy(1).filter([cancelado, outra_rota]) == [outra_rota]
+
+    # Reacomodação em ordem de partida, limitada aos assentos livres
+    assert resultado.rebooked == {
+        reservas[0].id: proximo.id,
+        reservas[1].id: depois.id,
+    }
+    assert reservas[0].flight_id == proximo.id and reservas[0].seat_id == 1
+    assert reservas[0].status_code == BOOKED  # check-in precisa ser refeito
+    assert proximo.seats[1].booking == reservas[0].id and proximo.seats_remaining == 0
+    assert reservas[0] in Booking.list_flight_bookings(proximo.id)
+    assert outra_rota.seats_remaining == outra_rota.capacity
+
+    # Quem não coube é cancelado em lote (a reserva já cancelada fica de fora)
+    assert resultado.cancelled == reservas[2:]
+    assert all(b.status_code == CANCELLED and b.seat_id is None for b in reservas[2:])
+    assert Booking.list_flight_bookings(cancelado.id) == []
+
+    # O hold da cancelada sai da fila; o da reacomodada recomeça no voo novo
+    assert not holds.is_held(reservas[2].id) and holds.is_held(reservas[1].id)
+    agora[0] = 16 * 60
+    assert holds.tick() == 0 and reservas[1].status_code == BOOKED
+    agora[0] = 26 * 60
+    assert holds.tick() == 1 and reservas[1].status_code == CANCELLED
+
+    # Eventos registrados para auditoria
+    assert journal.history(reservas[0].id)[-1].event is BookingEvent.REBOOKED
+    assert journal.current(reservas[0].id)["flight_id"] == proximo.id
+    assert journal.history(reservas[3].id)[-1].event is BookingEvent.CANCELLED
+    assert journal.history(ja_cancelada.id) == []
+
+    # Sem reacomodação: todos cancelados e uma única notificação agregada
+    outro = criar_voo("Disrupt X", "Disrupt Y", 100, capacity=3)
+    sem_lugar = [criar_reserva(outro, owner_id=i, name=f"Q{i}") for i in range(3)]
+    resultado = disrupt_flight(outro.id, reason="Manutenção")
+    assert resultado.rebooked == {} and resultado.cancelled == sem_lugar
+    assert resultado.notified == 2 * len(sem_lugar)
+    print("   ✅ Voo cancelado com reservas tratadas em lote\n")
+
+
+def test_seat_hold_expiry(capsys):
+    """Testa a expiração de reservas não pagas"""
+    print("=" * 60)
+    print("8. PRAZO DE PAGAMENTO - Holds com timing wheel")
+    print("=" * 60)
+
+    # Roda de tempo: dispara no tick certo, mesmo além de uma volta
+    agora = [0.0]
+    disparos = []
+    roda = TimingWheel(tick=1.0, slots=4, clock=lambda: agora[0])
+    roda.schedule("a", 2, lambda: disparos.append("a"))
+    roda.schedule("b", 6, lambda: disparos.append("b"))
+    roda.schedule("c", 3, lambda: disparos.append("c"))
+    assert roda.cancel("c") and not roda.cancel("c")
+    assert roda.advance(1.5) == 0 and roda.advance(2.0) == 1 and disparos == ["a"]
+    assert roda.advance(5.9) == 0 and "b" in roda
+    assert roda.advance(100) == 1 and disparos == ["a", "b"] and len(roda) == 0
+
+    # Roda parada: o prazo conta do relógio, não do último tick processado
+    agora[0] = 500.0
+    roda.schedule("d", 2, lambda: disparos.append("d"))
+    assert roda.advance(501.0) == 0 and roda.advance(502.0) == 1
+
+    holds = SeatHoldManager(ttl=timedelta(seconds=30), clock=lambda: agora[0])
+    voo = criar_voo("Hold A", "Hold B", 100, capacity=10)
+    pago = Booking(owner_id=1, flight_id=voo.id, passenger_name="Pago",
+                   passenger_cpf="123.456.789-00", price=100, fare_class="Q")
+    abandonado = Booking(owner_id=2, flight_id=voo.id, passenger_name="Abandonado",
+                         passenger_cpf="123.456.789-00", price=100, fare_class="Q")
+    assert pago.reserve_seat(0) and abandonado.reserve_seat(1)
+    assert voo.seats_remaining == 8 and voo.fares.bucket("Q").sold == 2
+
+    agora[0] = 1000.0
+    holds.wheel.advance()
+    holds.hold(pago)
+    holds.hold(abandonado)
+    assert len(holds) == 2 and holds.is_held(abandonado.id)
+
+    # Pagamento iniciado antes do prazo: o hold não vence durante a cobrança
+    assert holds.claim(pago) and not holds.is_held(pago.id)
+    assert not holds.claim(pago)
+
+    assert holds.tick(1029.0) == 0
+    assert holds.tick(1031.0) == 1 and holds.expired_total == 1
+
+    # O hold vencido devolve assento e classe tarifária
+    assert abandonado.status_code == CANCELLED and voo.seats[1].booking is None
+    assert pago.status_code == BOOKED and voo.seats[0].booking == pago.id
+    assert voo.seats_remaining == 9 and voo.fares.bucket("Q").sold == 1
+
+    # Pagamento depois do vencimento é recusado
+    assert not holds.claim(abandonado)
+
+    # Reserva multitrecho não passa por hold, mas pode ser paga (uma vez)
+    conexao = criar_voo("Hold B", "Hold C", 100, capacity=10)
+    trechos = [book_lowest_fare(v, 6, "Conexão", "123.456.789-00") for v in (voo, conexao)]
+    assert not any(holds.is_held(t.id) for t in trechos)
+    assert all(holds.claim(t) for t in trechos)
+    assert not any(holds.claim(t) for t in trechos)
+    # Cobrança recusada: o prazo volta e uma nova tentativa é aceita
+    holds.hold(trechos[0])
+    assert holds.claim(trechos[0])
+    for trecho in trechos:
+        trecho.cancel_booking(verbose=False)
+
+    # Reserva já com check-in não expira
+    tarde = criar_reserva(voo, owner_id=3)
+    assert tarde.reserve_seat(2) and tarde.check_in()
+    holds.hold(tarde)
+    assert holds.tick(2000.0) == 1 and tarde.status_code == CHECKED_IN
+    assert holds.expired_total == 1
+
+    # Usuário e expiração cancelando ao mesmo tempo: só um vence
+    disputada = Booking(owner_id=4, flight_id=voo.id, passenger_name="Disputada",
+                        passenger_cpf="123.456.789-00", price=100, fare_class="Q")
+    vendidas = voo.fares.bucket("Q").sold
+    resultados = []
+    largada = threading.Barrier(8)
+
+    def cancelar():
+        largada.wait()
+        resultados.append(disputada.cancel_booking(verbose=False))
+
+    threads = [threading.Thread(target=cancelar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert resultados.count(True) == 1
+    assert voo.fares.bucket("Q").sold == vendidas - 1
+
+    # Expiração na thread de fundo não imprime: o aviso espera no outbox
+    sem_pagamento = criar_reserva(voo, owner_id=5)
+    holds.hold(sem_pagamento)
+    capsys.readouterr()
+    fundo = threading.Thread(target=holds.tick, args=(2100.0,))
+    fundo.start()
+    fundo.join()
+    assert sem_pagamento.status_code == CANCELLED and holds.expired_total == 2
+    assert capsys.readouterr().out == "" and len(NotificationService.outbox) == 1
+    assert NotificationService.outbox.flush() == 1
+    assert "RESERVA EXPIRADA" in capsys.readouterr().out
+
+    # Muitos holds: cada tick só visita um slot
+    ids = count()
+    for _ in range(10_000):
+        holds.wheel.schedule(next(ids), 30, lambda: None)
+    holds.wheel.schedule("último", 31, lambda: None)
+    assert holds.tick(2130.0) == 10_000 and len(holds) == 1
+    print("   ✅ Reservas não pagas expiram e liberam o assento\n")
+
+
+def test_concurrent_seat_reservation():
+    """Testa sessões simultâneas disputando os mesmos assentos"""
+    print("=" * 60)
+    print("9. CONCORRÊNCIA - Sem venda duplicada")
+    print("=" * 60)
+
+    voo = criar_voo("Lock A", "Lock B", 100, capacity=100)
+    reservas = [criar_reserva(voo, owner_id=i) for i in range(8)]
+    # Locks listrados: ids a SEAT_LOCK_STRIPES de distância compartilham, vizinhos não
+    campos = dict(From=voo.From, To=voo.To, capacity=voo.capacity,
+                  departure=voo.departure, arrival=voo.arrival, price=voo.price)
+    mesma_listra = Flight.from_trusted(id=voo.id + SEAT_LOCK_STRIPES, **campos)
+    vizinho = Flight.from_trusted(id=voo.id + 1, **campos)
+    assert voo.seat_lock is mesma_listra.seat_lock
+    assert voo.seat_lock is not vizinho.seat_lock
+
+    ganhos = [[] for _ in reservas]
+    largada = threading.Barrier(len(reservas))
+
+    def sessao(indice: int):
+        largada.wait()
+        for assento in range(voo.capacity):
+            if voo.occupy_seat(reservas[indice].id, assento) is not None:
+                ganhos[indice].append(assento)
+
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=sessao, args=(i,)) for i in range(len(reservas))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(intervalo)
+
+    vendidos = [assento for lista in ganhos for assento in lista]
+    assert sorted(vendidos) == list(range(voo.capacity))
+    assert voo.seats_available == 0
+    for indice, lista in enumerate(ganhos):
+        assert all(voo.seats[assento].booking == reservas[indice].id for assento in lista)
+
+    # Liberações simultâneas mantêm o contador consistente
+    threads = [
+        threading.Thread(target=lambda lista=lista: [voo.open_seat(a) for a in lista])
+        for lista in ganhos
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert voo.seats_available == voo.capacity
+    print("   ✅ Cada assento vendido uma única vez\n")
+
+
+def test_waitlist_promotion(monkeypatch):
+    """Testa a lista de espera promovida pela liberação de assentos"""
+    print("=" * 60)
+    print("10. LISTA DE ESPERA - Promoção automática")
+    print("=" * 60)
+
+    # Voo lotado: 4 assentos, 4 classes Y vendidas
+    voo = criar_voo("Wait A", "Wait B", 100, capacity=4)
+    ocupantes = []
+    for i in range(voo.capacity):
+        reserva = Booking(owner_id=100 + i, flight_id=voo.id, passenger_name=f"O{i}",
+                          passenger_cpf="123.456.789-00", price=100,
+                          fare_class=voo.lowest_fare_class)
+        assert reserva.reserve_seat(i)
+        ocupantes.append(reserva)
+    assert voo.lowest_fare_class is None and voo.seats_remaining == 0
+
+    basico = Customer(username="wait_basic")
+    ouro = Customer(username="wait_gold")
+    ouro.gain_loyalty_points(300)
+    prata = Customer(username="wait_silver")
+    prata.gain_loyalty_points(150)
+    desistente = Customer(username="wait_quitter")
+    desistente.gain_loyalty_points(600)
+    assert ouro.loyalty_points.tier is LoyaltyTier.GOLD
+    assert basico.loyalty_points.tier is LoyaltyTier.BASIC
+
+    # Holds locais: o relógio do teste não mexe no Booking.holds global
+    agora = [0.0]
+    holds = SeatHoldManager(ttl=timedelta(minutes=15), clock=lambda: agora[0])
+    monkeypatch.setattr(Booking, "holds", holds)
+
+    fila = Booking.waitlist
+    e_basico = fila.join(basico, voo, "Basico", "111.111.111-11")
+    e_ouro = fila.join(ouro, voo, "Ouro", "222.222.222-22")
+    e_prata = fila.join(prata, voo, "Prata", "333.333.333-33")
+    e_desistente = fila.join(desistente, voo, "Desistente", "444.444.444-44")
+
+    # Nível primeiro, depois ordem do pedido
+    assert fila.position(e_desistente) == 1 and fila.position(e_basico) == 4
+    assert fila.leave(e_desistente) and not fila.leave(e_desistente)
+    assert [e.customer_id for e in fila.waitlist(voo.id).entries()] == [ouro.id, prata.id, basico.id]
+
+    # Cancelamento libera o assento e promove o primeiro da fila
+    assert ocupantes[2].cancel_booking()
+    promovida = Booking.get(e_ouro.booking_id)
+    assert promovida is not None and promovida.owner_id == ouro.id
+    assert promovida.seat_id == 2 and voo.seats[2].booking == promovida.id
+    assert promovida.fare_class is not None and voo.lowest_fare_class is None
+    assert holds.is_held(promovida.id)
+    assert len(fila.waitlist(voo.id)) == 2 and fila.position(e_prata) == 1
+
+    # Promovido que não paga perde a vaga para o próximo da fila
+    agora[0] = 16 * 60
+    assert holds.tick() == 1
+    assert promovida.status_code == CANCELLED
+    segunda = Booking.get(e_prata.booking_id)
+    assert segunda is not None and segunda.owner_id == prata.id and segunda.seat_id == 2
+    assert holds.confirm(segunda.id)
+
+    # Sem classe tarifária aberta ninguém é promovido
+    voo.open_seat(3)
+    assert Booking.get(e_basico.booking_id or -1) is None and e_basico.active
+    assert fila.promote(voo) is None and len(fila.waitlist(voo.id)) == 1
+    assert fila.leave(e_basico) and fila.waitlist(voo.id).pop() is None
+
+    # Reserva sem assento: cancelar libera só a tarifa e também promove
+    cheio = criar_voo("Wait C", "Wait D", 100, capacity=2)
+    sem_assento = [
+        Booking(owner_id=200 + i, flight_id=cheio.id, passenger_name=f"S{i}",
+                passenger_cpf="123.456.789-00", price=100,
+                fare_class=cheio.lowest_fare_class)
+        for i in range(cheio.capacity)
+    ]
+    assert cheio.lowest_fare_class is None and cheio.seats_remaining == cheio.capacity
+    e_sem = fila.join(basico, cheio, "Basico", "111.111.111-11")
+    assert sem_assento[0].cancel_booking(verbose=False)
+    promovida = Booking.get(e_sem.booking_id)
+    assert promovida is not None and promovida.owner_id == basico.id
+    assert promovida.seat_id is None and holds.is_held(promovida.id)
+    assert cheio.lowest_fare_class is None and len(fila.waitlist(cheio.id)) == 0
+
+    # Um pedido por cliente; voo cancelado fecha a lista e avisa quem esperava
+    e_prata = fila.join(prata, cheio, "Prata", "333.333.333-33")
+    with pytest.raises(ValueError):
+        fila.join(prata, cheio, "Prata", "333.333.333-33")
+    disrupt_flight(cheio.id, notify=False)
+    assert not e_prata.active and len(fila.waitlist(cheio.id)) == 0
+    with pytest.raises(ValueError):
+        fila.join(basico, cheio, "Basico", "111.111.111-11")
+    print("   ✅ Assentos liberados vão para o primeiro da lista\n")
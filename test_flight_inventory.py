@@ -0,0 +1,332 @@
+"""
+test_flight_inventory.py
+
+Testa o gerenciamento do inventário de voos:
+1. PRECIFICAÇÃO DINÂMICA - Tarifa por ocupação e antecedência (Observer)
+2. CLASSES TARIFÁRIAS - Disponibilidade aninhada Y/B/M/Q
+3. ARQUIVAMENTO - Voos que já partiram saem da memória para o SQLite
+4. VOOS RECORRENTES - Modelos semanais materializados sob demanda
+5. CONSTRUÇÃO CONFIÁVEL - Carga em lote de snapshots sem revalidação
+"""
+from datetime import date, datetime, time, timedelta
+
+import pydantic
+import pytest
+
+from ycaro_airlines.models import Booking, BookingStatus, Flight
+from ycaro_airlines.models.flight import SeatStatus
+from ycaro_airlines.models.flight_archive import ArchivalJob, FlightArchive
+from ycaro_airlines.models.flight_schedule import EXCEPT_SUNDAY, FlightSchedule
+from ycaro_airlines.observers import DynamicPricingEngine, EventBus, FlightEvent
+from ycaro_airlines.views.actions.booking_actions import book_lowest_fare
+from ycaro_airlines.strategies.fare_curves import (
+    CombinedFareCurve,
+    LoadFactorFareCurve,
+    TimeToDepartureFareCurve
+)
+
+
+def criar_voo(From: str, To: str, price: float, days: int = 1, capacity: int = 255) -> Flight:
+    """Cria um voo de teste e registra no dicionário global"""
+    departure = datetime.now() + timedelta(days=days)
+    flight = Flight(
+        From=From,
+        To=To,
+        capacity=capacity,
+        departure_date=departure,
+        arrival_date=departure + timedelta(hours=2),
+        price=price,
+    )
+    Flight.flights[flight.id] = flight
+    return flight
+
+
+def test_dynamic_pricing():
+    """Testa o motor de precificação dinâmica"""
+    print("=" * 60)
+    print("1. PRECIFICAÇÃO DINÂMICA - Ocupação e antecedência")
+    print("=" * 60)
+
+    eventos = EventBus()
+    curva = LoadFactorFareCurve([(0.0, 1.0), (1.0, 2.0)])
+    motor = DynamicPricingEngine(curva, eventos)
+
+    voo = criar_voo("Price A", "Price B", 100, capacity=10)
+    outro = criar_voo("Price A", "Price B", 100, capacity=10)
+    mudancas = []
+    eventos.subscribe(
+        FlightEvent.PRICE_CHANGED,
+        lambda flight, old_price, new_price: mudancas.append((flight.id, old_price, new_price)),
+    )
+
+    # Usa o barramento de teste no lugar do global durante o teste
+    original = Flight.events
+    Flight.events = eventos
+    motor.attach()
+    try:
+        voo.occupy_seat(booking_id=1, seat_id=0)
+        voo.occupy_seat(booking_id=2, seat_id=1)
+        assert voo.price == 120.0          # 20% de ocupação -> 1.2x
+        assert outro.price == 100          # só o voo afetado é recalculado
+
+        voo.open_seat(1)
+        assert voo.price == 110.0
+        assert mudancas == [(voo.id, 100, 110.0), (voo.id, 110.0, 120.0), (voo.id, 120.0, 110.0)]
+    finally:
+        motor.detach()
+        Flight.events = original
+
+    # Curva combinada: voo lotado perto da partida fica mais caro
+    combinada = CombinedFareCurve(LoadFactorFareCurve(), TimeToDepartureFareCurve())
+    assert combinada.multiplier(1.0, 0) > combinada.multiplier(0.0, 24 * 30)
+    print(f"   Curva: {combinada.description()}")
+    print("   ✅ Reprecificação incremental com eventos de mudança de preço\n")
+
+
+def test_fare_buckets():
+    """Testa as classes tarifárias aninhadas"""
+    print("=" * 60)
+    print("2. CLASSES TARIFÁRIAS - Disponibilidade aninhada")
+    print("=" * 60)
+
+    voo = criar_voo("Fare A", "Fare B", 100, capacity=10)
+    fares = voo.fares
+
+    # Autorizações padrão: Y=10, B=8, M=6, Q=3
+    assert [fares.availability(c) for c in "YBMQ"] == [10, 8, 6, 3]
+    assert voo.lowest_fare_class == "Q"
+    assert voo.lowest_fare == 100
+
+    # Vendas na classe mais barata consomem as superiores também
+    for _ in range(3):
+        assert fares.sell("Q")
+    assert not fares.sell("Q")
+    assert [fares.availability(c) for c in "YBMQ"] == [7, 5, 3, 0]
+    assert voo.lowest_fare_class == "M"
+    assert voo.lowest_fare == 120
+
+    # Vendas em classe superior limitam as inferiores
+    for _ in range(4):
+        assert fares.sell("Y")
+    assert [fares.availability(c) for c in "YBMQ"] == [3, 3, 3, 0]
+
+    # Reserva vende a classe e o cancelamento devolve
+    reserva = Booking(
+        owner_id=1,
+        flight_id=voo.id,
+        passenger_name="Fare Test",
+        passenger_cpf="123.456.789-00",
+        price=voo.lowest_fare,
+        fare_class="M",
+    )
+    assert fares.availability("M") == 2
+    reserva.cancel_booking()
+    assert fares.availability("M") == 3
+
+    # Reserva inválida não consome a classe
+    with pytest.raises(pydantic.ValidationError):
+        Booking(owner_id=1, flight_id=voo.id, passenger_name="Fare Test",
+                passenger_cpf="123.456.789-00", price="caro", fare_class="M")
+    assert fares.availability("M") == 3
+
+    # Revenue management fecha a classe M
+    fares.set_authorization("M", 3)
+    assert fares.availability("M") == 0
+    assert voo.lowest_fare_class == "B"
+
+    for _ in range(3):
+        assert fares.sell("B")
+    assert voo.lowest_fare_class is None and voo.lowest_fare is None
+
+    # Reserva multitrecho: cada trecho vende a classe mais barata do seu voo
+    ida = criar_voo("Fare C", "Fare D", 100, capacity=10)
+    volta = criar_voo("Fare D", "Fare E", 200, capacity=10)
+    trechos = [book_lowest_fare(v, 1, "Fare Test", "123.456.789-00") for v in (ida, volta)]
+    assert [(t.fare_class, t.price) for t in trechos] == [("Q", 100), ("Q", 200)]
+    assert ida.fares.availability("Q") == volta.fares.availability("Q") == 2
+
+    # Sem classe informada (builder, telas antigas) a reserva também consome o estoque
+    padrao = Booking(owner_id=1, flight_id=ida.id, passenger_name="Fare Test",
+                     passenger_cpf="123.456.789-00", price=100)
+    assert padrao.fare_class == "Q" and ida.fares.availability("Q") == 1
+    padrao.cancel_booking()
+    assert ida.fares.availability("Q") == 2
+    print("   ✅ Tarifa mais barata lida dos contadores mantidos\n")
+
+
+def test_departed_flight_archival():
+    """Testa o arquivamento de voos que já partiram"""
+    print("=" * 60)
+    print("3. ARQUIVAMENTO - Voos que já partiram")
+    print("=" * 60)
+
+    antigo = criar_voo("Archive A", "Archive B", 100)
+    futuro = criar_voo("Archive A", "Archive B", 100, days=5)
+    reserva = Booking(
+        owner_id=42,
+        flight_id=antigo.id,
+        passenger_name="Archive Test",
+        passenger_cpf="123.456.789-00",
+        price=100,
+    )
+
+    # Simula a partida no passado mantendo o índice consistente
+    old_departure = antigo.departure
+    antigo.departure = datetime.now() - timedelta(days=2)
+    antigo.arrival = antigo.departure + timedelta(hours=2)
+    Flight.flights.reindex(antigo, old_departure)
+
+    # Hold de pagamento pendente sai junto com a reserva
+    Booking.holds.hold(reserva)
+
+    arquivo = FlightArchive()
+    job = ArchivalJob(arquivo)
+    assert job.run_once() >= 1
+    assert not Booking.holds.is_held(reserva.id)
+
+    # Inventário em memória só com voos vendáveis
+    assert antigo.id not in Flight.flights
+    assert futuro.id in Flight.flights
+    assert Booking.get(reserva.id) is None
+    assert Flight.list_flights(city_from="Archive A") == [futuro]
+
+    # Histórico continua consultável
+    registro = arquivo.get_flight(antigo.id)
+    assert registro["city_from"] == "Archive A" and registro["price"] == 100
+    assert [r["id"] for r in arquivo.find_flights("Archive A", "Archive B")] == [antigo.id]
+    assert arquivo.bookings_for_flight(antigo.id)[0]["passenger_name"] == "Archive Test"
+    assert arquivo.bookings_for_owner(42)[0]["status"] == "booked"
+
+    # Nada mais a arquivar
+    assert job.run_once() == 0
+
+    # run_pending (tarefa do App) só arquiva depois do intervalo
+    agora = [datetime.now()]
+    periodico = ArchivalJob(arquivo, interval=600, clock=lambda: agora[0])
+    assert periodico.run_pending() == 0
+    old_departure = futuro.departure
+    futuro.departure = datetime.now() - timedelta(hours=1)
+    futuro.arrival = futuro.departure + timedelta(hours=2)
+    Flight.flights.reindex(futuro, old_departure)
+    assert periodico.run_pending() == 0 and futuro.id in Flight.flights
+    agora[0] += timedelta(seconds=601)
+    assert periodico.run_pending() == 1 and futuro.id not in Flight.flights
+    arquivo.close()
+    print("   ✅ Voos e reservas arquivados e consultáveis\n")
+
+
+def test_recurring_schedules():
+    """Testa a materialização preguiçosa de voos recorrentes"""
+    print("=" * 60)
+    print("4. VOOS RECORRENTES - Materialização sob demanda")
+    print("=" * 60)
+
+    modelo = Flight.schedules.add(FlightSchedule(
+        "Schedule A", "Schedule B",
+        departure_time=time(7, 0),
+        duration=timedelta(hours=1),
+        price=150,
+        capacity=20,
+        weekdays=EXCEPT_SUNDAY,
+    ))
+    try:
+        # Nada é criado até uma busca tocar as datas
+        assert modelo.materialized == {}
+
+        # Busca sem data nem rota completa não gera o horizonte
+        assert Flight.list_flights(city_from="Schedule A") == []
+        assert Flight.batch_search([{"city_to": "Schedule B"}]) == [[]]
+        assert modelo.materialized == {}
+
+        amanha = date.today() + timedelta(days=1)
+        inicio = datetime.combine(amanha, time.min)
+        fim = inicio + timedelta(days=7) - timedelta(microseconds=1)
+        voos = Flight.list_flights(
+            city_from="Schedule A",
+            city_to="Schedule B",
+            date_departure_gte=inicio,
+            date_departure_lte=fim,
+        )
+
+        # Uma semana, exceto domingo: 6 voos, às 07:00, no índice de rota
+        assert len(voos) == 6
+        assert all(v.departure.weekday() != 6 and v.departure.time() == time(7, 0) for v in voos)
+        assert len(modelo.materialized) == 6
+        assert Flight.flights.by_route.count("Schedule A", "Schedule B") == 6
+
+        # Repetir a busca não duplica os voos
+        assert len(Flight.list_flights(city_from="Schedule A", date_departure_gte=inicio,
+                                       date_departure_lte=fim)) == 6
+
+        # Reserva em uma data fora da janela materializa só aquele dia
+        dia = amanha + timedelta(days=14)
+        while dia.weekday() == 6:
+            dia += timedelta(days=1)
+        voo = Flight.schedules.flight_on(modelo, dia)
+        assert voo is not None and voo.departure.date() == dia
+        assert Flight.schedules.flight_on(modelo, dia) is voo
+        assert len(modelo.materialized) == 7
+    finally:
+        Flight.schedules.remove(modelo)
+        for flight_id in modelo.materialized.values():
+            Flight.flights.pop(flight_id, None)
+    print("   ✅ Voos gerados apenas para as datas consultadas\n")
+
+
+def test_trusted_bulk_load():
+    """Testa a construção confiável de voos e reservas"""
+    print("=" * 60)
+    print("5. CONSTRUÇÃO CONFIÁVEL - Carga em lote")
+    print("=" * 60)
+
+    # Snapshot pode conter voos que já partiram: sem verificação de datas
+    ontem = datetime.now() - timedelta(days=1)
+    voos = Flight.bulk_load([
+        {
+            "id": 900_000,
+            "From": "Trusted A",
+            "To": "Trusted B",
+            "capacity": 10,
+            "departure": ontem,
+            "arrival": ontem + timedelta(hours=2),
+            "price": 180,
+            "base_price": 150,
+            "occupied_seats": {0: 7, 3: 8},
+            "fares_sold": {"Q": 2},
+        },
+    ])
+    voo = voos[0]
+    try:
+        assert Flight.flights[900_000] is voo
+        assert voo.base_price == 150 and voo.seats_available == 8
+        assert voo.fares.availability("Q") == 1
+        # Mapa de assentos montado só no primeiro acesso, com os assentos restaurados
+        assert voo._seats is None
+        assert voo.seats[3].booking == 8 and voo.seats[3].status is SeatStatus.reserved
+        assert not voo.occupy_seat(booking_id=9, seat_id=0)
+
+        # IDs novos não colidem com os restaurados
+        assert criar_voo("Trusted A", "Trusted B", 100).id > 900_000
+
+        reservas = Booking.bulk_load([
+            {"id": 900_000, "owner_id": 1, "flight_id": voo.id, "passenger_name": "A",
+             "passenger_cpf": "123.456.789-00", "price": 180, "seat_id": 0},
+            {"id": 900_001, "owner_id": 1, "flight_id": voo.id, "passenger_name": "B",
+             "passenger_cpf": "123.456.789-01", "price": 180, "seat_id": 3,
+             "status": BookingStatus.cancelled},
+        ])
+        assert Booking.get(900_001) is reservas[1]
+        assert reservas[0].state.get_status_name() == "booked"
+        assert reservas[1].state.get_status_name() == "cancelled"
+        assert reservas[0].fare_class is None
+        assert reservas[0].model_dump()["passenger_name"] == "A"
+        assert Booking.construct_trusted(owner_id=1, flight_id=voo.id, passenger_name="C",
+                                         passenger_cpf="1", price=1, seat_id=None).id > 900_001
+    finally:
+        for flight in list(Flight.flights.values()):
+            if flight.From == "Trusted A":
+                Flight.flights.pop(flight.id)
+        for booking in Booking.list():
+            if booking.flight_id == voo.id:
+                Booking.repository.remove(booking.id)
+    print("   ✅ Voos e reservas restaurados sem revalidação\n")
@@ -0,0 +1,408 @@
+"""
+test_flight_search.py
+
+Testa o pipeline de busca de voos:
+1. STREAMING - Filtros preguiçosos com parada antecipada
+2. ADAPTATIVO - Ordem dos filtros guiada por estatísticas
+3. PARALELO - Filtro particionado em um pool de processos
+4. PROFILING - Perfil e EXPLAIN de cada busca
+5. COMPILADO - Consultas imutáveis reaproveitáveis como chave de cache
+6. FLEXÍVEL - Datas +/- N dias numa varredura do índice de partida
+7. IDA E VOLTA - k pares mais baratos com merge por heap
+8. LOTE - Buscas agrupadas por rota com varreduras compartilhadas
+9. SINGLE-FLIGHT - Buscas idênticas concorrentes executadas uma vez
+10. DISPONIBILIDADE - Contador de assentos livres e filtro "N+ assentos"
+"""
+import asyncio
+import json
+import pickle
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pydantic
+import pytest
+
+from ycaro_airlines.models import Flight
+from ycaro_airlines.models.flight import SeatStatus
+from ycaro_airlines.models.flight_search import SingleFlight
+from ycaro_airlines.builders import FlightQueryBuilder
+from ycaro_airlines.strategies.concrete_filters import (
+    CityFilterStrategy,
+    PriceFilterStrategy,
+    CompositeFilterStrategy
+)
+from ycaro_airlines.strategies.filter_statistics import FilterStatistics
+from ycaro_airlines.strategies.flight_filter_context import FlightFilterContext
+from ycaro_airlines.strategies.parallel_filter import ParallelFilterExecutor
+
+
+def criar_voo(From: str, To: str, price: float, days: int = 1) -> Flight:
+    """Cria um voo de teste e registra no dicionário global"""
+    departure = datetime.now() + timedelta(days=days)
+    flight = Flight(
+        From=From,
+        To=To,
+        departure_date=departure,
+        arrival_date=departure + timedelta(hours=2),
+        price=price,
+    )
+    Flight.flights[flight.id] = flight
+    return flight
+
+
+def test_streaming_filter():
+    """Testa o modo preguiçoso do FlightFilterContext"""
+    print("=" * 60)
+    print("1. STREAMING - Filtros preguiçosos")
+    print("=" * 60)
+
+    voos = [criar_voo("Stream A", "Stream B", price) for price in (300, 100, 200, 400)]
+
+    composite = CompositeFilterStrategy() \
+        .add_strategy(CityFilterStrategy(from_city="Stream A")) \
+        .add_strategy(PriceFilterStrategy(max_price=350))
+    context = FlightFilterContext(composite)
+
+    # Conta quantos voos foram lidos da fonte
+    consumidos = []
+
+    def fonte():
+        for voo in voos:
+            consumidos.append(voo)
+            yield voo
+
+    assert context.exists(fonte())
+    print(f"   Existência respondida lendo {len(consumidos)} de {len(voos)} voos")
+    assert len(consumidos) == 1
+
+    pagina = context.first(voos, n=2)
+    assert [v.price for v in pagina] == [300, 100]
+
+    mais_baratos = context.top_k(voos, k=2)
+    assert [v.price for v in mais_baratos] == [100, 200]
+
+    # O streaming deve concordar com o filtro em lista
+    assert list(context.stream_filter(voos)) == context.apply_filter(voos)
+
+    assert Flight.flight_exists(city_from="Stream A", city_to="Stream B")
+    assert not Flight.flight_exists(city_from="Stream B", city_to="Stream A")
+    print("   ✅ Streaming consistente com o filtro em lista\n")
+
+
+def test_adaptive_filter_ordering():
+    """Testa a reordenação adaptativa do CompositeFilterStrategy"""
+    print("=" * 60)
+    print("2. ADAPTATIVO - Ordenação por seletividade")
+    print("=" * 60)
+
+    voos = [criar_voo("Adapt A", "Adapt B", 100 + i) for i in range(20)]
+
+    # Preço deixa passar todos; cidade de origem descarta todos
+    composite = CompositeFilterStrategy(adaptive=True) \
+        .add_strategy(PriceFilterStrategy(max_price=1000)) \
+        .add_strategy(CityFilterStrategy(from_city="Nenhuma"))
+
+    for _ in range(composite.statistics.min_samples + 1):
+        assert composite.filter(voos) == []
+
+    print(composite.stats_report())
+    assert isinstance(composite.strategies[0], CityFilterStrategy)
+
+    stats = composite.statistics.get(PriceFilterStrategy(max_price=1000).stats_key())
+    assert stats.pass_rate == 1.0
+
+    # Limites de preço não separam as estatísticas; cidades separam
+    assert PriceFilterStrategy(max_price=10).stats_key() == PriceFilterStrategy(max_price=1000).stats_key()
+    assert composite.statistics.get(CityFilterStrategy(from_city="Outra").stats_key()) is None
+
+    # O registro é limitado: a chave usada há mais tempo sai primeiro
+    registro = FilterStatistics(max_keys=2)
+    for chave in ("a", "b", "a", "c"):
+        registro.record(chave, 1, 1, 0.0)
+    assert registro.get("b") is None and registro.get("a").calls == 2
+
+    # O modo preguiçoso também registra, mesmo quando o consumidor para antes
+    composite = CompositeFilterStrategy() \
+        .add_strategy(PriceFilterStrategy(max_price=110)) \
+        .add_strategy(CityFilterStrategy(from_city="Adapt A"))
+    primeiro = next(composite.stream(voos))
+    assert primeiro is voos[0]
+    preco = composite.statistics.get(composite.strategies[0].stats_key())
+    assert preco is not None and preco.calls == 1 and preco.rows_in == preco.rows_out == 1
+    assert list(composite.stream(voos)) == composite.filter(voos)
+    assert preco.calls == 3 and preco.rows_in == 1 + 2 * len(voos)
+    print("   ✅ Filtro mais seletivo passou a rodar primeiro\n")
+
+
+def test_parallel_filter():
+    """Testa a execução paralela particionada"""
+    print("=" * 60)
+    print("3. PARALELO - Filtro particionado em processos")
+    print("=" * 60)
+
+    voos = [criar_voo("Par A", "Par B" if i % 2 else "Par C", 100 + i) for i in range(40)]
+
+    composite = CompositeFilterStrategy() \
+        .add_strategy(CityFilterStrategy(to_city="Par B")) \
+        .add_strategy(PriceFilterStrategy(max_price=130))
+    serial = FlightFilterContext(composite).apply_filter(voos)
+
+    chamadas = composite.statistics.get(composite.strategies[0].stats_key()).calls
+
+    paralelo_exec = ParallelFilterExecutor(threshold=0, max_workers=2)
+    try:
+        execucao = []
+        paralelo = FlightFilterContext(composite, paralelo_exec).apply_filter(voos, execucao)
+        assert paralelo == serial
+
+        # Medições dos workers voltam somadas: uma execução por estratégia
+        primeira, rows_in, rows_out, _ = execucao[0]
+        assert primeira is composite.strategies[0] and rows_in == len(voos) and rows_out == 20
+        assert composite.statistics.get(primeira.stats_key()).calls == chamadas + 1
+
+        # O pool é reaproveitado entre execuções; entrada vazia não cria partições
+        pool = paralelo_exec._pool
+        assert paralelo_exec.run(composite, voos) == serial and paralelo_exec._pool is pool
+        assert paralelo_exec._partitions(0) == [] and paralelo_exec.run(composite, []) == []
+
+        # As tarefas não carregam o registro de estatísticas compartilhado
+        copia = pickle.loads(pickle.dumps(composite))
+        assert copia.statistics is not composite.statistics and copia.statistics.get(
+            copia.strategies[0].stats_key()) is None
+    finally:
+        paralelo_exec.close()
+
+    # Abaixo do limiar o executor roda em série
+    executor = ParallelFilterExecutor(threshold=len(voos) + 1, max_workers=2)
+    assert executor.run(composite, voos) == serial
+    print(f"   ✅ {len(paralelo)} voos encontrados, igual à execução serial\n")
+
+
+def test_query_profiling():
+    """Testa a instrumentação opcional das buscas"""
+    print("=" * 60)
+    print("4. PROFILING - EXPLAIN das buscas")
+    print("=" * 60)
+
+    criar_voo("Prof A", "Prof B", 150)
+    criar_voo("Prof A", "Prof C", 250)
+
+    profiler = Flight.enable_profiling()
+    try:
+        encontrados = Flight.list_flights(city_from="Prof A", price_lte=200)
+    finally:
+        Flight.disable_profiling()
+
+    perfil = profiler.last()
+    print(perfil.explain())
+    assert perfil.result_count == len(encontrados) == 1
+    assert len(perfil.strategies) == 2
+    assert perfil.strategies[-1].rows_out == 1
+
+    exportado = json.loads(profiler.to_json())
+    assert exportado[0]["query"]["city_from"] == "Prof A"
+    assert exportado[0]["strategies"][0]["rows_in"] >= 2
+
+    # Com o profiler desligado nada é registrado
+    Flight.list_flights(city_from="Prof A")
+    assert len(profiler.profiles) == 1
+    print("   ✅ Perfis registrados e exportados em JSON\n")
+
+
+def test_compiled_query():
+    """Testa consultas compiladas pelo FlightQueryBuilder"""
+    print("=" * 60)
+    print("5. COMPILADO - Consultas imutáveis e hashable")
+    print("=" * 60)
+
+    criar_voo("Comp A", "Comp B", 180)
+
+    a = FlightQueryBuilder().with_cities("Comp A", "Comp B").with_price_range(0, 200).compile()
+    b = FlightQueryBuilder().with_price_range(max_price=200).with_cities(" Comp A ", "Comp B").compile()
+
+    assert a == b and hash(a) == hash(b)
+    assert a.cache_key == b.cache_key
+    assert {a: "resultado"}[b] == "resultado"
+
+    # A árvore de estratégias é montada uma vez e reaproveitada
+    assert a.strategy is a.strategy
+    assert [f.price for f in Flight.search(a)] == [180]
+    assert Flight.search(a) == Flight.list_flights(**a.to_params())
+
+    with pytest.raises(pydantic.ValidationError):
+        a.city_from = "Outra"
+    print(f"   Chave: {a.cache_key}")
+    print("   ✅ Consultas equivalentes compilam para a mesma chave\n")
+
+
+def test_flexible_date_search():
+    """Testa a busca com datas flexíveis"""
+    print("=" * 60)
+    print("6. FLEXÍVEL - Datas +/- N dias")
+    print("=" * 60)
+
+    centro = datetime.now() + timedelta(days=10)
+    criar_voo("Flex A", "Flex B", 300, days=10)
+    criar_voo("Flex A", "Flex B", 200, days=10)
+    criar_voo("Flex A", "Flex B", 250, days=12)
+    criar_voo("Flex A", "Flex B", 100, days=20)  # fora da janela
+    criar_voo("Flex A", "Flex C", 50, days=10)   # outro destino
+
+    query = FlightQueryBuilder() \
+        .with_cities("Flex A", "Flex B") \
+        .with_flexible_departure(centro, flex_days=3) \
+        .build()
+    dias = Flight.search_flexible(**query)
+
+    assert len(dias) == 7
+    assert dias[centro.date()].cheapest_price == 200
+    assert len(dias[centro.date()].flights) == 2
+    assert dias[(centro + timedelta(days=2)).date()].cheapest_price == 250
+    assert dias[(centro - timedelta(days=1)).date()].cheapest is None
+
+    # A busca comum com os mesmos parâmetros usa o índice de partida
+    profiler = Flight.enable_profiling()
+    try:
+        voos = Flight.list_flights(**query)
+    finally:
+        Flight.disable_profiling()
+    assert sorted(v.price for v in voos) == [200, 250, 300]
+    assert profiler.last().index_used == "departure"
+    print("   ✅ Uma varredura no índice, agrupada por dia\n")
+
+
+def test_round_trip_search():
+    """Testa a busca de ida e volta"""
+    print("=" * 60)
+    print("7. IDA E VOLTA - k pares mais baratos")
+    print("=" * 60)
+
+    ida_barata = criar_voo("Trip A", "Trip B", 100, days=5)
+    ida_cara = criar_voo("Trip A", "Trip B", 300, days=1)
+    volta_cedo = criar_voo("Trip B", "Trip A", 50, days=2)   # antes da ida barata
+    volta_tarde = criar_voo("Trip B", "Trip A", 150, days=8)
+
+    pares = Flight.search_round_trip("Trip A", "Trip B", k=3, min_stay=timedelta(hours=12))
+    combinacoes = [(p.outbound, p.inbound) for p in pares]
+    for par in pares:
+        print(f"   {par}")
+
+    # A volta barata só combina com a ida cara, que chega antes dela
+    assert combinacoes == [
+        (ida_barata, volta_tarde),
+        (ida_cara, volta_cedo),
+        (ida_cara, volta_tarde),
+    ]
+    assert [p.total_price for p in pares] == [250, 350, 450]
+    for ida, volta in combinacoes:
+        assert volta.departure >= ida.arrival + timedelta(hours=12)
+    print("   ✅ Pares válidos em ordem de preço total\n")
+
+
+def test_batch_search():
+    """Testa a busca em lote"""
+    print("=" * 60)
+    print("8. LOTE - Várias buscas agrupadas por rota")
+    print("=" * 60)
+
+    criar_voo("Batch A", "Batch B", 120, days=3)
+    criar_voo("Batch A", "Batch B", 220)
+    criar_voo("Batch B", "Batch A", 320)
+    criar_voo("Batch A", "Batch C", 140, days=2)
+
+    buscas = [
+        {"city_from": "Batch A", "city_to": "Batch B", "price_lte": 150},
+        {"city_from": "Batch B", "city_to": "Batch A"},
+        {"city_from": "Batch A", "city_to": "Batch B"},
+        {"city_from": "Batch A", "city_to": "Batch B", "price_lte": 150},
+        {"city_from": "Batch A"},
+        {"city_to": "Batch C", "date_departure_gte": datetime.now()},
+    ]
+    resultados = Flight.batch_search(buscas)
+
+    assert len(resultados) == len(buscas)
+    for busca, resultado in zip(buscas, resultados):
+        assert sorted(v.id for v in resultado) == sorted(v.id for v in Flight.list_flights(**busca))
+    assert [v.price for v in resultados[0]] == [120]
+    assert resultados[0] is not resultados[3]
+
+    # Voos em ordem de partida, não na ordem em que entraram no índice
+    assert [v.price for v in resultados[2]] == [220, 120]
+    assert [v.price for v in resultados[4]] == [220, 140, 120]
+    assert [v.price for v in resultados[5]] == [140]
+    print("   ✅ Resultados na ordem de entrada, iguais à busca individual\n")
+
+
+def test_request_coalescing():
+    """Testa o agrupamento de buscas idênticas concorrentes"""
+    print("=" * 60)
+    print("9. SINGLE-FLIGHT - Buscas idênticas compartilhadas")
+    print("=" * 60)
+
+    execucoes = []
+    liberar = threading.Event()
+
+    def busca_lenta():
+        execucoes.append(1)
+        liberar.wait(timeout=5)
+        return ["resultado"]
+
+    coalescer = SingleFlight()
+    resultados = []
+    threads = [
+        threading.Thread(target=lambda: resultados.append(coalescer.do("chave", busca_lenta)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    # Espera todas as threads estarem aguardando a mesma execução
+    while coalescer.in_flight() == 0 or len(execucoes) == 0:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    liberar.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(execucoes) == 1
+    assert resultados == [["resultado"]] * 8
+    assert coalescer.in_flight() == 0
+
+    # Via Flight, em threads e tarefas asyncio
+    criar_voo("Coal A", "Coal B", 199)
+    query = FlightQueryBuilder().with_cities("Coal A", "Coal B").compile()
+
+    async def varias_tarefas():
+        return await asyncio.gather(*(Flight.search_coalesced_async(query) for _ in range(5)))
+
+    for resultado in asyncio.run(varias_tarefas()):
+        assert [v.price for v in resultado] == [199]
+    assert Flight.search_coalesced(query) == Flight.search(query)
+    print("   ✅ 8 chamadas concorrentes, 1 execução\n")
+
+
+def test_seats_remaining():
+    """Testa o contador de assentos livres e o filtro de disponibilidade"""
+    print("=" * 60)
+    print("10. DISPONIBILIDADE - Assentos livres em O(1)")
+    print("=" * 60)
+
+    voo = criar_voo("Seats A", "Seats B", 150)
+    assert voo.seats_remaining == voo.capacity
+
+    assert voo.occupy_seat(booking_id=1, seat_id=0) is not None
+    assert voo.occupy_seat(booking_id=2, seat_id=0) is None  # já ocupado
+    assert voo.occupy_seat(booking_id=2, seat_id=1) is not None
+    assert voo.check_in_seat(booking_id=2, seat_id=1)
+    assert voo.seats_remaining == voo.capacity - 2
+
+    voo.open_seat(0)
+    voo.open_seat(0)  # liberar duas vezes não conta em dobro
+    assert voo.seats_remaining == voo.capacity - 1
+
+    livres = sum(1 for s in voo.seats.values() if s.status is SeatStatus.open)
+    assert voo.seats_remaining == livres
+
+    assert Flight.list_flights(city_from="Seats A", seats_gte=voo.capacity - 1) == [voo]
+    assert Flight.list_flights(city_from="Seats A", seats_gte=voo.capacity) == []
+    print(f"   ✅ {voo.seats_remaining} assentos livres, igual à contagem no mapa\n")
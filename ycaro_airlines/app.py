@@ -1,6 +1,7 @@
 from ycaro_airlines.views.menu import UIView
 
 import os
+from typing import Any, Callable, Iterable
 from ycaro_airlines.models.user import User
 
 
@@ -9,15 +10,20 @@ def clear_screen():
 
 
 class App:
-    def __init__(self, first_screen: UIView) -> None:
+    def __init__(self, first_screen: UIView, tasks: Iterable[Callable[[], Any]] = ()) -> None:
         self.current_screen = first_screen
         self.logged_user: User | None = None
+        # Executadas na thread principal antes de cada tela
+        self.tasks = list(tasks)
 
     def run(self):
         print("---- Bem vindo a Ycaro Airlines! ----")
 
         while True:
             # clear_screen()
+            for task in self.tasks:
+                task()
+
             if (next_screen := self.current_screen.operation()) is None:
                 break
 
@@ -12,6 +12,7 @@ class BookingBuilder:
         self._passenger_cpf: str = None
         self._price: float = None
         self._seat_id: int = None
+        self._fare_class: str = None
         return self
     
     def for_flight(self, flight_id: int):
@@ -35,6 +36,10 @@ class BookingBuilder:
         self._seat_id = seat_id
         return self
     
+    def with_fare_class(self, fare_class: str):
+        self._fare_class = fare_class
+        return self
+    
     def build(self) -> Booking:
         if not all([self._flight_id, self._owner_id, self._passenger_name, 
                    self._passenger_cpf, self._price is not None]):
@@ -46,5 +51,6 @@ class BookingBuilder:
             passenger_name=self._passenger_name,
             passenger_cpf=self._passenger_cpf,
             price=self._price,
-            seat_id=self._seat_id
+            seat_id=self._seat_id,
+            fare_class=self._fare_class
         )
\ No newline at end of file
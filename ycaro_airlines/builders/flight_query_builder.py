@@ -1,6 +1,6 @@
 from datetime import datetime
 from math import inf
-from ycaro_airlines.models.flight import FlightQueryParams
+from ycaro_airlines.models.flight import CompiledFlightQuery, FlightQueryParams
 
 class FlightQueryBuilder:
     def __init__(self):
@@ -34,6 +34,17 @@ class FlightQueryBuilder:
             self._params["date_arrival_lte"] = end_date
         return self
     
+    def with_flexible_departure(self, around: datetime, flex_days: int = 3):
+        """Partida em torno de uma data, aceitando até flex_days dias antes ou depois."""
+        self._params["date_departure_around"] = around
+        self._params["flex_days"] = flex_days
+        return self
+    
+    def with_min_seats(self, seats: int):
+        if seats > 0:
+            self._params["seats_gte"] = seats
+        return self
+    
     def with_flight_id(self, flight_id: int):
         self._params["flight_id"] = flight_id
         return self
@@ -41,6 +52,10 @@ class FlightQueryBuilder:
     def build(self) -> FlightQueryParams:
         return self._params.copy()
     
+    def compile(self) -> CompiledFlightQuery:
+        """Gera a consulta imutável e normalizada, pronta para Flight.search()."""
+        return CompiledFlightQuery.from_params(self._params)
+    
     def reset(self):
         self._params = {}
         return self
\ No newline at end of file
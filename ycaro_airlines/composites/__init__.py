@@ -5,6 +5,7 @@ from .notification_system import (
     NotificationBuilder,
     NotificationTemplate,
     NotificationService,
+    NotificationOutbox,
     EmailNotification,
     SMSNotification,
     PushNotification,
@@ -17,6 +18,7 @@ __all__ = [
     "NotificationBuilder",
     "NotificationTemplate",
     "NotificationService",
+    "NotificationOutbox",
     "EmailNotification",
     "SMSNotification",
     "PushNotification",
@@ -4,8 +4,10 @@ ycaro_airlines/composites/notification_system.py
 Composite Pattern para Sistema de Notificações
 Permite enviar notificações individuais ou em grupo
 """
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from collections import deque
+from typing import List, Tuple
 from datetime import datetime
 
 
@@ -122,6 +124,38 @@ class NotificationGroup(NotificationComponent):
         return sum(n.get_recipients_count() for n in self.notifications)
 
 
+# ===== OUTBOX (notificações de threads de fundo) =====
+
+class NotificationOutbox:
+    """
+    Entrega notificações geradas fora da thread principal só quando a UI
+    pede (flush), para não imprimir no meio de um prompt. Na thread
+    principal a entrega é imediata.
+    """
+    
+    def __init__(self):
+        # deque: append e popleft são seguros entre threads
+        self._queue: deque[Tuple[NotificationComponent, str]] = deque()
+    
+    def __len__(self) -> int:
+        return len(self._queue)
+    
+    def send(self, notification: NotificationComponent, message: str) -> bool:
+        if threading.current_thread() is threading.main_thread():
+            return notification.send(message)
+        self._queue.append((notification, message))
+        return True
+    
+    def flush(self) -> int:
+        """Entrega as notificações pendentes. Retorna quantas foram enviadas."""
+        sent = 0
+        while self._queue:
+            notification, message = self._queue.popleft()
+            notification.send(message)
+            sent += 1
+        return sent
+
+
 # ===== TEMPLATES DE NOTIFICAÇÃO =====
 
 class NotificationTemplate:
@@ -163,6 +197,51 @@ Motivo: {reason}
 Pedimos desculpas pelo inconveniente.
         """.strip()
     
+    @staticmethod
+    def flight_cancellation(flight_info: str, reason: str, rebooked: int, cancelled: int) -> str:
+        return f"""
+❌ VOO CANCELADO
+
+{flight_info}
+Motivo: {reason}
+
+Passageiros reacomodados: {rebooked}
+Reservas canceladas com reembolso: {cancelled}
+
+Consulte suas reservas para ver o novo voo ou o reembolso.
+        """.strip()
+    
+    @staticmethod
+    def booking_expired(booking_id: int) -> str:
+        return f"""
+⌛ RESERVA EXPIRADA
+
+Booking ID: {booking_id}
+O pagamento não foi concluído no prazo e o assento foi liberado.
+        """.strip()
+    
+    @staticmethod
+    def waitlist_promotion(booking_id: int, flight_info: str, minutes: int) -> str:
+        return f"""
+🎉 VAGA LIBERADA NA LISTA DE ESPERA
+
+Booking ID: {booking_id}
+Voo: {flight_info}
+
+Conclua o pagamento em até {minutes} minutos para garantir o assento.
+        """.strip()
+    
+    @staticmethod
+    def waitlist_closed(flight_info: str, reason: str) -> str:
+        return f"""
+📋 LISTA DE ESPERA ENCERRADA
+
+Voo: {flight_info}
+Motivo: {reason}
+
+O voo não terá mais vagas. Procure outro horário para a sua viagem.
+        """.strip()
+    
     @staticmethod
     def boarding_call(gate: str, seat: str) -> str:
         return f"""
@@ -223,6 +302,9 @@ class NotificationBuilder:
 class NotificationService:
     """Serviço centralizado para gerenciar notificações"""
     
+    # Notificações disparadas por jobs de fundo, entregues pelo loop da UI
+    outbox = NotificationOutbox()
+    
     @staticmethod
     def notify_booking_confirmation(user, booking):
         """Notifica confirmação de reserva"""
@@ -264,7 +346,8 @@ class NotificationService:
         notifications.send(message)
     
     @staticmethod
-    def notify_flight_delay(affected_bookings: List, new_time: str, reason: str):
+    def notify_flight_delay(affected_bookings: List, new_time: str, reason: str,
+                            flight_info: str = "Voo YC-123"):
         """Notifica múltiplos passageiros sobre atraso"""
         
         # Criar grupo composto com subgrupos
@@ -281,11 +364,56 @@ class NotificationService:
         
         # Enviar para todos de uma vez
         message = NotificationTemplate.flight_delay(
-            "Voo YC-123",
+            flight_info,
             new_time,
             reason
         )
         
         main_group.send(message)
         print(f"\n📊 Total de passageiros notificados: {len(affected_bookings)}")
-        print(f"📊 Total de notificações enviadas: {main_group.get_recipients_count()}")
\ No newline at end of file
+        print(f"📊 Total de notificações enviadas: {main_group.get_recipients_count()}")
+    
+    @staticmethod
+    def notify_flight_delay_by_flight(flight_id: int, new_time: str, reason: str) -> int:
+        """
+        Notifica o atraso a todos os passageiros ativos de um voo, buscados
+        pelo índice de reservas por voo. Retorna quantos foram notificados.
+        """
+        from ycaro_airlines.models import Booking, Flight
+        
+        affected_bookings = Booking.list_flight_bookings(flight_id)
+        if not affected_bookings:
+            return 0
+        
+        flight_info = f"Voo {flight_id}"
+        if (flight := Flight.get_flight(flight_id)) is not None:
+            flight_info = f"Voo {flight.id}: {flight.From} → {flight.To}"
+        
+        NotificationService.notify_flight_delay(affected_bookings, new_time, reason, flight_info)
+        return len(affected_bookings)
+    
+    @staticmethod
+    def notify_flight_cancellation(flight, affected_bookings: List, rebooked: dict, reason: str) -> int:
+        """
+        Uma única notificação agregada para todos os passageiros de um voo
+        cancelado (reacomodados ou não). Retorna o total de destinatários.
+        """
+        main_group = NotificationGroup(f"Cancelamento do Voo {flight.id} - Notificação em Massa")
+        
+        for booking in affected_bookings:
+            passenger_group = NotificationBuilder() \
+                .add_email(f"{booking.passenger_name}@example.com") \
+                .add_push(booking.owner_id) \
+                .build()
+            main_group.add(passenger_group)
+        
+        message = NotificationTemplate.flight_cancellation(
+            f"Voo {flight.id}: {flight.From} → {flight.To}",
+            reason,
+            len(rebooked),
+            len(affected_bookings) - len(rebooked),
+        )
+        
+        main_group.send(message)
+        print(f"\n📊 Total de notificações enviadas: {main_group.get_recipients_count()}")
+        return main_group.get_recipients_count()
\ No newline at end of file
@@ -2,6 +2,7 @@ from ycaro_airlines.models.flight import (
     Flight,
     stringify_date,
     FlightQueryParams,
+    CompiledFlightQuery,
     cities,
 )
 from ycaro_airlines.models.customer import Customer
@@ -14,5 +15,6 @@ __all__ = [
     "BookingStatus",
     "stringify_date",
     "FlightQueryParams",
+    "CompiledFlightQuery",
     "cities",
 ]
@@ -1,14 +1,29 @@
-from typing import Self, Unpack
+import gc
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Self, Unpack
 import pydantic
 
 from ycaro_airlines.models.model_database import ModelRepository
 
 
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Desliga o coletor de lixo durante cargas em lote (se estava ligado)."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
 class BaseModel(pydantic.BaseModel):
     id: int
 
     def __init_subclass__(cls, **kwargs: Unpack[pydantic.ConfigDict]):
-        cls.repository = ModelRepository[Self]()
+        # Um repositório por modelo (antes todos compartilhavam o mesmo)
+        cls.repository = ModelRepository(cls)
         return super().__init_subclass__(**kwargs)
 
     def __init__(self, *args, **kwargs):
@@ -17,6 +32,52 @@ class BaseModel(pydantic.BaseModel):
         #salva no repository e atualiza o ID
         self.id = self.repository.save(self)
 
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        # Mantém os índices secundários do repositório ao mudar um campo indexado
+        if name in self.repository.indexes:
+            self.repository.reindex(self, name)
+
+    # ===== CONSTRUÇÃO CONFIÁVEL (SNAPSHOTS E IMPORTAÇÕES) =====
+
+    @classmethod
+    def _prepare_trusted(cls, fields: dict) -> dict:
+        """Gancho para subclasses completarem campos derivados antes da construção."""
+        return fields
+
+    @classmethod
+    def _construct_unsaved(cls, fields: dict) -> Self:
+        fields = cls._prepare_trusted(fields)
+        if fields.get("id") is None:
+            fields["id"] = cls.repository.reserve_id()
+        return cls.model_construct(**fields)
+
+    @classmethod
+    def construct_trusted(cls, id: int | None = None, **fields: Any) -> Self:
+        """
+        Constrói sem validação (como model_construct) para dados já confiáveis,
+        como snapshots e importações, e salva no repository.
+
+        Com id, o registro mantém o mesmo id; sem id, recebe o próximo.
+        """
+        fields["id"] = id
+        item = cls._construct_unsaved(fields)
+        cls.repository.save_all_with_ids((item,))
+        return item
+
+    @classmethod
+    def bulk_load(cls, records: Iterable[dict]) -> list[Self]:
+        """
+        construct_trusted em lote, salvando tudo de uma vez.
+
+        O coletor de lixo fica pausado durante a carga: os objetos criados
+        vivem até o fim do programa e as varreduras só custariam tempo.
+        """
+        with paused_gc():
+            items = [cls._construct_unsaved(dict(record)) for record in records]
+        cls.repository.save_all_with_ids(items)
+        return items
+
     @classmethod
     def get(cls, id: int) -> Self | None:
         return cls.repository.get(id)
@@ -1,21 +1,24 @@
+import re
 from enum import Enum, auto
-from typing import TypeAlias
-from pydantic import Field
+from typing import ClassVar, Iterable, List, NamedTuple, TypeAlias
 from ycaro_airlines.models.base_model import BaseModel
 from ycaro_airlines.models.flight import Flight, stringify_date
+from ycaro_airlines.models.seat_hold import SeatHoldManager
+from ycaro_airlines.models.waitlist import WaitlistRegistry
+from ycaro_airlines.observers.event_bus import BookingEvent, EventBus
 from rich.table import Table
 from rich.console import Console
 
 # importar estados
 from ycaro_airlines.states.booking_state import (
+    BOOKED,
+    CANCELLED,
     BookingState,
-    BookedState,
-    CheckedInState,
-    CancelledState
+    state_for,
 )
 
 
-# Manter enum por compatibilidade (mas não usar mais) (MUDAR DEPOIS)
+# Manter enum por compatibilidade: derivado de Booking.status_code
 class BookingStatus(Enum):
     booked = 1
     checked_in = auto()
@@ -25,61 +28,72 @@ class BookingStatus(Enum):
 CustomerID: TypeAlias = int
 
 
-class Booking(BaseModel):
-    model_config = {
-        "arbitrary_types_allowed": True  #permite armazenar BookingState
-    }
+def normalize_cpf(cpf: str | None) -> str | None:
+    """CPF só com dígitos ("123.456.789-00" -> "12345678900"); None se vazio."""
+    if not cpf:
+        return None
+    return re.sub(r"\D", "", cpf) or None
 
-    flight_id: int
-    owner_id: int
-    price: float
-    seat_id: int | None
-    passenger_name: str
-    passenger_cpf: str
 
-    #ADICIONADO PARA O STATE OBJECT
-    state: BookingState = Field(default_factory=BookedState, exclude=True)
+class BookingRow(NamedTuple):
+    """Reserva já juntada ao voo, com os campos formatados para exibição/exportação."""
+    booking: str
+    flight: str
+    From: str
+    departure: str
+    To: str
+    arrival: str
+    status: str
+    seat: str
 
-    #mannter status para compatibilidade com código antigo
-    status: BookingStatus
 
-    def __init__(
-        self,
-        owner_id: int,
-        flight_id: int,
-        passenger_name: str,
-        passenger_cpf: str,
-        price: float,
-        seat_id: int | None = None,
-        *args,
-        **kwargs,
-    ):
-        initial_state = BookedState()
-        super().__init__(
-            owner_id=owner_id,
-            flight_id=flight_id,
-            passenger_name=passenger_name,
-            passenger_cpf=passenger_cpf,
-            price=price,
-            seat_id=seat_id,
-            status=BookingStatus.booked,
-            state=initial_state,
-            *args,
-            **kwargs,
-        )
-
-    def cancel_booking(self) -> bool:
+class BookingOperations:
+    """
+    Comportamento de uma reserva sobre os seus campos (estado, assento, voo).
+
+    Compartilhado pelo modelo Booking e pelas visões do armazenamento
+    compacto (BookingView): basta expor os mesmos atributos.
+    """
+
+    __slots__ = ()
+
+    # Barramento dos eventos de ciclo de vida; None = não publica
+    events: ClassVar[EventBus | None] = None
+    # Lista de espera avisada quando o cancelamento libera só a tarifa
+    waitlist: ClassVar[WaitlistRegistry | None] = None
+
+    def _publish(self, event: BookingEvent, **data):
+        if self.events is not None and self.events.has_subscribers(event):
+            self.events.publish(event, self, **data)
+
+    @property
+    def state(self) -> BookingState:
+        return state_for(self.status_code)
+
+    @state.setter
+    def state(self, value: BookingState):
+        self.status_code = value.code
+
+    @property
+    def status(self) -> BookingStatus:
+        return BookingStatus(self.status_code)
+
+    @status.setter
+    def status(self, value: BookingStatus):
+        self.status_code = value.value
+
+    def cancel_booking(self, verbose: bool = True) -> bool:
         """Usa State Pattern para cancelar."""
-        success = self.state.cancel(self)
+        success = self.state.cancel(self, verbose)
         if success:
-            self.status = BookingStatus.cancelled
+            self._publish(BookingEvent.CANCELLED)
         return success
 
     def check_in(self) -> bool:
         """Usa State Pattern para check-in."""
         success = self.state.check_in(self)
         if success:
-            self.status = BookingStatus.checked_in
+            self._publish(BookingEvent.CHECKED_IN)
         return success
 
     def can_cancel(self) -> bool:
@@ -105,6 +119,7 @@ class Booking(BaseModel):
             self.flight.open_seat(self.seat_id)
 
         self.seat_id = reserved_seat.id
+        self._publish(BookingEvent.SEAT_RESERVED, seat_id=reserved_seat.id)
         return True
 
     @property
@@ -119,12 +134,143 @@ class Booking(BaseModel):
             raise ValueError("Booking must have a flight")
         return flight
 
+
+class Booking(BookingOperations, BaseModel):
+    flight_id: int
+    owner_id: int
+    price: float
+    seat_id: int | None
+    passenger_name: str
+    passenger_cpf: str
+    fare_class: str | None = None
+
+    # Único campo de estado: código compacto (BOOKED, CHECKED_IN, CANCELLED).
+    # state (flyweight) e status (enum legado) são derivados dele.
+    status_code: int = BOOKED
+
+    events: ClassVar[EventBus | None] = EventBus()
+    # Prazo de pagamento: reservas não pagas liberam o assento ao expirar
+    holds: ClassVar[SeatHoldManager] = SeatHoldManager()
+    # Listas de espera dos voos lotados, promovidas quando um assento é liberado
+    waitlist: ClassVar[WaitlistRegistry] = WaitlistRegistry()
+
+    def __init__(
+        self,
+        owner_id: int,
+        flight_id: int,
+        passenger_name: str,
+        passenger_cpf: str,
+        price: float,
+        seat_id: int | None = None,
+        fare_class: str | None = None,
+        *args,
+        **kwargs,
+    ):
+        # Vende a classe tarifária antes de registrar a reserva; sem classe
+        # escolhida, a mais barata aberta (toda reserva consome o estoque)
+        if (flight := Flight.get_flight(flight_id)) is None:
+            raise ValueError("Booking must have a flight")
+        if fare_class is None:
+            if (fare_class := flight.sell_lowest_fare()) is None:
+                raise ValueError(f"Flight {flight_id} is sold out")
+        elif not flight.sell_fare(fare_class):
+            raise ValueError(f"Fare class {fare_class} is not available")
+
+        try:
+            super().__init__(
+                owner_id=owner_id,
+                flight_id=flight_id,
+                passenger_name=passenger_name,
+                passenger_cpf=passenger_cpf,
+                price=price,
+                seat_id=seat_id,
+                fare_class=fare_class,
+                *args,
+                **kwargs,
+            )
+        except Exception:
+            # Reserva inválida: a classe vendida volta para o estoque
+            flight.release_fare(fare_class)
+            raise
+        # model_dump só quando alguém ouve: a criação é caminho quente
+        if self.events is not None and self.events.has_subscribers(BookingEvent.CREATED):
+            self._publish(BookingEvent.CREATED, **self.model_dump(exclude={"id"}))
+
+    @classmethod
+    def _prepare_trusted(cls, fields: dict) -> dict:
+        """Na construção confiável, aceita status (enum) ou state e guarda só o código."""
+        if (state := fields.pop("state", None)) is not None:
+            fields["status_code"] = state.code
+        if (status := fields.pop("status", None)) is not None:
+            fields["status_code"] = status.value
+        return fields
+
     @classmethod
     def list_customer_bookings(cls, customer_id: CustomerID):
-        return [x for x in cls.list() if x.owner_id == customer_id]
+        return cls.repository.find("owner_id", customer_id)
 
     @classmethod
-    def print_bookings_table(cls, customer_id: CustomerID, console: Console):
+    def list_flight_bookings(cls, flight_id: int, include_cancelled: bool = False) -> List["Booking"]:
+        """Reservas de um voo pelo índice por voo, em O(k) para k reservas do voo."""
+        bookings = cls.repository.find("flight_id", flight_id)
+        if include_cancelled:
+            return bookings
+        return [b for b in bookings if b.status_code != CANCELLED]
+
+    @classmethod
+    def find_by_cpf(cls, cpf: str, include_cancelled: bool = False) -> List["Booking"]:
+        """Reservas de um passageiro pelo CPF (com ou sem pontuação), via índice."""
+        bookings = cls.repository.find("passenger_cpf", cpf)
+        if include_cancelled:
+            return bookings
+        return [b for b in bookings if b.status_code != CANCELLED]
+
+    @classmethod
+    def flight_manifest(cls, flight_id: int) -> List[BookingRow]:
+        """Lista de passageiros ativos do voo, no mesmo formato das tabelas."""
+        return cls.joined_rows(cls.list_flight_bookings(flight_id))
+
+    # ===== JUNÇÃO RESERVA + VOO =====
+
+    @classmethod
+    def joined_rows(cls, bookings: Iterable["Booking"]) -> List[BookingRow]:
+        """
+        Junta as reservas aos seus voos em uma passada: cada voo é buscado
+        uma única vez e os campos já saem formatados.
+        Reservas de voos que não estão mais em memória aparecem com N/A.
+        """
+        flights: dict[int, Flight | None] = {}
+        rows = []
+        for booking in bookings:
+            if booking.flight_id not in flights:
+                flights[booking.flight_id] = Flight.get_flight(booking.flight_id)
+            flight = flights[booking.flight_id]
+
+            seat = f"{booking.seat_id}" if booking.seat_id else "N/A"
+            status = booking.state.get_status_name()
+            if flight is None:
+                rows.append(BookingRow(f"{booking.id}", f"{booking.flight_id}",
+                                       "N/A", "N/A", "N/A", "N/A", status, seat))
+                continue
+
+            rows.append(BookingRow(
+                f"{booking.id}",
+                f"{flight.id}",
+                f"{flight.From}",
+                f"{stringify_date(flight.departure)}",
+                f"{flight.To}",
+                f"{stringify_date(flight.arrival)}",
+                status,
+                seat,
+            ))
+        return rows
+
+    @classmethod
+    def customer_booking_rows(cls, customer_id: CustomerID) -> List[BookingRow]:
+        return cls.joined_rows(cls.list_customer_bookings(customer_id))
+
+    @staticmethod
+    def _bookings_table(rows: Iterable[BookingRow]) -> Table:
         table = Table(title="Bookings")
         table.add_column("Booking")
         table.add_column("Flight")
@@ -135,40 +281,22 @@ class Booking(BaseModel):
         table.add_column("Status", justify="right", no_wrap=True)
         table.add_column("Seat", justify="right", no_wrap=True)
 
-        for i in cls.list_customer_bookings(customer_id):
-            status_display = i.state.get_status_name()
-            table.add_row(
-                f"{i.id}",
-                f"{i.flight.id}",
-                f"{i.flight.From}",
-                f"{stringify_date(i.flight.departure)}",
-                f"{i.flight.To}",
-                f"{stringify_date(i.flight.arrival)}",
-                f"{status_display}",
-                f"{i.seat_id}" if i.seat_id else "N/A",
-            )
-        console.print(table)
+        for row in rows:
+            table.add_row(*row)
+        return table
+
+    @classmethod
+    def print_bookings_table(cls, customer_id: CustomerID, console: Console):
+        console.print(cls._bookings_table(cls.customer_booking_rows(customer_id)))
 
     def print_booking_table(self, console: Console):
-        table = Table(title="Bookings")
-        table.add_column("Booking")
-        table.add_column("Flight")
-        table.add_column("From", justify="right", no_wrap=True)
-        table.add_column("Departure", justify="right", no_wrap=True)
-        table.add_column("Destination")
-        table.add_column("Arrival", justify="right", no_wrap=True)
-        table.add_column("Status", justify="right", no_wrap=True)
-        table.add_column("Seat", justify="right", no_wrap=True)
+        console.print(self._bookings_table(self.joined_rows([self])))
+
+
+# Índices por cliente, por voo e por CPF: consultas sem varrer todas as reservas.
+# Criação, remoção e troca de voo (booking.flight_id = ...) os mantêm atualizados.
+Booking.repository.add_index("owner_id")
+Booking.repository.add_index("flight_id")
+Booking.repository.add_index("passenger_cpf", normalize_cpf)
 
-        status_display = self.state.get_status_name()
-        table.add_row(
-            f"{self.id}",
-            f"{self.flight.id}",
-            f"{self.flight.From}",
-            f"{stringify_date(self.flight.departure)}",
-            f"{self.flight.To}",
-            f"{stringify_date(self.flight.arrival)}",
-            f"{status_display}",
-            f"{self.seat_id}" if self.seat_id else "N/A",
-        )
-        console.print(table)
+Booking.waitlist.attach(Flight.events)
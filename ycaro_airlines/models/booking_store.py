@@ -0,0 +1,280 @@
+import sys
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List
+
+from ycaro_airlines.models.booking import Booking, BookingOperations, normalize_cpf
+from ycaro_airlines.states.booking_state import BOOKED, CANCELLED
+
+# Código de linha removida na coluna de status
+_REMOVED = 0
+
+
+def format_cpf(digits: int) -> str:
+    text = f"{digits:011d}"
+    return f"{text[:3]}.{text[3:6]}.{text[6:9]}-{text[9:]}"
+
+
+class BookingView(BookingOperations):
+    """
+    Visão leve de uma linha do BookingRecordStore com a API de Booking.
+
+    Não guarda dados: leituras e escritas vão direto para as colunas, então
+    criar uma visão custa só um objeto de dois slots.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "BookingRecordStore", row: int):
+        self._store = store
+        self._row = row
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, BookingView)
+            and other._store is self._store
+            and other._row == self._row
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._row))
+
+    def __repr__(self) -> str:
+        return (
+            f"BookingView(id={self.id}, flight_id={self.flight_id}, owner_id={self.owner_id}, "
+            f"passenger_name={self.passenger_name!r}, status={self.state.get_status_name()})"
+        )
+
+    @property
+    def id(self) -> int:
+        return self._store._ids[self._row]
+
+    @property
+    def flight_id(self) -> int:
+        return self._store._flight_ids[self._row]
+
+    @flight_id.setter
+    def flight_id(self, value: int):
+        self._store._move_to_flight(self._row, value)
+
+    @property
+    def owner_id(self) -> int:
+        return self._store._owner_ids[self._row]
+
+    @property
+    def price(self) -> float:
+        return self._store._prices[self._row]
+
+    @price.setter
+    def price(self, value: float):
+        self._store._prices[self._row] = value
+
+    @property
+    def seat_id(self) -> int | None:
+        seat = self._store._seat_ids[self._row]
+        return None if seat < 0 else seat
+
+    @seat_id.setter
+    def seat_id(self, value: int | None):
+        self._store._seat_ids[self._row] = -1 if value is None else value
+
+    @property
+    def passenger_name(self) -> str:
+        return self._store._names[self._row]
+
+    @property
+    def passenger_cpf(self) -> str:
+        return format_cpf(self._store._cpfs[self._row])
+
+    @property
+    def fare_class(self) -> str | None:
+        return self._store._fare_codes[self._store._fare_classes[self._row]]
+
+    @property
+    def status_code(self) -> int:
+        return self._store._status_codes[self._row]
+
+    @status_code.setter
+    def status_code(self, value: int):
+        self._store._status_codes[self._row] = value
+
+    def to_booking_fields(self) -> dict:
+        """Campos no formato de Booking (ex.: para Booking.bulk_load)."""
+        return {
+            "id": self.id,
+            "owner_id": self.owner_id,
+            "flight_id": self.flight_id,
+            "passenger_name": self.passenger_name,
+            "passenger_cpf": self.passenger_cpf,
+            "price": self.price,
+            "seat_id": self.seat_id,
+            "fare_class": self.fare_class,
+            "status_code": self.status_code,
+        }
+
+
+class BookingRecordStore:
+    """
+    Armazenamento colunar de reservas para milhões de registros.
+
+    Cada campo é uma coluna (array de tipos primitivos), inclusive o id da
+    reserva, que vem da mesma sequência de Booking e por isso nunca colide
+    com ele. Os ids são crescentes ao longo das linhas, então achar a linha
+    de um id é uma busca binária na coluna (sem dicionário por registro).
+    Nomes de passageiros são internados (um único objeto str por nome
+    repetido), o CPF é guardado como inteiro de 11 dígitos e a classe
+    tarifária como um código pequeno. O acesso é feito por BookingView,
+    que expõe a mesma API de Booking.
+    """
+
+    def __init__(self):
+        self._ids = array("q")
+        self._flight_ids = array("q")
+        self._owner_ids = array("q")
+        self._prices = array("d")
+        self._seat_ids = array("i")
+        self._cpfs = array("q")
+        self._status_codes = array("b")
+        self._fare_classes = array("b")
+        self._names: List[str] = []
+        # Código 0 = sem classe tarifária
+        self._fare_codes: List[str | None] = [None]
+        self._fare_index: Dict[str | None, int] = {None: 0}
+        # Voo -> linhas ativas, em ordem (consultas por voo sem varrer a coluna)
+        self._rows_by_flight: Dict[int, array] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _fare_code(self, fare_class: str | None) -> int:
+        if (code := self._fare_index.get(fare_class)) is None:
+            code = len(self._fare_codes)
+            self._fare_codes.append(fare_class)
+            self._fare_index[fare_class] = code
+        return code
+
+    def add(
+        self,
+        owner_id: int,
+        flight_id: int,
+        passenger_name: str,
+        passenger_cpf: str,
+        price: float,
+        seat_id: int | None = None,
+        fare_class: str | None = None,
+        status_code: int = BOOKED,
+        id: int | None = None,
+    ) -> BookingView:
+        """Adiciona uma reserva. Sem id, recebe o próximo id de Booking."""
+        if (cpf := normalize_cpf(passenger_cpf)) is None or len(cpf) != 11:
+            raise ValueError(f"Invalid CPF: {passenger_cpf}")
+        if id is None:
+            id = Booking.repository.reserve_id()
+        elif self._ids and id <= self._ids[-1]:
+            raise ValueError(f"Booking ids must be increasing: {id} after {self._ids[-1]}")
+
+        row = len(self._flight_ids)
+        self._ids.append(id)
+        self._flight_ids.append(flight_id)
+        self._owner_ids.append(owner_id)
+        self._prices.append(price)
+        self._seat_ids.append(-1 if seat_id is None else seat_id)
+        self._cpfs.append(int(cpf))
+        self._status_codes.append(status_code)
+        self._fare_classes.append(self._fare_code(fare_class))
+        self._names.append(sys.intern(passenger_name))
+        self._flight_rows(flight_id).append(row)
+        self._size += 1
+        return BookingView(self, row)
+
+    def _flight_rows(self, flight_id: int) -> array:
+        if (rows := self._rows_by_flight.get(flight_id)) is None:
+            rows = self._rows_by_flight[flight_id] = array("q")
+        return rows
+
+    def _move_to_flight(self, row: int, flight_id: int):
+        """Troca o voo de uma linha mantendo o índice por voo (ex.: reacomodação)."""
+        old = self._flight_ids[row]
+        if old == flight_id:
+            return
+        self._rows_by_flight[old].remove(row)
+        insort(self._flight_rows(flight_id), row)
+        self._flight_ids[row] = flight_id
+
+    def extend(self, records: Iterable[dict]) -> int:
+        """Adiciona vários registros (mesmos argumentos de add); retorna quantos."""
+        added = 0
+        for record in records:
+            self.add(**record)
+            added += 1
+        return added
+
+    @classmethod
+    def from_bookings(cls, bookings: Iterable[Booking]) -> "BookingRecordStore":
+        """Copia reservas existentes para o formato compacto, mantendo os ids."""
+        store = cls()
+        for booking in sorted(bookings, key=lambda booking: booking.id):
+            store.add(
+                owner_id=booking.owner_id,
+                flight_id=booking.flight_id,
+                passenger_name=booking.passenger_name,
+                passenger_cpf=booking.passenger_cpf,
+                price=booking.price,
+                seat_id=booking.seat_id,
+                fare_class=booking.fare_class,
+                status_code=booking.status_code,
+                id=booking.id,
+            )
+        return store
+
+    def _row_of(self, id: int) -> int | None:
+        row = bisect_left(self._ids, id)
+        if row == len(self._ids) or self._ids[row] != id or self._status_codes[row] == _REMOVED:
+            return None
+        return row
+
+    def get(self, id: int) -> BookingView | None:
+        if (row := self._row_of(id)) is None:
+            return None
+        return BookingView(self, row)
+
+    def remove(self, id: int) -> bool:
+        if (row := self._row_of(id)) is None:
+            return False
+        # As linhas não se movem (visões existentes continuam válidas): só é marcada
+        self._status_codes[row] = _REMOVED
+        self._names[row] = ""
+        self._rows_by_flight[self._flight_ids[row]].remove(row)
+        self._size -= 1
+        return True
+
+    def __iter__(self) -> Iterator[BookingView]:
+        for row, code in enumerate(self._status_codes):
+            if code != _REMOVED:
+                yield BookingView(self, row)
+
+    def list(self) -> List[BookingView]:
+        return list(self)
+
+    def find_by_flight(self, flight_id: int, include_cancelled: bool = False) -> List[BookingView]:
+        """Só as linhas do voo, pelo índice (sem varrer a coluna inteira)."""
+        return [
+            BookingView(self, row)
+            for row in self._rows_by_flight.get(flight_id, ())
+            if include_cancelled or self._status_codes[row] != CANCELLED
+        ]
+
+    def nbytes(self) -> int:
+        """Memória aproximada: colunas, índice por voo, lista de nomes e cada nome distinto uma vez."""
+        columns = (
+            self._ids, self._flight_ids, self._owner_ids, self._prices, self._seat_ids,
+            self._cpfs, self._status_codes, self._fare_classes,
+        )
+        return (
+            sum(sys.getsizeof(column) for column in columns)
+            + sys.getsizeof(self._rows_by_flight)
+            + sum(sys.getsizeof(rows) for rows in self._rows_by_flight.values())
+            + sys.getsizeof(self._names)
+            + sum(sys.getsizeof(name) for name in set(self._names))
+        )
@@ -1,5 +1,6 @@
 from typing import ClassVar
 from ycaro_airlines.models.base_model import BaseModel
+from ycaro_airlines.models.loyalty import LoyaltyTier
 
 import ycaro_airlines.models.customer_service as customer_service
 from ycaro_airlines.models.user import Roles, User
@@ -24,6 +25,10 @@ class LoyaltyManager(PydanticBaseModel):
             raise ValueError("Insufficient loyalty points")
         self.points -= amount
 
+    @property
+    def tier(self) -> LoyaltyTier:
+        return LoyaltyTier.for_points(self.points)
+
 
 class Customer(User):
     loyalty_points: LoyaltyManager
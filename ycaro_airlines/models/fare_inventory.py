@@ -0,0 +1,109 @@
+from typing import Dict, List, Sequence, Tuple
+
+
+class FareBucket:
+    """
+    Classe tarifária de um voo.
+
+    authorization é o limite aninhado: quantas vendas esta classe e todas as
+    classes mais baratas abaixo dela podem somar.
+    """
+
+    def __init__(self, code: str, fare_multiplier: float, authorization: int):
+        self.code = code
+        self.fare_multiplier = fare_multiplier
+        self.authorization = authorization
+        self.sold = 0
+        self.available = 0
+
+
+# (código, multiplicador da tarifa, fração da capacidade autorizada), da mais cara à mais barata
+DEFAULT_BUCKETS: Tuple[Tuple[str, float, float], ...] = (
+    ("Y", 2.0, 1.0),
+    ("B", 1.5, 0.8),
+    ("M", 1.2, 0.6),
+    ("Q", 1.0, 0.3),
+)
+
+
+class FareInventory:
+    """
+    Inventário de classes tarifárias aninhadas (Y/B/M/Q).
+
+    As classes ficam ordenadas da mais cara para a mais barata. Uma venda em
+    uma classe consome o limite dela e de todas as classes acima, então a
+    disponibilidade de uma classe é o menor saldo entre ela e as superiores.
+    Os saldos e a classe aberta mais barata são recalculados a cada venda ou
+    liberação (custo proporcional ao número de classes, constante), e as
+    consultas só leem os contadores.
+    """
+
+    def __init__(self, capacity: int, buckets: Sequence[Tuple[str, float, float]] = DEFAULT_BUCKETS):
+        self.capacity = capacity
+        self.buckets: List[FareBucket] = [
+            FareBucket(code, multiplier, int(capacity * share))
+            for code, multiplier, share in buckets
+        ]
+        self._by_code: Dict[str, FareBucket] = {b.code: b for b in self.buckets}
+        self._lowest_open: FareBucket | None = None
+        self._recompute()
+
+    def _recompute(self):
+        # Vendas acumuladas de cada classe e das mais baratas abaixo dela
+        sold_at_or_below = 0
+        cumulative = []
+        for bucket in reversed(self.buckets):
+            sold_at_or_below += bucket.sold
+            cumulative.append(sold_at_or_below)
+        cumulative.reverse()
+
+        # O saldo de uma classe é limitado pelo saldo das classes acima dela
+        remaining = self.capacity
+        self._lowest_open = None
+        for bucket, sold in zip(self.buckets, cumulative):
+            remaining = min(remaining, bucket.authorization - sold)
+            bucket.available = max(remaining, 0)
+            if bucket.available > 0:
+                self._lowest_open = bucket
+
+    def bucket(self, code: str) -> FareBucket:
+        if (bucket := self._by_code.get(code)) is None:
+            raise ValueError(f"Unknown fare class: {code}")
+        return bucket
+
+    def availability(self, code: str) -> int:
+        return self.bucket(code).available
+
+    @property
+    def lowest_open(self) -> FareBucket | None:
+        """Classe aberta mais barata, ou None se o voo estiver esgotado."""
+        return self._lowest_open
+
+    def sell(self, code: str) -> bool:
+        bucket = self.bucket(code)
+        if bucket.available <= 0:
+            return False
+        bucket.sold += 1
+        self._recompute()
+        return True
+
+    def release(self, code: str) -> bool:
+        bucket = self.bucket(code)
+        if bucket.sold <= 0:
+            return False
+        bucket.sold -= 1
+        self._recompute()
+        return True
+
+    def set_authorization(self, code: str, authorization: int):
+        """Ajuste do time de receita: novo limite aninhado para uma classe."""
+        if authorization < 0:
+            raise ValueError("Authorization level must not be negative")
+        self.bucket(code).authorization = authorization
+        self._recompute()
+
+    def restore(self, sold: Dict[str, int]):
+        """Restaura as vendas por classe (snapshot) com um único recálculo."""
+        for code, quantity in sold.items():
+            self.bucket(code).sold = quantity
+        self._recompute()
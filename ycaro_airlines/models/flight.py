@@ -1,33 +1,64 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from enum import Enum, auto
+from functools import cached_property, lru_cache
 from itertools import count
 from math import inf
 from random import randint, sample
+import threading
+from time import perf_counter
 from typing import Dict
+import pydantic
 from ycaro_airlines.strategies.concrete_filters import (
     CityFilterStrategy,
     PriceFilterStrategy,
     DepartureDateFilterStrategy,
     ArrivalDateFilterStrategy,
     FlightIdFilterStrategy,
+    SeatsAvailableFilterStrategy,
     CompositeFilterStrategy
 )
 from ycaro_airlines.strategies.flight_filter_context import FlightFilterContext
+from ycaro_airlines.strategies.filter_statistics import FilterStatistics
+from ycaro_airlines.strategies.parallel_filter import ParallelFilterExecutor
+from ycaro_airlines.strategies.filter_profiler import (
+    FilterProfiler,
+    QueryProfile,
+    StrategyProfile,
+)
+from ycaro_airlines.models.base_model import paused_gc
+from ycaro_airlines.models.fare_inventory import FareInventory
+from ycaro_airlines.models.flight_index import FlightRegistry
+from ycaro_airlines.models.flight_schedule import ScheduleRegistry
+from ycaro_airlines.observers.event_bus import EventBus, FlightEvent
+from ycaro_airlines.models.flight_search import (
+    FlexibleDay,
+    RoundTripOption,
+    SingleFlight,
+    group_by_departure_day,
+    k_cheapest_round_trips,
+)
 from rich.table import Table
 from rich.console import Console
 from typing import (
     Any,
     Callable,
+    Iterable,
+    Iterator,
     List,
     NotRequired,
-    Self,
+    Sequence,
     TypedDict,
-    Optional,
     Unpack,
 )
 
 cities = ["Maceio", "Recife", "Aracaju", "Joao Pessoa"]
 
+# Locks dos mapas de assentos, listrados por id de voo: operações em voos
+# diferentes raramente disputam o mesmo lock e não há um lock por objeto
+# (voos continuam serializáveis para o pool de processos das buscas).
+SEAT_LOCK_STRIPES = 64
+_seat_locks = [threading.RLock() for _ in range(SEAT_LOCK_STRIPES)]
+
 
 def stringify_date(date: datetime):
     return f"{str(date.hour).zfill(2)}:{str(date.minute).zfill(2)} {str(date.day).zfill(2)}/{str(date.month).zfill(2)}"
@@ -66,10 +97,208 @@ class FlightQueryParams(TypedDict):
 
     flight_id: NotRequired[int]
 
+    # Mínimo de assentos livres
+    seats_gte: NotRequired[int]
+
+    # Busca com datas flexíveis: partida em torno de uma data, +/- flex_days
+    date_departure_around: NotRequired[datetime]
+    flex_days: NotRequired[int]
+
+
+class CompiledFlightQuery(pydantic.BaseModel):
+    """
+    Consulta de voos compilada: imutável, hashable e com limites normalizados.
+    
+    Duas buscas equivalentes (mesmos filtros, em qualquer ordem ou forma)
+    compilam para objetos iguais, então a consulta pode ser usada como chave
+    de cache de resultados, de agrupamento de requisições e de planos de índice.
+    A árvore de estratégias é montada uma única vez por consulta compilada.
+    """
+
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    flight_id: int | None = None
+    city_from: str | None = None
+    city_to: str | None = None
+    price_min: float = 0.0
+    price_max: float = inf
+    departure_from: datetime | None = None
+    departure_to: datetime | None = None
+    arrival_from: datetime | None = None
+    arrival_to: datetime | None = None
+    departure_around: date | None = None
+    flex_days: int = 0
+    min_seats: int = 0
+
+    @classmethod
+    def from_params(cls, params: FlightQueryParams) -> "CompiledFlightQuery":
+        """Compila os parâmetros, reaproveitando compilações anteriores iguais."""
+        return _compile_query(tuple(sorted(params.items())))
+
+    @classmethod
+    def _normalize(cls, params: FlightQueryParams) -> "CompiledFlightQuery":
+        def city(value: str | None) -> str | None:
+            return value.strip() or None if value else None
+
+        def bound(value: datetime | None, open_value: datetime) -> datetime | None:
+            return None if value is None or value == open_value else value
+
+        # Mesma regra de list_flights: ID tem prioridade e ignora os demais filtros
+        if flight_id := params.get("flight_id"):
+            return cls(flight_id=flight_id)
+
+        price_min = params.get("price_gte")
+        price_max = params.get("price_lte")
+
+        departure_from = bound(params.get("date_departure_gte"), datetime.min)
+        departure_to = bound(params.get("date_departure_lte"), datetime.max)
+        departure_around = None
+        flex_days = 0
+
+        # Datas flexíveis viram um intervalo de partida de dias inteiros,
+        # intersectado com os limites explícitos (se houver)
+        if (around := params.get("date_departure_around")) is not None:
+            departure_around = around.date() if isinstance(around, datetime) else around
+            flex_days = max(int(params.get("flex_days", 0)), 0)
+            window_start = datetime.combine(
+                departure_around - timedelta(days=flex_days), time.min
+            )
+            window_end = datetime.combine(
+                departure_around + timedelta(days=flex_days), time.max
+            )
+            departure_from = max(departure_from or window_start, window_start)
+            departure_to = min(departure_to or window_end, window_end)
+
+        return cls(
+            city_from=city(params.get("city_from")),
+            city_to=city(params.get("city_to")),
+            price_min=max(float(price_min), 0.0) if price_min is not None else 0.0,
+            price_max=float(price_max) if price_max is not None else inf,
+            departure_from=departure_from,
+            departure_to=departure_to,
+            arrival_from=bound(params.get("date_arrival_gte"), datetime.min),
+            arrival_to=bound(params.get("date_arrival_lte"), datetime.max),
+            departure_around=departure_around,
+            flex_days=flex_days,
+            min_seats=max(int(params.get("seats_gte", 0)), 0),
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """True quando a consulta não filtra nada."""
+        return self == _EMPTY_QUERY
+
+    @property
+    def cache_key(self) -> str:
+        """Chave textual estável (independe de processo e de hash aleatório)."""
+        parts = []
+        for name, value in self.model_dump().items():
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            parts.append(f"{name}={value}")
+        return "|".join(parts)
+
+    def to_params(self) -> FlightQueryParams:
+        params: FlightQueryParams = {}
+        if self.flight_id is not None:
+            params["flight_id"] = self.flight_id
+        if self.city_from is not None:
+            params["city_from"] = self.city_from
+        if self.city_to is not None:
+            params["city_to"] = self.city_to
+        if self.price_min > 0:
+            params["price_gte"] = self.price_min
+        if self.price_max < inf:
+            params["price_lte"] = self.price_max
+        if self.departure_from is not None:
+            params["date_departure_gte"] = self.departure_from
+        if self.departure_to is not None:
+            params["date_departure_lte"] = self.departure_to
+        if self.arrival_from is not None:
+            params["date_arrival_gte"] = self.arrival_from
+        if self.arrival_to is not None:
+            params["date_arrival_lte"] = self.arrival_to
+        if self.min_seats > 0:
+            params["seats_gte"] = self.min_seats
+        if self.departure_around is not None:
+            params["date_departure_around"] = datetime.combine(self.departure_around, time.min)
+            params["flex_days"] = self.flex_days
+        return params
+
+    @cached_property
+    def strategy(self) -> CompositeFilterStrategy:
+        """
+        Monta a estratégia composta correspondente à consulta.
+        """
+        # Cria estratégia composta para combinar múltiplos filtros; a ordem
+        # de inserção abaixo é só o ponto de partida da ordenação adaptativa
+        composite = CompositeFilterStrategy(
+            adaptive=True, statistics=Flight.filter_statistics
+        )
+        
+        # Filtro de ID tem prioridade: nenhum outro filtro é considerado
+        if self.flight_id is not None:
+            return composite.add_strategy(FlightIdFilterStrategy(self.flight_id))
+        
+        # Adiciona filtro de cidade se especificado
+        if self.city_from or self.city_to:
+            composite.add_strategy(
+                CityFilterStrategy(from_city=self.city_from, to_city=self.city_to)
+            )
+        
+        # Adiciona filtro de preço se especificado
+        if self.price_min > 0 or self.price_max < inf:
+            composite.add_strategy(
+                PriceFilterStrategy(min_price=self.price_min, max_price=self.price_max)
+            )
+        
+        # Adiciona filtro de data de partida se especificado
+        if self.departure_from or self.departure_to:
+            composite.add_strategy(
+                DepartureDateFilterStrategy(
+                    start_date=self.departure_from, end_date=self.departure_to
+                )
+            )
+        
+        # Adiciona filtro de data de chegada se especificado
+        if self.arrival_from or self.arrival_to:
+            composite.add_strategy(
+                ArrivalDateFilterStrategy(
+                    start_date=self.arrival_from, end_date=self.arrival_to
+                )
+            )
+        
+        # Adiciona filtro de disponibilidade se especificado
+        if self.min_seats > 0:
+            composite.add_strategy(SeatsAvailableFilterStrategy(self.min_seats))
+        
+        return composite
+
+
+_EMPTY_QUERY = CompiledFlightQuery()
+
+
+@lru_cache(maxsize=1024)
+def _compile_query(items: tuple) -> CompiledFlightQuery:
+    return CompiledFlightQuery._normalize(dict(items))
+
 
 class Flight:
-    flights: dict[int, Self] = {}
+    # Dicionário id -> voo que também mantém o índice por data de partida
+    flights: FlightRegistry = FlightRegistry()
     flight_counter = count()
+    # Estatísticas compartilhadas pelas buscas para ordenar filtros adaptativamente
+    filter_statistics = FilterStatistics()
+    # Quando definido, buscas grandes são avaliadas em um pool de processos
+    parallel_executor: ParallelFilterExecutor | None = None
+    # Instrumentação opcional das buscas (ver enable_profiling)
+    profiler: FilterProfiler | None = None
+    # Compartilha buscas idênticas que estão em andamento ao mesmo tempo
+    coalescer = SingleFlight()
+    # Eventos de assento e preço (Observer): precificação dinâmica, caches, ...
+    events = EventBus()
+    # Voos recorrentes, materializados quando uma busca toca a data
+    schedules = ScheduleRegistry()
 
     def __init__(
         self,
@@ -99,18 +328,112 @@ class Flight:
         if arrival_date < departure_date:
             raise ValueError("Flight must depart before arrival")
 
-        self.departure = departure_date
-        self.arrival = arrival_date
-
         if price < 0:
             raise ValueError("Flight price must be positive")
 
+        self._setup(departure_date, arrival_date, price, price)
+        self._seats = self._seat_map()
+
+    def _setup(self, departure: datetime, arrival: datetime, price: float, base_price: float):
+        """Estado derivado comum ao construtor normal e ao confiável (exceto o mapa de assentos)."""
+        self.departure = departure
+        self.arrival = arrival
+
         self.price = price
+        # Tarifa de referência; price pode ser recalculado a partir dela
+        self.base_price = base_price
+
+        # Assentos restaurados de um snapshot, aplicados quando o mapa for montado
+        self._restored_seats: Dict[int, booking_id] | None = None
+        # Contador mantido por occupy_seat/open_seat para não varrer o mapa de assentos
+        self.seats_available = self.capacity
+
+        # Classes tarifárias aninhadas (Y/B/M/Q) com contadores de venda
+        self.fares = FareInventory(self.capacity)
 
-        self.seats: Dict[int, Seat] = {
+        # Voo cancelado pela companhia: não aceita mais ocupação de assentos
+        self.cancelled = False
+
+    def _seat_map(self) -> Dict[int, Seat]:
+        seats = {
             id: Seat(status=SeatStatus.open, id=id, booking=None)
             for id in range(0, self.capacity)
         }
+        for seat_id, booking in (self._restored_seats or {}).items():
+            seats[seat_id].status = SeatStatus.reserved
+            seats[seat_id].booking = booking
+        self._restored_seats = None
+        return seats
+
+    @property
+    def seat_lock(self) -> threading.RLock:
+        """Lock que protege assentos, contador e classes tarifárias deste voo."""
+        return _seat_locks[self.id % SEAT_LOCK_STRIPES]
+
+    @property
+    def seats(self) -> Dict[int, Seat]:
+        # Voos de construção confiável só montam o mapa no primeiro acesso
+        if self._seats is None:
+            with self.seat_lock:
+                if self._seats is None:
+                    self._seats = self._seat_map()
+        return self._seats
+
+    # ===== CONSTRUÇÃO CONFIÁVEL (SNAPSHOTS E IMPORTAÇÕES) =====
+
+    @classmethod
+    def from_trusted(
+        cls,
+        From: str,
+        To: str,
+        capacity: int,
+        departure: datetime,
+        arrival: datetime,
+        price: float,
+        base_price: float | None = None,
+        id: int | None = None,
+        occupied_seats: Dict[int, booking_id] | None = None,
+        fares_sold: Dict[str, int] | None = None,
+    ) -> "Flight":
+        """
+        Cria um voo a partir de dados já validados (snapshot, importação).
+
+        Pula as verificações de datas futuras, não publica eventos de
+        assento e só monta o mapa de assentos quando ele for usado; o id pode
+        ser preservado. Não registra em Flight.flights (ver bulk_load).
+        """
+        flight = cls.__new__(cls)
+        flight.From = From
+        flight.To = To
+        flight.id = next(cls.flight_counter) if id is None else id
+        flight.capacity = capacity
+        flight._setup(departure, arrival, price, price if base_price is None else base_price)
+        flight._seats = None
+
+        if occupied_seats:
+            flight._restored_seats = dict(occupied_seats)
+            flight.seats_available -= len(occupied_seats)
+
+        if fares_sold:
+            flight.fares.restore(fares_sold)
+        return flight
+
+    @classmethod
+    def bulk_load(cls, records: Iterable[dict]) -> List["Flight"]:
+        """
+        Carrega vários voos confiáveis (argumentos de from_trusted) e os registra.
+
+        IDs preservados avançam o contador para que voos novos não colidam.
+        """
+        with paused_gc():
+            loaded = [cls.from_trusted(**record) for record in records]
+        for flight in loaded:
+            cls.flights[flight.id] = flight
+
+        if loaded:
+            current = next(cls.flight_counter)
+            cls.flight_counter = count(max(current, max(f.id for f in loaded) + 1))
+        return loaded
 
     def __str__(self):
         return f"{self.id} - {self.From} -> {self.To}\n{stringify_date(self.departure)} -> {stringify_date(self.arrival)} | R${self.price} "
@@ -134,36 +457,112 @@ class Flight:
         Flight.flights[mock.id] = mock
         return mock
 
+    # Verificação e escrita de um assento acontecem sob o seat_lock do voo;
+    # os eventos são publicados depois de soltar o lock.
+
     def check_in_seat(self, booking_id: booking_id, seat_id: int):
-        seat = self.seats.get(seat_id)
+        with self.seat_lock:
+            seat = self.seats.get(seat_id)
 
-        if seat is None or seat.booking != booking_id:
-            return False
+            if seat is None or seat.booking != booking_id:
+                return False
 
-        seat.status = SeatStatus.checked_in
-        return True
+            seat.status = SeatStatus.checked_in
+            return True
 
     def occupy_seat(self, booking_id: booking_id, seat_id: int) -> Seat | None:
-        if (seat := self.seats.get(seat_id)) is None:
-            return None
+        with self.seat_lock:
+            if self.cancelled or (seat := self.seats.get(seat_id)) is None:
+                return None
 
-        if seat.status is not SeatStatus.open:
-            return None
+            if seat.status is not SeatStatus.open:
+                return None
 
-        seat.status = SeatStatus.reserved
-        seat.booking = booking_id
+            seat.status = SeatStatus.reserved
+            seat.booking = booking_id
+            self.seats_available -= 1
+
+        if self.events.has_subscribers(FlightEvent.SEAT_OCCUPIED):
+            self.events.publish(FlightEvent.SEAT_OCCUPIED, self, seat_id=seat_id)
 
         return seat
 
     def open_seat(self, seat_id: int):
-        if self.seats.get(seat_id) is None:
-            return False
+        with self.seat_lock:
+            if (seat := self.seats.get(seat_id)) is None:
+                return False
+
+            was_taken = seat.status is not SeatStatus.open
+            if was_taken:
+                self.seats_available += 1
 
-        self.seats[seat_id].booking = None
-        self.seats[seat_id].status = SeatStatus.open
+            seat.booking = None
+            seat.status = SeatStatus.open
+
+        if was_taken and self.events.has_subscribers(FlightEvent.SEAT_RELEASED):
+            self.events.publish(FlightEvent.SEAT_RELEASED, self, seat_id=seat_id)
 
         return True
 
+    def release_all_seats(self) -> int:
+        """
+        Libera o mapa de assentos inteiro de uma vez (o mapa é remontado,
+        vazio, no próximo acesso) e zera as vendas por classe tarifária.
+        Não publica SEAT_RELEASED por assento. Retorna quantos estavam ocupados.
+        """
+        with self.seat_lock:
+            released = self.capacity - self.seats_available
+            self._seats = None
+            self._restored_seats = None
+            self.seats_available = self.capacity
+            self.fares.restore({bucket.code: 0 for bucket in self.fares.buckets})
+        return released
+
+    def cancel(self) -> int:
+        """Cancela o voo: libera os assentos e fecha todas as classes para venda."""
+        with self.seat_lock:
+            released = self.release_all_seats()
+            for bucket in self.fares.buckets:
+                bucket.authorization = 0
+            self.fares.restore({})
+            self.cancelled = True
+        return released
+
+    def sell_fare(self, fare_class: str) -> bool:
+        """Vende uma classe tarifária (verificação e venda atômicas)."""
+        with self.seat_lock:
+            return self.fares.sell(fare_class)
+
+    def sell_lowest_fare(self) -> str | None:
+        """Vende a classe aberta mais barata. Retorna o código, ou None se esgotado."""
+        with self.seat_lock:
+            if (bucket := self.fares.lowest_open) is None or not self.fares.sell(bucket.code):
+                return None
+            return bucket.code
+
+    def release_fare(self, fare_class: str) -> bool:
+        with self.seat_lock:
+            return self.fares.release(fare_class)
+
+    @property
+    def seats_remaining(self) -> int:
+        # Voo cancelado libera o mapa, mas não tem mais assentos à venda
+        return 0 if self.cancelled else self.seats_available
+
+    def fare_for(self, fare_class: str) -> float:
+        return round(self.price * self.fares.bucket(fare_class).fare_multiplier, 2)
+
+    @property
+    def lowest_fare_class(self) -> str | None:
+        bucket = self.fares.lowest_open
+        return bucket.code if bucket is not None else None
+
+    @property
+    def lowest_fare(self) -> float | None:
+        """Tarifa mais barata ainda vendável, lida dos contadores em O(1)."""
+        bucket = self.fares.lowest_open
+        return self.fare_for(bucket.code) if bucket is not None else None
+
     @classmethod
     def get_flight(cls, fligth_id: int):
         return cls.flights.get(fligth_id)
@@ -173,67 +572,223 @@ class Flight:
         """
         Lista voos aplicando filtros usando Strategy Pattern.
         """
-        all_flights = list(cls.flights.values())
+        return cls.search(CompiledFlightQuery.from_params(query))
+
+    @classmethod
+    def _candidates(cls, query: CompiledFlightQuery) -> tuple[List["Flight"], str | None]:
+        """
+        Escolhe o ponto de partida da busca: busca direta por ID, o índice
+        (rota ou partida) que devolver menos voos ou, sem índice aplicável,
+        todos os voos. Voos cancelados nunca são candidatos.
+        """
+        if query.flight_id is not None:
+            flight = cls.flights.get(query.flight_id)
+            found = flight is not None and not flight.cancelled
+            return ([flight] if found else []), "flight_id"
+
+        cls._materialize_for(query)
+
+        options: list[tuple[int, str]] = []
+        if query.city_from is not None and query.city_to is not None:
+            options.append((cls.flights.by_route.count(query.city_from, query.city_to), "route"))
+        if query.departure_from is not None or query.departure_to is not None:
+            options.append(
+                (cls.flights.by_departure.count(query.departure_from, query.departure_to), "departure")
+            )
+
+        if not options:
+            return [f for f in cls.flights.values() if not f.cancelled], None
+
+        _, index_used = min(options)
+        if index_used == "route":
+            ids = cls.flights.by_route.get(query.city_from, query.city_to)
+        else:
+            ids = cls.flights.by_departure.range(query.departure_from, query.departure_to)
+        flights = (cls.flights[flight_id] for flight_id in ids)
+        return [f for f in flights if not f.cancelled], index_used
+
+    @classmethod
+    def _materialize_for(cls, query: CompiledFlightQuery):
+        """
+        Gera os voos recorrentes da janela e rota da busca antes de consultar
+        os índices. Buscas sem data nem rota completa não materializam nada
+        (enxergam só os voos já gerados): gerariam o horizonte de todas as rotas.
+        """
+        undated = query.departure_from is None and query.departure_to is None
+        if undated and (query.city_from is None or query.city_to is None):
+            return
+        cls.schedules.materialize(
+            query.departure_from, query.departure_to, query.city_from, query.city_to
+        )
+
+    @classmethod
+    def search(cls, query: CompiledFlightQuery) -> List["Flight"]:
+        """
+        Executa uma consulta compilada, reaproveitando a árvore de estratégias dela.
+        """
+        start = perf_counter() if cls.profiler is not None else 0.0
+        candidates, index_used = cls._candidates(query)
         
+        # Medições desta chamada (o composite da consulta é compartilhado)
+        run = []
         # Se não há filtros, retorna todos
-        if not query:
-            return all_flights
-        
-        # Cria estratégia composta para combinar múltiplos filtros
-        composite = CompositeFilterStrategy()
-        
-        # Adiciona filtro de ID se especificado (tem prioridade)
-        if flight_id := query.get("flight_id"):
-            composite.add_strategy(FlightIdFilterStrategy(flight_id))
-            # Se filtrando por ID, aplica e retorna imediatamente
-            context = FlightFilterContext(composite)
-            return context.apply_filter(all_flights)
+        if query.is_empty:
+            filtered_flights = candidates
+        else:
+            # Cria contexto e aplica os filtros
+            context = FlightFilterContext(query.strategy, cls.parallel_executor)
+            filtered_flights = context.apply_filter(candidates, run)
         
-        # Adiciona filtro de cidade se especificado
-        if query.get("city_from") or query.get("city_to"):
-            composite.add_strategy(
-                CityFilterStrategy(
-                    from_city=query.get("city_from"),
-                    to_city=query.get("city_to")
+        if cls.profiler is not None:
+            cls.profiler.record(
+                QueryProfile(
+                    query=dict(query.to_params()),
+                    strategies=[
+                        StrategyProfile(strategy.description(), rows_in, rows_out, elapsed)
+                        for strategy, rows_in, rows_out, elapsed in run
+                    ],
+                    total_elapsed=perf_counter() - start,
+                    result_count=len(filtered_flights),
+                    index_used=index_used,
                 )
             )
         
-        # Adiciona filtro de preço se especificado
-        if query.get("price_gte") is not None or query.get("price_lte") is not None:
-            composite.add_strategy(
-                PriceFilterStrategy(
-                    min_price=query.get("price_gte", 0),
-                    max_price=query.get("price_lte", float('inf'))
-                )
-            )
-        
-        # Adiciona filtro de data de partida se especificado
-        if query.get("date_departure_gte") or query.get("date_departure_lte"):
-            composite.add_strategy(
-                DepartureDateFilterStrategy(
-                    start_date=query.get("date_departure_gte"),
-                    end_date=query.get("date_departure_lte")
-                )
-            )
+        return filtered_flights
+
+    @classmethod
+    def search_coalesced(cls, query: CompiledFlightQuery) -> List["Flight"]:
+        """
+        search() com agrupamento: chamadas concorrentes da mesma consulta
+        compilada compartilham uma única execução do filtro.
+        """
+        return list(cls.coalescer.do(query, lambda: cls.search(query)))
+
+    @classmethod
+    async def search_coalesced_async(cls, query: CompiledFlightQuery) -> List["Flight"]:
+        """Versão asyncio de search_coalesced (compartilha execuções com threads)."""
+        return list(await cls.coalescer.do_async(query, lambda: cls.search(query)))
+
+    @classmethod
+    def batch_search(cls, queries: Sequence[FlightQueryParams]) -> List[List["Flight"]]:
+        """
+        Responde várias buscas de uma vez, na ordem de entrada; os voos de
+        cada resultado vêm em ordem de partida.
         
-        # Adiciona filtro de data de chegada se especificado
-        if query.get("date_arrival_gte") or query.get("date_arrival_lte"):
-            composite.add_strategy(
-                ArrivalDateFilterStrategy(
-                    start_date=query.get("date_arrival_gte"),
-                    end_date=query.get("date_arrival_lte")
-                )
-            )
+        Buscas idênticas são executadas uma única vez. Buscas com origem e
+        destino são agrupadas pela rota: cada grupo lê o índice de rota uma
+        vez e cada busca aplica o restante dos seus filtros sobre esse
+        conjunto reduzido. As demais usam o índice de partida quando têm
+        datas (via _candidates); as que não têm nenhum índice aplicável
+        compartilham uma única varredura do inventário.
+        """
+        compiled = [CompiledFlightQuery.from_params(query) for query in queries]
+
+        routes: dict[tuple[str, str], list[CompiledFlightQuery]] = {}
+        full_scan: list[CompiledFlightQuery] = []
+        results: dict[CompiledFlightQuery, List["Flight"]] = {}
+        for query in dict.fromkeys(compiled):
+            if query.flight_id is not None or query.is_empty:
+                results[query] = cls.search(query)
+            elif query.city_from is not None and query.city_to is not None:
+                cls._materialize_for(query)
+                routes.setdefault((query.city_from, query.city_to), []).append(query)
+            elif query.departure_from is not None or query.departure_to is not None:
+                candidates, _ = cls._candidates(query)
+                results[query] = query.strategy.filter(candidates)
+            else:
+                cls._materialize_for(query)
+                full_scan.append(query)
+
+        for (city_from, city_to), group in routes.items():
+            flights = (cls.flights[i] for i in cls.flights.by_route.get(city_from, city_to))
+            shared = [f for f in flights if not f.cancelled]
+            for query in group:
+                results[query] = query.strategy.filter(shared)
+
+        if full_scan:
+            shared = [f for f in cls.flights.values() if not f.cancelled]
+            for query in full_scan:
+                results[query] = query.strategy.filter(shared)
+
+        # sorted copia: buscas repetidas na entrada não compartilham a mesma lista
+        return [
+            sorted(results[query], key=lambda flight: (flight.departure, flight.id))
+            for query in compiled
+        ]
+
+    @classmethod
+    def search_flexible(cls, **query: Unpack[FlightQueryParams]) -> dict[date, FlexibleDay]:
+        """
+        Busca com datas flexíveis (date_departure_around +/- flex_days).
         
-        # Cria contexto e aplica os filtros
-        context = FlightFilterContext(composite)
-        filtered_flights = context.apply_filter(all_flights)
+        Faz uma única varredura de intervalo no índice de partida e devolve os
+        voos agrupados por dia, com a tarifa mais barata de cada dia.
+        """
+        compiled = CompiledFlightQuery.from_params(query)
+        if compiled.departure_around is None:
+            raise ValueError("Flexible search requires date_departure_around")
+
+        candidates, _ = cls._candidates(compiled)
+        matches = FlightFilterContext(compiled.strategy).stream_filter(candidates)
+        return group_by_departure_day(
+            matches,
+            compiled.departure_around - timedelta(days=compiled.flex_days),
+            compiled.departure_around + timedelta(days=compiled.flex_days),
+        )
+
+    @classmethod
+    def search_round_trip(
+        cls,
+        city_from: str,
+        city_to: str,
+        k: int = 10,
+        min_stay: timedelta = timedelta(0),
+        outbound: FlightQueryParams | None = None,
+        inbound: FlightQueryParams | None = None,
+    ) -> List[RoundTripOption]:
+        """
+        Os k pares ida/volta mais baratos entre duas cidades.
         
-        # Log para debugging (opcional)
-        print(f"Filtros aplicados: {context.get_description()}")
-        print(f"Voos encontrados: {len(filtered_flights)}")
+        outbound/inbound aceitam filtros extras (datas, preço) para cada perna.
+        A volta precisa partir pelo menos min_stay depois da chegada da ida.
+        """
+        outbound_flights = cls.list_flights(
+            **{**(outbound or {}), "city_from": city_from, "city_to": city_to}
+        )
+        inbound_flights = cls.list_flights(
+            **{**(inbound or {}), "city_from": city_to, "city_to": city_from}
+        )
+        return k_cheapest_round_trips(outbound_flights, inbound_flights, k, min_stay)
+
+    @classmethod
+    def enable_profiling(cls, max_profiles: int = 1000) -> FilterProfiler:
+        """Passa a registrar um QueryProfile para cada chamada de list_flights."""
+        cls.profiler = FilterProfiler(max_profiles)
+        return cls.profiler
+
+    @classmethod
+    def disable_profiling(cls):
+        cls.profiler = None
+
+    @classmethod
+    def iter_flights(cls, **query: Unpack[FlightQueryParams]) -> Iterator["Flight"]:
+        """
+        Versão preguiçosa de list_flights: os voos são filtrados sob demanda,
+        permitindo parar cedo (paginação, existência, top-k).
+        """
+        compiled = CompiledFlightQuery.from_params(query)
+        # Os candidatos são copiados para que inserções durante a iteração
+        # não quebrem o gerador
+        candidates, _ = cls._candidates(compiled)
+        if compiled.is_empty:
+            return iter(candidates)
         
-        return filtered_flights
+        return FlightFilterContext(compiled.strategy).stream_filter(candidates)
+
+    @classmethod
+    def flight_exists(cls, **query: Unpack[FlightQueryParams]) -> bool:
+        """Responde se existe algum voo para a busca, sem montar a lista inteira."""
+        return next(cls.iter_flights(**query), None) is not None
 
     @classmethod
     def print_flights_table(
@@ -249,8 +804,13 @@ class Flight:
         table.add_column("Destination")
         table.add_column("Arrival", justify="right", no_wrap=True)
         table.add_column("Price", justify="right", no_wrap=True)
+        table.add_column("Seats", justify="right", no_wrap=True)
+        table.add_column("Lowest Fare", justify="right", no_wrap=True)
+
+        flights = cls.list_flights(**query_params)
+        table.caption = f"{len(flights)} voos encontrados"
 
-        for i in cls.list_flights(**query_params):
+        for i in flights:
             table.add_row(
                 f"{i.id}",
                 f"{i.From}",
@@ -258,6 +818,29 @@ class Flight:
                 f"{i.To}",
                 f"{stringify_date(i.arrival)}",
                 "${:,.2f}".format(i.price),
+                f"{i.seats_remaining}",
+                f"{i.lowest_fare_class} " + "${:,.2f}".format(i.lowest_fare)
+                if i.lowest_fare_class else "Sold out",
+            )
+
+        console.print(table)
+
+    @classmethod
+    def print_flexible_table(
+        cls, console: Console, **query_params: Unpack[FlightQueryParams]
+    ):
+        table = Table(title="Flexible Dates")
+        table.add_column("Day")
+        table.add_column("Flights", justify="right", no_wrap=True)
+        table.add_column("Cheapest Flight", justify="right", no_wrap=True)
+        table.add_column("Cheapest Price", justify="right", no_wrap=True)
+
+        for day, result in cls.search_flexible(**query_params).items():
+            table.add_row(
+                day.strftime("%d/%m/%Y"),
+                f"{len(result.flights)}",
+                f"{result.cheapest.id}" if result.cheapest else "-",
+                "${:,.2f}".format(result.cheapest_price) if result.cheapest else "-",
             )
 
         console.print(table)
@@ -270,6 +853,7 @@ class Flight:
         table.add_column("Destination")
         table.add_column("Arrival", justify="right", no_wrap=True)
         table.add_column("Price", justify="right", no_wrap=True)
+        table.add_column("Seats", justify="right", no_wrap=True)
 
         table.add_row(
             f"{self.id}",
@@ -278,6 +862,7 @@ class Flight:
             f"{self.To}",
             f"{stringify_date(self.arrival)}",
             "${:,.2f}".format(self.price),
+            f"{self.seats_remaining}",
         )
 
         console.print(table)
@@ -0,0 +1,202 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from ycaro_airlines.models.booking import Booking
+from ycaro_airlines.models.flight import Flight
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    id INTEGER PRIMARY KEY,
+    city_from TEXT NOT NULL,
+    city_to TEXT NOT NULL,
+    departure TEXT NOT NULL,
+    arrival TEXT NOT NULL,
+    price REAL NOT NULL,
+    base_price REAL NOT NULL,
+    capacity INTEGER NOT NULL,
+    seats_available INTEGER NOT NULL,
+    archived_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flights_route ON flights (city_from, city_to, departure);
+CREATE INDEX IF NOT EXISTS flights_departure ON flights (departure);
+
+CREATE TABLE IF NOT EXISTS bookings (
+    id INTEGER PRIMARY KEY,
+    flight_id INTEGER NOT NULL,
+    owner_id INTEGER NOT NULL,
+    price REAL NOT NULL,
+    seat_id INTEGER,
+    passenger_name TEXT NOT NULL,
+    passenger_cpf TEXT NOT NULL,
+    fare_class TEXT,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bookings_flight ON bookings (flight_id);
+CREATE INDEX IF NOT EXISTS bookings_owner ON bookings (owner_id);
+"""
+
+
+class FlightArchive:
+    """
+    Arquivo em disco (SQLite) de voos que já partiram e de suas reservas.
+
+    O inventário em memória fica só com voos vendáveis; o histórico continua
+    consultável por id, rota, período de partida, voo ou cliente.
+    Datas são gravadas em ISO 8601, então a ordem textual é a cronológica.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        # Consultas podem vir de qualquer thread: conexão compartilhada + lock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.executescript(_SCHEMA)
+
+    # ===== ARQUIVAMENTO =====
+
+    def archive_departed(self, now: datetime | None = None,
+                         grace: timedelta = timedelta(0)) -> int:
+        """
+        Move para o arquivo os voos com partida anterior a now - grace,
+        junto com as reservas deles. Retorna quantos voos foram arquivados.
+        """
+        cutoff = (now or datetime.now()) - grace
+        # O índice por partida entrega os voos vencidos sem varrer o inventário
+        flight_ids = list(Flight.flights.by_departure.range(None, cutoff))
+        flight_ids = [i for i in flight_ids if Flight.flights[i].departure < cutoff]
+        if not flight_ids:
+            return 0
+
+        archived_at = datetime.now().isoformat()
+        flights = [Flight.flights[i] for i in flight_ids]
+        bookings = [
+            booking
+            for flight_id in flight_ids
+            for booking in Booking.list_flight_bookings(flight_id, include_cancelled=True)
+        ]
+
+        # Grava tudo em uma transação antes de tirar da memória
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO flights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        f.id, f.From, f.To, f.departure.isoformat(),
+                        f.arrival.isoformat(), f.price, f.base_price,
+                        f.capacity, f.seats_available, archived_at,
+                    )
+                    for f in flights
+                ],
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO bookings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        b.id, b.flight_id, b.owner_id, b.price, b.seat_id,
+                        b.passenger_name, b.passenger_cpf, b.fare_class,
+                        b.state.get_status_name(),
+                    )
+                    for b in bookings
+                ],
+            )
+
+        for booking in bookings:
+            # O hold de pagamento venceria sobre uma reserva que não existe mais
+            Booking.holds.confirm(booking.id)
+            Booking.repository.remove(booking.id)
+        for flight in flights:
+            Booking.waitlist.close(flight, "Voo já partiu")
+            Flight.flights.pop(flight.id, None)
+
+        return len(flight_ids)
+
+    # ===== CONSULTAS =====
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_flight(self, flight_id: int) -> Dict[str, Any] | None:
+        rows = self._query("SELECT * FROM flights WHERE id = ?", (flight_id,))
+        return rows[0] if rows else None
+
+    def find_flights(
+        self,
+        city_from: str | None = None,
+        city_to: str | None = None,
+        departed_from: datetime | None = None,
+        departed_to: datetime | None = None,
+    ) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        if city_from is not None:
+            clauses.append("city_from = ?")
+            params.append(city_from)
+        if city_to is not None:
+            clauses.append("city_to = ?")
+            params.append(city_to)
+        if departed_from is not None:
+            clauses.append("departure >= ?")
+            params.append(departed_from.isoformat())
+        if departed_to is not None:
+            clauses.append("departure <= ?")
+            params.append(departed_to.isoformat())
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT * FROM flights{where} ORDER BY departure, id", tuple(params))
+
+    def bookings_for_flight(self, flight_id: int) -> List[Dict[str, Any]]:
+        return self._query("SELECT * FROM bookings WHERE flight_id = ? ORDER BY id", (flight_id,))
+
+    def bookings_for_owner(self, owner_id: int) -> List[Dict[str, Any]]:
+        return self._query("SELECT * FROM bookings WHERE owner_id = ? ORDER BY id", (owner_id,))
+
+    def count_flights(self) -> int:
+        return self._query("SELECT COUNT(*) AS total FROM flights")[0]["total"]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class ArchivalJob:
+    """
+    Executa o arquivamento periodicamente.
+
+    O arquivamento tira voos e reservas dos repositórios em memória, que a
+    UI lê sem lock, então run_pending roda na thread principal como tarefa
+    do App (entre uma tela e outra). run_once pode ser chamado diretamente
+    (ex.: em testes ou em um cron).
+    """
+
+    def __init__(
+        self,
+        archive: FlightArchive,
+        interval: float = 3600.0,
+        grace: timedelta = timedelta(0),
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.archive = archive
+        self.interval = interval
+        self.grace = grace
+        self.clock = clock
+        self.archived_total = 0
+        self._next_run: datetime | None = None
+
+    def run_once(self) -> int:
+        archived = self.archive.archive_departed(self.clock(), self.grace)
+        self.archived_total += archived
+        return archived
+
+    def run_pending(self) -> int:
+        """Arquiva se o intervalo já passou desde a última execução. Retorna quantos voos saíram."""
+        now = self.clock()
+        if self._next_run is not None and now < self._next_run:
+            return 0
+        self._next_run = now + timedelta(seconds=self.interval)
+        return self.run_once()
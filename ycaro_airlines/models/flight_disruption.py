@@ -0,0 +1,134 @@
+"""
+ycaro_airlines/models/flight_disruption.py
+
+Cancelamento de voos pela companhia (irregularidade operacional). Todas as
+reservas ativas do voo são tratadas em lote: reacomodadas nos próximos voos
+da rota ou canceladas, com uma única notificação agregada no final.
+"""
+from datetime import timedelta
+from typing import Dict, Iterator, List, NamedTuple
+
+from ycaro_airlines.models.booking import Booking
+from ycaro_airlines.models.flight import Flight, SeatStatus
+from ycaro_airlines.observers.event_bus import BookingEvent
+from ycaro_airlines.states.booking_state import TRANSITIONS, can_transition
+
+
+class DisruptionResult(NamedTuple):
+    flight_id: int
+    # Reservas canceladas sem reacomodação
+    cancelled: List[Booking]
+    # id da reserva -> id do novo voo
+    rebooked: Dict[int, int]
+    # Destinatários da notificação agregada (0 se não notificou)
+    notified: int
+
+
+def _open_seats(flight: Flight) -> Iterator[int]:
+    # Percorrido uma vez por voo: os assentos ocupados no caminho ficam para trás
+    return (seat_id for seat_id, seat in flight.seats.items() if seat.status is SeatStatus.open)
+
+
+def _rebooking_candidates(flight: Flight, window: timedelta) -> List[Flight]:
+    """Próximos voos da mesma rota, por horário de partida, com assentos livres."""
+    end = flight.departure + window
+    Flight.schedules.materialize(flight.departure, end, flight.From, flight.To)
+    candidates = (
+        Flight.flights[i]
+        for i in Flight.flights.by_route.get(flight.From, flight.To)
+        if i != flight.id
+    )
+    return sorted(
+        (
+            f for f in candidates
+            if not f.cancelled and f.seats_remaining > 0
+            and flight.departure <= f.departure <= end
+        ),
+        key=lambda f: (f.departure, f.id),
+    )
+
+
+def _rebook(booking: Booking, flight: Flight, seat_id: int) -> bool:
+    # Outra sessão pode ter ocupado o assento desde a varredura
+    if flight.occupy_seat(booking.id, seat_id) is None:
+        return False
+
+    # Mantém a classe tarifária se ainda houver saldo, senão a mais barata aberta
+    fare_class = booking.fare_class
+    if fare_class is None or not flight.sell_fare(fare_class):
+        fare_class = flight.lowest_fare_class
+        if fare_class is not None and not flight.sell_fare(fare_class):
+            fare_class = None
+
+    booking.flight_id = flight.id
+    booking.seat_id = seat_id
+    booking.fare_class = fare_class
+    booking.status_code = TRANSITIONS[(booking.status_code, "rebook")]
+    booking._publish(BookingEvent.REBOOKED, flight_id=flight.id, seat_id=seat_id,
+                     fare_class=fare_class, status_code=booking.status_code)
+    return True
+
+
+def disrupt_flight(
+    flight_id: int,
+    rebook: bool = False,
+    window: timedelta = timedelta(days=3),
+    reason: str = "Cancelamento operacional",
+    notify: bool = True,
+) -> DisruptionResult:
+    """
+    Cancela um voo e trata todas as reservas ativas dele em lote.
+
+    O mapa de assentos e as vendas por classe são liberados de uma vez (sem
+    open_seat por reserva), as reservas mudam de estado pela tabela de
+    transições sem passar pelo State Pattern (sem prints nem nova busca do
+    voo) e, com rebook, os passageiros são reacomodados em ordem de reserva
+    nos próximos voos da rota (dentro de window) que ainda têm assentos.
+    Uma única notificação agregada é enviada no final.
+    """
+    if (flight := Flight.get_flight(flight_id)) is None:
+        raise ValueError(f"Flight {flight_id} not found")
+
+    affected = [
+        b for b in Booking.list_flight_bookings(flight_id)
+        if can_transition(b.status_code, "disrupt")
+    ]
+    flight.cancel()
+    # Ninguém mais será promovido neste voo
+    Booking.waitlist.close(flight, reason)
+
+    rebooked: Dict[int, int] = {}
+    pending = affected
+    if rebook:
+        pending = []
+        targets = iter(_rebooking_candidates(flight, window))
+        target = next(targets, None)
+        seats = _open_seats(target) if target is not None else None
+        for booking in affected:
+            while target is not None:
+                if (seat_id := next(seats, None)) is None:
+                    target = next(targets, None)
+                    seats = _open_seats(target) if target is not None else None
+                elif _rebook(booking, target, seat_id):
+                    rebooked[booking.id] = target.id
+                    # Reserva ainda não paga: o prazo recomeça no voo novo
+                    if Booking.holds.is_held(booking.id):
+                        Booking.holds.hold(booking)
+                    break
+            else:
+                pending.append(booking)
+
+    for booking in pending:
+        # Sem isso o hold venceria depois e tentaria cancelar de novo
+        Booking.holds.confirm(booking.id)
+        booking.seat_id = None
+        booking.status_code = TRANSITIONS[(booking.status_code, "disrupt")]
+        booking._publish(BookingEvent.CANCELLED, reason=reason)
+
+    notified = 0
+    if notify and affected:
+        from ycaro_airlines.composites import NotificationService
+
+        notified = NotificationService.notify_flight_cancellation(flight, affected, rebooked, reason)
+
+    return DisruptionResult(flight_id, pending, rebooked, notified)
@@ -0,0 +1,133 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from math import inf
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    from ycaro_airlines.models.flight import Flight
+
+
+class DepartureIndex:
+    """
+    Índice ordenado por data de partida.
+    
+    Mantém pares (partida, id) ordenados para responder buscas por intervalo
+    de datas com busca binária em vez de varrer todos os voos.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[datetime, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, flight: "Flight"):
+        insort(self._keys, (flight.departure, flight.id))
+
+    def remove(self, flight: "Flight"):
+        self.remove_key(flight.departure, flight.id)
+
+    def remove_key(self, departure: datetime, flight_id: int):
+        key = (departure, flight_id)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def _bounds(self, start: datetime | None, end: datetime | None) -> Tuple[int, int]:
+        low = 0 if start is None else bisect_left(self._keys, (start,))
+        high = len(self._keys) if end is None else bisect_right(self._keys, (end, inf))
+        return low, high
+
+    def count(self, start: datetime | None = None, end: datetime | None = None) -> int:
+        """Quantos voos partem no intervalo, em O(log n)."""
+        low, high = self._bounds(start, end)
+        return max(high - low, 0)
+
+    def range(self, start: datetime | None = None, end: datetime | None = None) -> Iterator[int]:
+        """IDs dos voos com start <= partida <= end, em ordem de partida."""
+        low, high = self._bounds(start, end)
+        for position in range(low, high):
+            yield self._keys[position][1]
+
+    def clear(self):
+        self._keys.clear()
+
+
+class RouteIndex:
+    """
+    Índice por par de cidades (origem, destino).
+    
+    Cada rota guarda um dict id -> None usado como conjunto ordenado, o que
+    permite remover em O(1) mantendo a ordem de inserção.
+    """
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], Dict[int, None]] = {}
+
+    def add(self, flight: "Flight"):
+        self._routes.setdefault((flight.From, flight.To), {})[flight.id] = None
+
+    def remove(self, flight: "Flight"):
+        route = self._routes.get((flight.From, flight.To))
+        if route is not None:
+            route.pop(flight.id, None)
+            if not route:
+                del self._routes[(flight.From, flight.To)]
+
+    def count(self, city_from: str, city_to: str) -> int:
+        return len(self._routes.get((city_from, city_to), ()))
+
+    def get(self, city_from: str, city_to: str) -> List[int]:
+        return list(self._routes.get((city_from, city_to), ()))
+
+    def clear(self):
+        self._routes.clear()
+
+
+class FlightRegistry(dict):
+    """
+    Dicionário id -> voo que mantém os índices secundários atualizados.
+    
+    Substitui o dict simples de Flight.flights: quem já escrevia
+    `Flight.flights[id] = voo` continua funcionando e os índices acompanham.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.by_departure = DepartureIndex()
+        self.by_route = RouteIndex()
+
+    def _index(self, flight: "Flight"):
+        self.by_departure.add(flight)
+        self.by_route.add(flight)
+
+    def _unindex(self, flight: "Flight"):
+        self.by_departure.remove(flight)
+        self.by_route.remove(flight)
+
+    def __setitem__(self, flight_id: int, flight: "Flight"):
+        if (previous := self.get(flight_id)) is not None:
+            self._unindex(previous)
+        super().__setitem__(flight_id, flight)
+        self._index(flight)
+
+    def __delitem__(self, flight_id: int):
+        self._unindex(self[flight_id])
+        super().__delitem__(flight_id)
+
+    def pop(self, flight_id: int, *default):
+        if flight_id not in self:
+            return super().pop(flight_id, *default)
+        flight = super().pop(flight_id)
+        self._unindex(flight)
+        return flight
+
+    def clear(self):
+        super().clear()
+        self.by_departure.clear()
+        self.by_route.clear()
+
+    def reindex(self, flight: "Flight", old_departure: datetime):
+        """Atualiza os índices depois que a partida de um voo mudou."""
+        self.by_departure.remove_key(old_departure, flight.id)
+        self.by_departure.add(flight)
@@ -0,0 +1,179 @@
+from datetime import date, datetime, time, timedelta
+from itertools import count
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    from ycaro_airlines.models.flight import Flight
+
+
+# Dias da semana no padrão de date.weekday(): segunda = 0 ... domingo = 6
+DAILY = frozenset(range(7))
+EXCEPT_SUNDAY = frozenset(range(6))
+
+
+class FlightSchedule:
+    """
+    Modelo de voo recorrente, ex.: "Maceio -> Recife diário às 07:00 exceto domingo".
+
+    Não cria voos sozinho: as instâncias (Flight) de cada data são geradas
+    sob demanda pelo ScheduleRegistry e lembradas aqui para não duplicar.
+    """
+
+    _counter = count()
+
+    def __init__(
+        self,
+        From: str,
+        To: str,
+        departure_time: time,
+        duration: timedelta,
+        price: float,
+        capacity: int = 255,
+        weekdays: Iterable[int] = DAILY,
+        first_day: date | None = None,
+        last_day: date | None = None,
+    ):
+        if duration <= timedelta(0):
+            raise ValueError("Schedule duration must be positive")
+        if first_day is not None and last_day is not None and last_day < first_day:
+            raise ValueError("Schedule must start before it ends")
+
+        self.id = next(self._counter)
+        self.From = From
+        self.To = To
+        self.departure_time = departure_time
+        self.duration = duration
+        self.price = price
+        self.capacity = capacity
+        self.weekdays = frozenset(weekdays)
+        self.first_day = first_day
+        self.last_day = last_day
+        # data -> id do voo já materializado
+        self.materialized: Dict[date, int] = {}
+
+    def departure_on(self, day: date) -> datetime:
+        return datetime.combine(day, self.departure_time)
+
+    def runs_on(self, day: date) -> bool:
+        if self.first_day is not None and day < self.first_day:
+            return False
+        if self.last_day is not None and day > self.last_day:
+            return False
+        return day.weekday() in self.weekdays
+
+    def occurrences(self, start: datetime, end: datetime) -> Iterator[date]:
+        """Datas em que o voo parte dentro de [start, end]."""
+        day = start.date()
+        while day <= end.date():
+            if self.runs_on(day) and start <= self.departure_on(day) <= end:
+                yield day
+            day += timedelta(days=1)
+
+    def build(self, day: date) -> "Flight":
+        from ycaro_airlines.models.flight import Flight
+
+        departure = self.departure_on(day)
+        return Flight(
+            From=self.From,
+            To=self.To,
+            capacity=self.capacity,
+            departure_date=departure,
+            arrival_date=departure + self.duration,
+            price=self.price,
+        )
+
+    def __str__(self):
+        return f"{self.From} -> {self.To} às {self.departure_time:%H:%M}"
+
+
+class ScheduleRegistry:
+    """
+    Modelos de voo recorrentes com materialização preguiçosa.
+
+    Uma busca que toca uma janela de datas gera apenas os voos daquela
+    janela; eles entram em Flight.flights e, portanto, nos índices de rota e
+    de partida como qualquer outro voo. Buscas sem data só materializam
+    quando a rota é completa (horizon daquela rota), e a reserva de um voo
+    recorrente por data usa flight_on, que gera um único dia.
+    """
+
+    def __init__(self, horizon: timedelta = timedelta(days=30),
+                 max_horizon: timedelta = timedelta(days=366)):
+        # Janela usada quando a busca por rota não limita a data de partida
+        self.horizon = horizon
+        # Limite de quão longe uma busca pode materializar
+        self.max_horizon = max_horizon
+        self._by_route: Dict[Tuple[str, str], List[FlightSchedule]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(schedules) for schedules in self._by_route.values())
+
+    def add(self, schedule: FlightSchedule) -> FlightSchedule:
+        self._by_route.setdefault((schedule.From, schedule.To), []).append(schedule)
+        return schedule
+
+    def remove(self, schedule: FlightSchedule):
+        schedules = self._by_route.get((schedule.From, schedule.To), [])
+        if schedule in schedules:
+            schedules.remove(schedule)
+
+    def clear(self):
+        self._by_route.clear()
+
+    def schedules(self, city_from: str | None = None, city_to: str | None = None) -> List[FlightSchedule]:
+        if city_from is not None and city_to is not None:
+            return list(self._by_route.get((city_from, city_to), ()))
+        return [
+            schedule
+            for (origin, destination), schedules in self._by_route.items()
+            if (city_from is None or origin == city_from)
+            and (city_to is None or destination == city_to)
+            for schedule in schedules
+        ]
+
+    def flight_on(self, schedule: FlightSchedule, day: date) -> "Flight | None":
+        """Voo do modelo em uma data, materializando se preciso (ex.: na reserva)."""
+        from ycaro_airlines.models.flight import Flight
+
+        if not schedule.runs_on(day):
+            return None
+
+        if (flight_id := schedule.materialized.get(day)) is not None:
+            # O voo pode ter sido arquivado ou removido
+            return Flight.flights.get(flight_id)
+
+        if schedule.departure_on(day) < datetime.now():
+            return None
+
+        flight = schedule.build(day)
+        Flight.flights[flight.id] = flight
+        schedule.materialized[day] = flight.id
+        return flight
+
+    def materialize(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        city_from: str | None = None,
+        city_to: str | None = None,
+    ) -> int:
+        """
+        Gera os voos ainda não materializados dos modelos que batem com a
+        rota e partem na janela. Retorna quantos voos foram criados.
+        """
+        if not self._by_route:
+            return 0
+
+        now = datetime.now()
+        start = max(start or now, now)
+        end = min(end or start + self.horizon, now + self.max_horizon)
+        if end < start:
+            return 0
+
+        created = 0
+        for schedule in self.schedules(city_from, city_to):
+            for day in schedule.occurrences(start, end):
+                if day not in schedule.materialized:
+                    self.flight_on(schedule, day)
+                    created += 1
+        return created
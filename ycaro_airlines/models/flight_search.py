@@ -0,0 +1,169 @@
+"""
+Tipos de resultado e algoritmos das buscas de voos que vão além de uma lista
+filtrada (datas flexíveis, ida e volta, agrupamento de requisições, ...).
+Flight expõe esses recursos como classmethods.
+"""
+import asyncio
+import heapq
+import threading
+from concurrent.futures import Future
+from datetime import date, timedelta
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+)
+
+if TYPE_CHECKING:
+    from ycaro_airlines.models.flight import Flight
+
+
+class FlexibleDay:
+    """Voos de um dia dentro de uma busca com datas flexíveis."""
+
+    def __init__(self, day: date):
+        self.day = day
+        self.flights: List["Flight"] = []
+        self.cheapest: Optional["Flight"] = None
+
+    def add(self, flight: "Flight"):
+        self.flights.append(flight)
+        if self.cheapest is None or flight.price < self.cheapest.price:
+            self.cheapest = flight
+
+    @property
+    def cheapest_price(self) -> float | None:
+        return self.cheapest.price if self.cheapest is not None else None
+
+
+def group_by_departure_day(
+    flights: Iterable["Flight"], first_day: date, last_day: date
+) -> Dict[date, FlexibleDay]:
+    """
+    Agrupa os voos por dia de partida numa única passada, calculando a tarifa
+    mais barata de cada dia enquanto agrupa. Dias sem voos também aparecem.
+    """
+    days = {
+        first_day + timedelta(days=offset): FlexibleDay(first_day + timedelta(days=offset))
+        for offset in range((last_day - first_day).days + 1)
+    }
+    for flight in flights:
+        if (bucket := days.get(flight.departure.date())) is not None:
+            bucket.add(flight)
+    return days
+
+
+class RoundTripOption:
+    """Par ida/volta com o preço total."""
+
+    def __init__(self, outbound: "Flight", inbound: "Flight"):
+        self.outbound = outbound
+        self.inbound = inbound
+        self.total_price = outbound.price + inbound.price
+
+    def __repr__(self):
+        return (
+            f"RoundTripOption(outbound={self.outbound.id}, inbound={self.inbound.id}, "
+            f"total_price={self.total_price})"
+        )
+
+
+def k_cheapest_round_trips(
+    outbound: Sequence["Flight"],
+    inbound: Sequence["Flight"],
+    k: int,
+    min_stay: timedelta = timedelta(0),
+) -> List[RoundTripOption]:
+    """
+    Os k pares ida/volta mais baratos em que a volta parte depois da chegada
+    da ida mais a estadia mínima.
+    
+    As duas listas são ordenadas por preço e os pares (i, j) são explorados
+    em ordem crescente de preço total com um heap, partindo de (0, 0) e
+    expandindo para (i + 1, j) e (i, j + 1). Só os pares próximos da
+    fronteira de custo são visitados, sem montar o produto cartesiano.
+    """
+    if k <= 0 or not outbound or not inbound:
+        return []
+
+    outbound = sorted(outbound, key=lambda flight: flight.price)
+    inbound = sorted(inbound, key=lambda flight: flight.price)
+
+    heap = [(outbound[0].price + inbound[0].price, 0, 0)]
+    visited = {(0, 0)}
+    options: List[RoundTripOption] = []
+
+    while heap and len(options) < k:
+        _, i, j = heapq.heappop(heap)
+        going, back = outbound[i], inbound[j]
+
+        if back.departure >= going.arrival + min_stay:
+            options.append(RoundTripOption(going, back))
+
+        for next_i, next_j in ((i + 1, j), (i, j + 1)):
+            if next_i < len(outbound) and next_j < len(inbound) and (next_i, next_j) not in visited:
+                visited.add((next_i, next_j))
+                heapq.heappush(
+                    heap,
+                    (outbound[next_i].price + inbound[next_j].price, next_i, next_j),
+                )
+
+    return options
+
+
+class SingleFlight:
+    """
+    Agrupamento de requisições idênticas concorrentes ("single-flight").
+    
+    A primeira chamada com uma chave executa a função; as chamadas com a
+    mesma chave que chegam enquanto ela está em andamento esperam e recebem
+    o mesmo resultado (ou a mesma exceção). Threads e tarefas asyncio
+    compartilham o mesmo registro, então uma tarefa pode aproveitar a
+    computação iniciada por uma thread e vice-versa.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def _join_or_lead(self, key: Hashable) -> tuple[Future, bool]:
+        with self._lock:
+            if (future := self._calls.get(key)) is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, fn: Callable[[], Any]):
+        try:
+            future.set_result(fn())
+        except BaseException as error:
+            future.set_exception(error)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        future, leader = self._join_or_lead(key)
+        if leader:
+            self._run(key, future, fn)
+        return future.result()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        future, leader = self._join_or_lead(key)
+        if leader:
+            # A função é síncrona: roda fora do loop para que outras tarefas
+            # possam chegar e se juntar a esta execução enquanto ela acontece
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(None, self._run, key, future, fn)
+        return await asyncio.wrap_future(future)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
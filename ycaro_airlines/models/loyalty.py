@@ -1,5 +1,5 @@
 from ycaro_airlines.models.base_model import BaseModel
-from enum import Enum
+from enum import Enum, IntEnum
 
 class RewardType(Enum):
     DISCOUNT = "discount"
@@ -7,6 +7,29 @@ class RewardType(Enum):
     FREE_FLIGHT = "free_flight"
     BAGGAGE = "free_baggage"
 
+class LoyaltyTier(IntEnum):
+    """Nível de fidelidade; valores maiores têm prioridade (ex.: lista de espera)"""
+    BASIC = 0
+    SILVER = 1
+    GOLD = 2
+    DIAMOND = 3
+
+    @classmethod
+    def for_points(cls, points: int) -> "LoyaltyTier":
+        for tier, minimum in reversed(TIER_THRESHOLDS):
+            if points >= minimum:
+                return tier
+        return cls.BASIC
+
+
+# Pontos mínimos de cada nível, do menor para o maior
+TIER_THRESHOLDS = (
+    (LoyaltyTier.BASIC, 0),
+    (LoyaltyTier.SILVER, 150),
+    (LoyaltyTier.GOLD, 300),
+    (LoyaltyTier.DIAMOND, 500),
+)
+
 class Reward(BaseModel):
     name: str
     description: str
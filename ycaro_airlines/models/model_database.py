@@ -1,6 +1,6 @@
 import abc
 from itertools import count
-from typing import Generic, TypeVar, Dict, Type
+from typing import Any, Callable, Generic, Hashable, Iterable, List, TypeVar, Dict, Type
 import pydantic
 
 """
@@ -13,6 +13,54 @@ Exemplo de singleton genérico para repositórios de modelos.
 
 T = TypeVar("T", bound=pydantic.BaseModel)
 
+
+class SecondaryIndex(Generic[T]):
+    """
+    Índice valor do campo -> itens, mantido pelo repositório.
+
+    normalize transforma o valor antes de indexar (ex.: CPF só com dígitos);
+    itens cujo valor normalizado é None ficam fora do índice.
+    """
+
+    def __init__(self, field: str, normalize: Callable[[Any], Hashable | None] | None = None):
+        self.field = field
+        self.normalize = normalize
+        self._buckets: Dict[Hashable, Dict[int, T]] = {}
+        self._keys: Dict[int, Hashable] = {}
+
+    def key_for(self, value: Any) -> Hashable | None:
+        return self.normalize(value) if self.normalize is not None else value
+
+    def add(self, id: int, item: T):
+        key = self.key_for(getattr(item, self.field, None))
+        if key is None:
+            return
+        self._buckets.setdefault(key, {})[id] = item
+        self._keys[id] = key
+
+    def discard(self, id: int):
+        if (key := self._keys.pop(id, None)) is None:
+            return
+        bucket = self._buckets[key]
+        bucket.pop(id, None)
+        if not bucket:
+            del self._buckets[key]
+
+    def refresh(self, id: int, item: T):
+        self.discard(id)
+        self.add(id, item)
+
+    def get(self, value: Any) -> List[T]:
+        """Itens com o valor informado, em ordem de inserção."""
+        return list(self._buckets.get(self.key_for(value), {}).values())
+
+    def count(self, value: Any) -> int:
+        return len(self._buckets.get(self.key_for(value), ()))
+
+    def clear(self):
+        self._buckets.clear()
+        self._keys.clear()
+
 class ModelRepository(abc.ABC, Generic[T]):
     _instances: Dict[Type, 'ModelRepository'] = {}
     
@@ -29,8 +77,34 @@ class ModelRepository(abc.ABC, Generic[T]):
             self.id_counter = count()
             self.data: dict[int, T] = {}
             self.model_type = model_type
+            self.indexes: Dict[str, SecondaryIndex[T]] = {}
             self._initialized = True
 
+    # ===== ÍNDICES SECUNDÁRIOS =====
+
+    def add_index(self, field: str, normalize: Callable[[Any], Hashable | None] | None = None) -> SecondaryIndex[T]:
+        """Cria (ou devolve) o índice de um campo, indexando os itens já salvos."""
+        if (index := self.indexes.get(field)) is None:
+            index = SecondaryIndex(field, normalize)
+            for id, item in self.data.items():
+                index.add(id, item)
+            self.indexes[field] = index
+        return index
+
+    def find(self, field: str, value: Any) -> List[T]:
+        """Itens cujo campo indexado vale value, sem varrer o repositório."""
+        return self.indexes[field].get(value)
+
+    def reindex(self, item: T, field: str | None = None):
+        """Atualiza os índices depois que um campo indexado do item mudou."""
+        if self.data.get(item.id) is not item:
+            return
+        if field is not None:
+            self.indexes[field].refresh(item.id, item)
+            return
+        for index in self.indexes.values():
+            index.refresh(item.id, item)
+
     def get(self, id: int) -> T | None:
         return self.data.get(id)
 
@@ -40,9 +114,31 @@ class ModelRepository(abc.ABC, Generic[T]):
     def save(self, item: T) -> int:
         item_id = next(self.id_counter)
         self.data[item_id] = item
+        for index in self.indexes.values():
+            index.add(item_id, item)
         return item_id
 
+    def reserve_id(self) -> int:
+        return next(self.id_counter)
+
+    def save_all_with_ids(self, items: Iterable[T]) -> int:
+        """
+        Salva itens que já têm id (restauração em lote) e avança o contador
+        uma única vez, para que ids novos não colidam com os restaurados.
+        """
+        highest = -1
+        for item in items:
+            self.data[item.id] = item
+            for index in self.indexes.values():
+                index.refresh(item.id, item)
+            highest = max(highest, item.id)
+        current = next(self.id_counter)
+        self.id_counter = count(max(current, highest + 1))
+        return highest
+
     def remove(self, id: int) -> T | None:
+        for index in self.indexes.values():
+            index.discard(id)
         return self.data.pop(id, None)
 
     def update(self, id: int, **kwargs) -> T | None:
@@ -59,4 +155,6 @@ class ModelRepository(abc.ABC, Generic[T]):
             return None
 
         self.data[id] = updated_model
+        for index in self.indexes.values():
+            index.refresh(id, updated_model)
         return updated_model
\ No newline at end of file
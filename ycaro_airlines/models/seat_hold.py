@@ -0,0 +1,116 @@
+import threading
+import time
+from datetime import timedelta
+from math import ceil
+from typing import TYPE_CHECKING, Callable
+
+from ycaro_airlines.models.timing_wheel import TimingWheel
+from ycaro_airlines.states.booking_state import BOOKED
+
+if TYPE_CHECKING:
+    from ycaro_airlines.models.booking import Booking
+
+
+class SeatHoldManager:
+    """
+    Reservas aguardando pagamento seguram assento e classe tarifária só por
+    um tempo (ttl). Se o pagamento não for confirmado até lá, a reserva é
+    cancelada e o assento volta a ficar livre.
+
+    As expirações ficam em uma TimingWheel com uma volta do tamanho do ttl,
+    então cada tick só encontra holds vencidos: nada de varrer as reservas.
+    tick() pode ser chamado diretamente (ex.: em testes); start() roda em uma
+    thread de fundo.
+    """
+
+    def __init__(
+        self,
+        ttl: timedelta = timedelta(minutes=15),
+        resolution: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.resolution = resolution
+        slots = ceil(ttl.total_seconds() / resolution) + 1
+        self.wheel = TimingWheel(tick=resolution, slots=slots, clock=clock)
+        self.expired_total = 0
+        # Reservas cujo pagamento já começou (ou terminou): não cobra duas vezes
+        self._claimed: set[int] = set()
+        # A UI cria holds enquanto a thread de fundo expira
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self.wheel)
+
+    def hold(self, booking: "Booking", ttl: timedelta | None = None):
+        """Começa (ou renova) o prazo de pagamento da reserva."""
+        delay = (ttl or self.ttl).total_seconds()
+        with self._lock:
+            self._claimed.discard(booking.id)
+            self.wheel.schedule(booking.id, delay, lambda: self._expire(booking.id))
+
+    def confirm(self, booking_id: int) -> bool:
+        """Tira a reserva da fila de expiração. False se não havia hold pendente."""
+        with self._lock:
+            return self.wheel.cancel(booking_id)
+
+    def claim(self, booking: "Booking") -> bool:
+        """
+        Chamado antes de cobrar: confirma o hold para que ele não vença durante
+        o pagamento. False se a reserva não está mais ativa (um hold vencido
+        cancela a reserva) ou se o pagamento dela já foi iniciado; nesse caso
+        a cobrança deve ser recusada. Reservas que nunca tiveram hold (telas
+        sem prazo de pagamento) podem ser pagas enquanto ativas. Se a
+        cobrança falhar, hold() devolve o prazo à reserva.
+        """
+        with self._lock:
+            if booking.id in self._claimed or booking.status_code != BOOKED:
+                return False
+            self.wheel.cancel(booking.id)
+            self._claimed.add(booking.id)
+            return True
+
+    def is_held(self, booking_id: int) -> bool:
+        return booking_id in self.wheel
+
+    def _expire(self, booking_id: int):
+        from ycaro_airlines.composites import NotificationBuilder, NotificationService, NotificationTemplate
+        from ycaro_airlines.models.booking import Booking
+
+        booking = Booking.get(booking_id)
+        # Costuma rodar na thread de fundo: nada de prints, o aviso vai pelo outbox
+        if booking is None or not booking.cancel_booking(verbose=False):
+            return
+        self.expired_total += 1
+        NotificationService.outbox.send(
+            NotificationBuilder().add_push(booking.owner_id).build(),
+            NotificationTemplate.booking_expired(booking_id),
+        )
+
+    def tick(self, now: float | None = None) -> int:
+        """Expira os holds vencidos até now. Retorna quantos venceram."""
+        with self._lock:
+            return self.wheel.advance(now)
+
+    def _loop(self):
+        while not self._stop.wait(self.resolution):
+            self.tick()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="seat-holds", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
@@ -0,0 +1,86 @@
+import time
+from math import ceil
+from typing import Callable, Dict, Hashable, List, Tuple
+
+
+class TimingWheel:
+    """
+    Agendador de expirações por roda de tempo com hash (hashed timing wheel).
+
+    O tempo é dividido em ticks; cada timer cai no slot (tick alvo % slots).
+    Avançar um tick só visita o slot atual, então o custo por tick não
+    depende do total de timers pendentes (só dos que caíram naquele slot);
+    agendar e cancelar são O(1). Timers mais distantes que uma volta da
+    roda ficam no mesmo slot e só disparam quando o tick alvo chega.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512,
+                 clock: Callable[[], float] = time.monotonic):
+        if tick <= 0 or slots <= 0:
+            raise ValueError("Tick and slot count must be positive")
+        self.tick = tick
+        self.clock = clock
+        # slot -> chave -> (tick alvo, callback)
+        self._slots: List[Dict[Hashable, Tuple[int, Callable[[], None]]]] = [
+            {} for _ in range(slots)
+        ]
+        # chave -> slot, para cancelar sem procurar
+        self._slot_of: Dict[Hashable, int] = {}
+        # Último tick já processado
+        self._current = self._tick_at(clock())
+
+    def _tick_at(self, now: float) -> int:
+        return int(now // self.tick)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slot_of
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[[], None]):
+        """Agenda callback para daqui a delay segundos (substitui o timer de key)."""
+        self.cancel(key)
+        # Prazo contado do relógio, não do último tick processado: a roda pode
+        # estar parada (antes de start(), depois de um período ocioso)
+        now = max(self._current, self._tick_at(self.clock()))
+        # Arredonda para cima: nunca dispara antes do prazo
+        target = now + max(1, ceil(delay / self.tick))
+        slot = target % len(self._slots)
+        self._slots[slot][key] = (target, callback)
+        self._slot_of[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        if (slot := self._slot_of.pop(key, None)) is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def advance(self, now: float | None = None) -> int:
+        """
+        Processa os ticks decorridos até now e dispara os timers vencidos.
+        Retorna quantos dispararam. Uma pausa longa visita cada slot no
+        máximo uma vez.
+        """
+        target = self._tick_at(self.clock() if now is None else now)
+        if target <= self._current:
+            return 0
+
+        first = self._current + 1
+        ticks = range(first, target + 1)
+        if len(ticks) > len(self._slots):
+            ticks = range(target - len(self._slots) + 1, target + 1)
+        self._current = target
+
+        due: List[Callable[[], None]] = []
+        for tick in ticks:
+            slot = self._slots[tick % len(self._slots)]
+            expired = [key for key, (deadline, _) in slot.items() if deadline <= target]
+            for key in expired:
+                due.append(slot.pop(key)[1])
+                del self._slot_of[key]
+
+        # Callbacks rodam depois da varredura: podem reagendar com segurança
+        for callback in due:
+            callback()
+        return len(due)
@@ -0,0 +1,263 @@
+import heapq
+import threading
+from datetime import datetime
+from itertools import count
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+from ycaro_airlines.models.loyalty import LoyaltyTier
+from ycaro_airlines.observers.event_bus import EventBus, FlightEvent
+
+if TYPE_CHECKING:
+    from ycaro_airlines.models.booking import Booking
+    from ycaro_airlines.models.customer import Customer
+    from ycaro_airlines.models.flight import Flight
+
+
+class WaitlistEntry:
+    """Pedido de um cliente para entrar em um voo lotado"""
+
+    __slots__ = (
+        "flight_id", "customer_id", "passenger_name", "passenger_cpf",
+        "tier", "requested_at", "sequence", "active", "booking_id",
+    )
+
+    def __init__(self, flight_id: int, customer_id: int, passenger_name: str,
+                 passenger_cpf: str, tier: LoyaltyTier, requested_at: datetime, sequence: int):
+        self.flight_id = flight_id
+        self.customer_id = customer_id
+        self.passenger_name = passenger_name
+        self.passenger_cpf = passenger_cpf
+        self.tier = tier
+        self.requested_at = requested_at
+        self.sequence = sequence
+        # False quando o cliente desiste ou é promovido (remoção preguiçosa do heap)
+        self.active = True
+        self.booking_id: int | None = None
+
+    def sort_key(self) -> tuple:
+        # Nível mais alto primeiro; no mesmo nível, quem pediu antes
+        return (-self.tier, self.requested_at, self.sequence)
+
+    def __lt__(self, other: "WaitlistEntry") -> bool:
+        return self.sort_key() < other.sort_key()
+
+
+class Waitlist:
+    """
+    Lista de espera de um voo: heap ordenado por nível de fidelidade e
+    depois pela hora do pedido. Entrar e promover são O(log n); desistir só
+    marca a entrada, que é descartada quando chegar ao topo.
+    """
+
+    def __init__(self, flight_id: int):
+        self.flight_id = flight_id
+        self._heap: List[WaitlistEntry] = []
+        # Cliente -> entrada ativa (um pedido por cliente e voo)
+        self._by_customer: Dict[int, WaitlistEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_customer)
+
+    def __contains__(self, customer_id: int) -> bool:
+        return customer_id in self._by_customer
+
+    def push(self, entry: WaitlistEntry):
+        if entry.customer_id in self._by_customer:
+            raise ValueError(f"Customer {entry.customer_id} is already on the waitlist")
+        heapq.heappush(self._heap, entry)
+        self._by_customer[entry.customer_id] = entry
+
+    def _discard_inactive(self):
+        while self._heap and not self._heap[0].active:
+            heapq.heappop(self._heap)
+
+    def peek(self) -> WaitlistEntry | None:
+        self._discard_inactive()
+        return self._heap[0] if self._heap else None
+
+    def pop(self) -> WaitlistEntry | None:
+        self._discard_inactive()
+        if not self._heap:
+            return None
+        entry = heapq.heappop(self._heap)
+        entry.active = False
+        del self._by_customer[entry.customer_id]
+        return entry
+
+    def discard(self, entry: WaitlistEntry) -> bool:
+        if not entry.active:
+            return False
+        entry.active = False
+        del self._by_customer[entry.customer_id]
+        return True
+
+    def clear(self) -> List[WaitlistEntry]:
+        """Esvazia a lista. Retorna as entradas que ainda estavam ativas."""
+        entries = self.entries()
+        for entry in entries:
+            entry.active = False
+        self._heap.clear()
+        self._by_customer.clear()
+        return entries
+
+    def entries(self) -> List[WaitlistEntry]:
+        """Entradas ativas na ordem de atendimento (O(n log n), para exibição)."""
+        return sorted(entry for entry in self._heap if entry.active)
+
+
+class WaitlistRegistry:
+    """
+    Listas de espera por voo, promovidas automaticamente.
+
+    Observa SEAT_RELEASED: quando um assento de um voo com lista de espera
+    é liberado (cancelamento, hold de pagamento vencido, troca de assento),
+    o primeiro da fila recebe uma reserva com aquele assento, sujeita ao
+    prazo de pagamento de Booking.holds. Reservas sem assento só liberam a
+    tarifa: o cancelamento chama fare_released(). Ninguém precisa consultar
+    a fila. Voos cancelados ou arquivados fecham a lista com close().
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.now):
+        self.clock = clock
+        self.promoted_total = 0
+        self._lists: Dict[int, Waitlist] = {}
+        self._sequence = count()
+        self._lock = threading.RLock()
+        self._events: EventBus | None = None
+
+    def attach(self, events: EventBus):
+        if self._events is None:
+            events.subscribe(FlightEvent.SEAT_RELEASED, self._on_seat_released)
+            self._events = events
+        return self
+
+    def detach(self):
+        if self._events is not None:
+            self._events.unsubscribe(FlightEvent.SEAT_RELEASED, self._on_seat_released)
+            self._events = None
+
+    def waitlist(self, flight_id: int) -> Waitlist:
+        if (waitlist := self._lists.get(flight_id)) is None:
+            waitlist = self._lists[flight_id] = Waitlist(flight_id)
+        return waitlist
+
+    def join(self, customer: "Customer", flight: "Flight", passenger_name: str,
+             passenger_cpf: str) -> WaitlistEntry:
+        """Entra na fila do voo. ValueError se o voo foi cancelado ou o cliente já está na fila."""
+        if flight.cancelled:
+            raise ValueError(f"Flight {flight.id} is cancelled")
+        entry = WaitlistEntry(
+            flight_id=flight.id,
+            customer_id=customer.id,
+            passenger_name=passenger_name,
+            passenger_cpf=passenger_cpf,
+            tier=customer.loyalty_points.tier,
+            requested_at=self.clock(),
+            sequence=next(self._sequence),
+        )
+        with self._lock:
+            self.waitlist(flight.id).push(entry)
+        return entry
+
+    def leave(self, entry: WaitlistEntry) -> bool:
+        with self._lock:
+            return self.waitlist(entry.flight_id).discard(entry)
+
+    def close(self, flight: "Flight", reason: str) -> List[WaitlistEntry]:
+        """
+        Encerra a lista de um voo que não vai mais vender (cancelado ou
+        arquivado) e avisa quem estava esperando. Retorna as entradas encerradas.
+        """
+        with self._lock:
+            if (waitlist := self._lists.pop(flight.id, None)) is None:
+                return []
+            entries = waitlist.clear()
+
+        if entries:
+            self._notify_closed(entries, flight, reason)
+        return entries
+
+    def position(self, entry: WaitlistEntry) -> int | None:
+        """Posição (1 = próximo) de uma entrada ativa."""
+        if not entry.active:
+            return None
+        return 1 + sum(1 for other in self.waitlist(entry.flight_id)._heap
+                       if other.active and other < entry)
+
+    def _on_seat_released(self, flight: "Flight", seat_id: int, **_):
+        if not self._lists.get(flight.id):
+            return
+        self.promote(flight, seat_id)
+
+    def fare_released(self, flight: "Flight") -> "Booking | None":
+        """Cancelamento de uma reserva sem assento: a classe liberada vai para a fila."""
+        if not self._lists.get(flight.id):
+            return None
+        return self.promote(flight)
+
+    def promote(self, flight: "Flight", seat_id: int | None = None) -> "Booking | None":
+        """
+        Reserva para o primeiro da fila (no assento seat_id, se ainda livre).
+        Retorna a reserva criada, ou None se a fila estiver vazia ou o voo
+        não tiver mais classe tarifária aberta.
+        """
+        from ycaro_airlines.models.booking import Booking
+
+        with self._lock:
+            waitlist = self.waitlist(flight.id)
+            if flight.cancelled or (fare_class := flight.lowest_fare_class) is None:
+                return None
+            if (entry := waitlist.pop()) is None:
+                return None
+
+        try:
+            booking = Booking(
+                owner_id=entry.customer_id,
+                flight_id=flight.id,
+                passenger_name=entry.passenger_name,
+                passenger_cpf=entry.passenger_cpf,
+                price=flight.fare_for(fare_class),
+                fare_class=fare_class,
+            )
+        except ValueError:
+            # A classe esgotou no meio do caminho: o cliente volta à fila
+            # (a menos que tenha pedido de novo ou a lista tenha sido fechada)
+            with self._lock:
+                if self._lists.get(flight.id) is waitlist and entry.customer_id not in waitlist:
+                    entry.active = True
+                    waitlist.push(entry)
+            return None
+
+        entry.booking_id = booking.id
+        if seat_id is not None:
+            booking.reserve_seat(seat_id)
+        Booking.holds.hold(booking)
+        self.promoted_total += 1
+        self._notify(booking, flight)
+        return booking
+
+    def _notify(self, booking: "Booking", flight: "Flight"):
+        from ycaro_airlines.composites import NotificationBuilder, NotificationService, NotificationTemplate
+
+        notifications = NotificationBuilder() \
+            .set_name("Lista de Espera") \
+            .add_push(booking.owner_id) \
+            .build()
+        # A promoção pode vir da expiração de um hold (thread de fundo)
+        NotificationService.outbox.send(notifications, NotificationTemplate.waitlist_promotion(
+            booking.id,
+            f"Voo {flight.id}: {flight.From} → {flight.To}",
+            int(booking.holds.ttl.total_seconds() // 60),
+        ))
+
+    def _notify_closed(self, entries: List[WaitlistEntry], flight: "Flight", reason: str):
+        from ycaro_airlines.composites import NotificationBuilder, NotificationService, NotificationTemplate
+
+        builder = NotificationBuilder().set_name(f"Lista de Espera do Voo {flight.id}")
+        for entry in entries:
+            builder.add_push(entry.customer_id)
+        # Arquivamento e cancelamento podem rodar fora da thread da UI
+        NotificationService.outbox.send(builder.build(), NotificationTemplate.waitlist_closed(
+            f"Voo {flight.id}: {flight.From} → {flight.To}",
+            reason,
+        ))
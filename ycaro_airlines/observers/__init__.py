@@ -0,0 +1,16 @@
+# ycaro_airlines/observers/__init__.py
+from .event_bus import (
+    EventBus,
+    FlightEvent,
+    BookingEvent
+)
+from .dynamic_pricing import DynamicPricingEngine
+from .booking_journal import BookingJournal
+
+__all__ = [
+    "EventBus",
+    "FlightEvent",
+    "BookingEvent",
+    "DynamicPricingEngine",
+    "BookingJournal"
+]
@@ -0,0 +1,276 @@
+"""
+ycaro_airlines/observers/booking_journal.py
+
+Event sourcing do ciclo de vida das reservas (observer dos BookingEvent).
+Cada mudança vira um evento em um fluxo somente-anexação; a cada N eventos
+um snapshot do modelo de leitura é guardado. Recuperação, auditoria e
+modelos de leitura partem do último snapshot e reaplicam só a cauda.
+
+Componente de biblioteca: a aplicação (main.py) não liga um journal; quem
+precisar de auditoria ou recuperação chama attach(Booking.events).
+"""
+import json
+import os
+from copy import deepcopy
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, TYPE_CHECKING
+
+from ycaro_airlines.observers.event_bus import BookingEvent, EventBus
+from ycaro_airlines.states.booking_state import BOOKED, CANCELLED, CHECKED_IN
+
+if TYPE_CHECKING:
+    from ycaro_airlines.models.booking import Booking
+
+
+class BookingEventRecord(NamedTuple):
+    """Um evento do fluxo (imutável)"""
+    sequence: int
+    booking_id: int
+    event: BookingEvent
+    data: Dict[str, Any]
+    timestamp: datetime
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "sequence": self.sequence,
+            "booking_id": self.booking_id,
+            "event": self.event.name,
+            "data": self.data,
+            "timestamp": self.timestamp.isoformat(),
+        })
+
+    @classmethod
+    def from_json(cls, line: str) -> "BookingEventRecord":
+        raw = json.loads(line)
+        return cls(
+            raw["sequence"],
+            raw["booking_id"],
+            BookingEvent[raw["event"]],
+            raw["data"],
+            datetime.fromisoformat(raw["timestamp"]),
+        )
+
+
+class BookingSnapshot(NamedTuple):
+    """Modelo de leitura (id -> campos da reserva) após o evento sequence"""
+    sequence: int
+    bookings: Dict[int, Dict[str, Any]]
+
+
+def apply_event(state: Dict[int, Dict[str, Any]], record: BookingEventRecord):
+    """Aplica um evento ao modelo de leitura (id -> campos da reserva)"""
+    if record.event is BookingEvent.CREATED:
+        state[record.booking_id] = {"status_code": BOOKED, **record.data}
+        return
+
+    # Journal ligado depois da criação: guarda só o que os eventos trouxeram
+    fields = state.setdefault(record.booking_id, {})
+    match record.event:
+        case BookingEvent.SEAT_RESERVED:
+            fields["seat_id"] = record.data["seat_id"]
+        case BookingEvent.CHECKED_IN:
+            fields["status_code"] = CHECKED_IN
+        case BookingEvent.CANCELLED:
+            fields["status_code"] = CANCELLED
+        case BookingEvent.REBOOKED:
+            fields.update(record.data)
+        case _:
+            # Eventos sem efeito no modelo de leitura ficam só no histórico
+            pass
+
+
+class BookingJournal:
+    """
+    Fluxo de eventos das reservas com snapshots periódicos.
+
+    Com path, cada evento é anexado a um arquivo JSONL e o último snapshot
+    é gravado em path + ".snapshot" (com a posição do arquivo de eventos
+    em que ele foi tirado), permitindo recover() após uma queda.
+    """
+
+    def __init__(self, snapshot_every: int = 1000, path: str | None = None,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.snapshot_every = snapshot_every
+        self.path = path
+        self.clock = clock
+        # Eventos em memória: os posteriores a _base (após recover, o snapshot)
+        self.events: List[BookingEventRecord] = []
+        self._base = 0
+        self.snapshots: List[BookingSnapshot] = []
+        # Fim do último evento gravado em path (bytes)
+        self._offset = 0
+        # Posições no fluxo por reserva (consultas de auditoria em O(k))
+        self._by_booking: Dict[int, List[int]] = {}
+        # Modelo de leitura mantido incrementalmente
+        self._state: Dict[int, Dict[str, Any]] = {}
+        self._bus: EventBus | None = None
+        self._handlers: Dict[BookingEvent, Callable] = {}
+
+    # ===== ASSINATURA =====
+
+    def attach(self, bus: EventBus):
+        """Passa a registrar os eventos de reserva publicados no barramento"""
+        self.detach()
+        self._bus = bus
+        for event in BookingEvent:
+            handler = self._handler_for(event)
+            self._handlers[event] = handler
+            bus.subscribe(event, handler)
+        return self
+
+    def detach(self):
+        if self._bus is None:
+            return
+        for event, handler in self._handlers.items():
+            self._bus.unsubscribe(event, handler)
+        self._handlers.clear()
+        self._bus = None
+
+    def _handler_for(self, event: BookingEvent):
+        def handler(booking, **data):
+            self.append(booking.id, event, data)
+        return handler
+
+    # ===== FLUXO =====
+
+    @property
+    def sequence(self) -> int:
+        return self._base + len(self.events)
+
+    def append(self, booking_id: int, event: BookingEvent, data: Dict[str, Any] | None = None) -> BookingEventRecord:
+        record = BookingEventRecord(self.sequence + 1, booking_id, event, dict(data or {}), self.clock())
+        self._store(record)
+
+        if self.path is not None:
+            with open(self.path, "ab") as file:
+                file.write((record.to_json() + "\n").encode("utf-8"))
+                self._offset = file.tell()
+
+        if self.snapshot_every and record.sequence % self.snapshot_every == 0:
+            self.snapshot()
+        return record
+
+    def _store(self, record: BookingEventRecord):
+        self._by_booking.setdefault(record.booking_id, []).append(len(self.events))
+        self.events.append(record)
+        apply_event(self._state, record)
+
+    def snapshot(self) -> BookingSnapshot:
+        snapshot = BookingSnapshot(self.sequence, deepcopy(self._state))
+        self.snapshots.append(snapshot)
+        if self.path is not None:
+            self._write_snapshot(snapshot)
+        return snapshot
+
+    def _write_snapshot(self, snapshot: BookingSnapshot):
+        """
+        Grava o snapshot sem nunca deixar o anterior pela metade: escreve em
+        um arquivo temporário e troca de uma vez. Os eventos até offset vão
+        para o disco antes, para o snapshot não apontar além do fluxo.
+        """
+        with open(self.path, "ab") as file:
+            os.fsync(file.fileno())
+
+        target = self.path + ".snapshot"
+        temporary = target + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({
+                "sequence": snapshot.sequence,
+                "offset": self._offset,
+                "bookings": snapshot.bookings,
+            }, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, target)
+
+    # ===== CONSULTAS =====
+
+    def history(self, booking_id: int) -> List[BookingEventRecord]:
+        """O que aconteceu com a reserva, em ordem"""
+        return [self.events[position] for position in self._by_booking.get(booking_id, ())]
+
+    def since(self, sequence: int) -> Iterator[BookingEventRecord]:
+        """Eventos posteriores a sequence (para modelos de leitura incrementais)"""
+        return iter(self.events[max(0, sequence - self._base):])
+
+    def current(self, booking_id: int) -> Dict[str, Any] | None:
+        state = self._state.get(booking_id)
+        return dict(state) if state is not None else None
+
+    def rebuild(self, upto: int | None = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Estado das reservas após o evento upto (padrão: o último), partindo
+        do snapshot mais recente anterior a ele e reaplicando só a cauda.
+        """
+        upto = self.sequence if upto is None else upto
+        base = next((s for s in reversed(self.snapshots) if s.sequence <= upto), None)
+        state = deepcopy(base.bookings) if base is not None else {}
+        start = base.sequence if base is not None else self._base
+        for record in self.events[start - self._base:upto - self._base]:
+            apply_event(state, record)
+        return state
+
+    def restore_bookings(self) -> List["Booking"]:
+        """
+        Recria as reservas em memória a partir do estado reconstruído.
+
+        Reservas cujo CREATED não está no fluxo (journal ligado depois da
+        criação) só têm os campos que os eventos seguintes trouxeram e ficam
+        de fora: o carregamento confiável não valida, e o modelo sairia incompleto.
+        """
+        from ycaro_airlines.models.booking import Booking
+
+        required = {name for name, field in Booking.model_fields.items() if field.is_required()}
+        required.discard("id")
+        return Booking.bulk_load(
+            {"id": booking_id, **fields}
+            for booking_id, fields in self._state.items()
+            if required <= fields.keys()
+        )
+
+    # ===== RECUPERAÇÃO =====
+
+    @classmethod
+    def recover(cls, path: str, snapshot_every: int = 1000) -> "BookingJournal":
+        """
+        Reabre um journal gravado em disco: carrega o último snapshot e lê o
+        arquivo de eventos a partir da posição guardada nele, reaplicando só
+        a cauda. O histórico em memória começa no snapshot.
+
+        Um último evento incompleto (queda durante append) é descartado e
+        cortado do arquivo, para que os próximos eventos não se juntem a ele.
+        """
+        journal = cls(snapshot_every=snapshot_every)
+        offset = 0
+        try:
+            with open(path + ".snapshot", encoding="utf-8") as file:
+                raw = json.load(file)
+            journal._base = raw["sequence"]
+            offset = raw.get("offset", 0)
+            bookings = {int(k): v for k, v in raw["bookings"].items()}
+            journal._state = deepcopy(bookings)
+            journal.snapshots.append(BookingSnapshot(journal._base, bookings))
+        except FileNotFoundError:
+            pass
+
+        with open(path, "rb+") as file:
+            end = file.seek(0, os.SEEK_END)
+            offset = file.seek(min(offset, end))
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                if not line.strip():
+                    continue
+                record = BookingEventRecord.from_json(line.decode("utf-8"))
+                # Snapshot sem posição (formato antigo): pula o que ele já cobre
+                if record.sequence <= journal._base:
+                    continue
+                journal._store(record)
+            if offset < end:
+                file.truncate(offset)
+
+        journal.path = path
+        journal._offset = offset
+        return journal
+
@@ -0,0 +1,72 @@
+"""
+ycaro_airlines/observers/dynamic_pricing.py
+
+Motor de precificação dinâmica (observer dos eventos de assento).
+A tarifa de cada voo é recalculada a partir da tarifa base, da ocupação e da
+antecedência, usando uma FareCurve configurável. Só o voo que teve assento
+vendido ou liberado é recalculado; mudanças de preço viram eventos
+PRICE_CHANGED para quem mantém caches ou índices dependentes do preço.
+"""
+from datetime import datetime
+from typing import Callable, Iterable, TYPE_CHECKING
+
+from ycaro_airlines.observers.event_bus import EventBus, FlightEvent
+from ycaro_airlines.strategies.fare_curves import FareCurve
+
+if TYPE_CHECKING:
+    from ycaro_airlines.models.flight import Flight
+
+
+class DynamicPricingEngine:
+    """Recalcula a tarifa dos voos conforme a ocupação e a antecedência"""
+    
+    def __init__(self, curve: FareCurve, events: EventBus,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.curve = curve
+        self.events = events
+        self.clock = clock
+        self.reprice_count = 0
+        self._attached = False
+    
+    def attach(self):
+        """Passa a recalcular o voo a cada assento ocupado ou liberado"""
+        if not self._attached:
+            self.events.subscribe(FlightEvent.SEAT_OCCUPIED, self._on_seat_change)
+            self.events.subscribe(FlightEvent.SEAT_RELEASED, self._on_seat_change)
+            self._attached = True
+        return self
+    
+    def detach(self):
+        self.events.unsubscribe(FlightEvent.SEAT_OCCUPIED, self._on_seat_change)
+        self.events.unsubscribe(FlightEvent.SEAT_RELEASED, self._on_seat_change)
+        self._attached = False
+    
+    def _on_seat_change(self, flight: "Flight", **_):
+        self.reprice(flight)
+    
+    def quote(self, flight: "Flight") -> float:
+        """Tarifa que o voo deveria ter agora, sem alterá-lo"""
+        if flight.capacity == 0:
+            load_factor = 1.0
+        else:
+            load_factor = 1 - flight.seats_available / flight.capacity
+        hours = max((flight.departure - self.clock()).total_seconds() / 3600, 0.0)
+        return round(flight.base_price * self.curve.multiplier(load_factor, hours), 2)
+    
+    def reprice(self, flight: "Flight") -> bool:
+        """Recalcula um voo; publica PRICE_CHANGED se a tarifa mudou"""
+        self.reprice_count += 1
+        new_price = self.quote(flight)
+        if new_price == flight.price:
+            return False
+        
+        old_price = flight.price
+        flight.price = new_price
+        self.events.publish(
+            FlightEvent.PRICE_CHANGED, flight, old_price=old_price, new_price=new_price
+        )
+        return True
+    
+    def reprice_all(self, flights: Iterable["Flight"]) -> int:
+        """Recalcula vários voos (ex.: periodicamente, pela passagem do tempo)"""
+        return sum(1 for flight in flights if self.reprice(flight))
@@ -0,0 +1,57 @@
+"""
+ycaro_airlines/observers/event_bus.py
+
+Observer Pattern: barramento de eventos síncrono.
+Quem publica não conhece quem escuta; os assinantes reagem aos eventos
+(recalcular preço, invalidar caches, ...) sem acoplar os modelos a eles.
+"""
+from collections import defaultdict
+from enum import Enum, auto
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class FlightEvent(Enum):
+    """Eventos publicados por Flight"""
+    SEAT_OCCUPIED = auto()
+    SEAT_RELEASED = auto()
+    PRICE_CHANGED = auto()
+
+
+class BookingEvent(Enum):
+    """Eventos do ciclo de vida de uma reserva (Booking)"""
+    CREATED = auto()
+    SEAT_RESERVED = auto()
+    CHECKED_IN = auto()
+    CANCELLED = auto()
+    REBOOKED = auto()
+
+
+# handler(subject, **dados do evento)
+EventHandler = Callable[..., Any]
+
+
+class EventBus:
+    """Subject: mantém os assinantes por tipo de evento e os notifica"""
+    
+    def __init__(self):
+        self._handlers: Dict[Hashable, List[EventHandler]] = defaultdict(list)
+    
+    def subscribe(self, event_type: Hashable, handler: EventHandler):
+        self._handlers[event_type].append(handler)
+        return handler
+    
+    def unsubscribe(self, event_type: Hashable, handler: EventHandler):
+        handlers = self._handlers.get(event_type)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+    
+    def has_subscribers(self, event_type: Hashable) -> bool:
+        return bool(self._handlers.get(event_type))
+    
+    def publish(self, event_type: Hashable, subject: Any, **data):
+        # Copia a lista: um handler pode se desinscrever durante a notificação
+        for handler in list(self._handlers.get(event_type, ())):
+            handler(subject, **data)
+    
+    def clear(self):
+        self._handlers.clear()
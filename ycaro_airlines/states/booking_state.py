@@ -5,30 +5,62 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ycaro_airlines.models.booking import Booking
 
+# ===== CÓDIGOS COMPACTOS (mesmos valores de BookingStatus) =====
+BOOKED = 1
+CHECKED_IN = 2
+CANCELLED = 3
+
+
+# ===== TABELA DE TRANSIÇÕES =====
+# (estado atual, ação) -> próximo estado; ausência na tabela = ação proibida
+TRANSITIONS: dict[tuple[int, str], int] = {
+    (BOOKED, "cancel"): CANCELLED,
+    (BOOKED, "check_in"): CHECKED_IN,
+    (BOOKED, "change_seat"): BOOKED,
+    # Ações da companhia (ex.: voo cancelado), valem também após o check-in
+    (BOOKED, "disrupt"): CANCELLED,
+    (CHECKED_IN, "disrupt"): CANCELLED,
+    (BOOKED, "rebook"): BOOKED,
+    (CHECKED_IN, "rebook"): BOOKED,
+}
+
+
+def can_transition(code: int, action: str) -> bool:
+    return (code, action) in TRANSITIONS
+
+
 class BookingState(ABC):
     """
     Interface para estados de Booking.
     Cada estado concreto define comportamento específico.
+
+    Estados são flyweights: existe um único objeto por estado, compartilhado
+    por todas as reservas (a reserva guarda só o código do estado).
     """
+
+    code: int = 0
+
+    def __new__(cls):
+        if (instance := cls.__dict__.get("_instance")) is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
     
-    @abstractmethod
     def can_cancel(self) -> bool:
         """Verifica se booking pode ser cancelado neste estado"""
-        pass
+        return can_transition(self.code, "cancel")
     
-    @abstractmethod
     def can_check_in(self) -> bool:
         """Verifica se pode fazer check-in neste estado"""
-        pass
+        return can_transition(self.code, "check_in")
     
-    @abstractmethod
     def can_change_seat(self) -> bool:
         """Verifica se pode trocar assento neste estado"""
-        pass
+        return can_transition(self.code, "change_seat")
     
     @abstractmethod
-    def cancel(self, booking: "Booking") -> bool:
-        """Tenta cancelar o booking"""
+    def cancel(self, booking: "Booking", verbose: bool = True) -> bool:
+        """Tenta cancelar o booking (verbose=False: sem mensagens, ex.: jobs de fundo)"""
         pass
     
     @abstractmethod
@@ -44,25 +76,35 @@ class BookingState(ABC):
 
 # ===== ESTADO 1: BOOKED =====
 class BookedState(BookingState):
-    def can_cancel(self) -> bool: return True
-    def can_check_in(self) -> bool: return True
-    def can_change_seat(self) -> bool: return True
-
-    def cancel(self, booking: "Booking") -> bool:
-        from ycaro_airlines.states.booking_state import CancelledState
-        if booking.seat_id is not None and booking.flight:
-            booking.flight.open_seat(booking.seat_id)
-        booking.state = CancelledState()
-        print("✅ Reserva cancelada com sucesso!")
+    code = BOOKED
+
+    def cancel(self, booking: "Booking", verbose: bool = True) -> bool:
+        flight = booking.flight
+        # Verificação e transição atômicas: o usuário e a expiração do hold
+        # (outra thread) podem cancelar a mesma reserva ao mesmo tempo
+        with flight.seat_lock:
+            if booking.status_code != BOOKED:
+                return False
+            # Tarifa e estado antes do assento: liberar o assento pode promover
+            # alguém da lista de espera, que precisa encontrar a classe aberta
+            if booking.fare_class is not None:
+                flight.release_fare(booking.fare_class)
+            booking.status_code = TRANSITIONS[(BOOKED, "cancel")]
+        if booking.seat_id is not None:
+            flight.open_seat(booking.seat_id)
+        elif booking.fare_class is not None and booking.waitlist is not None:
+            # Sem assento não há SEAT_RELEASED: a tarifa liberada promove direto
+            booking.waitlist.fare_released(flight)
+        if verbose:
+            print("✅ Reserva cancelada com sucesso!")
         return True
 
     def check_in(self, booking: "Booking") -> bool:
-        from ycaro_airlines.states.booking_state import CheckedInState
         if booking.seat_id is None:
             print("❌ Impossível fazer check-in: assento não selecionado")
             return False
         if booking.flight and booking.flight.check_in_seat(booking.id, booking.seat_id):
-            booking.state = CheckedInState()
+            booking.status_code = TRANSITIONS[(BOOKED, "check_in")]
             print("✅ Check-in realizado com sucesso!")
             return True
         print("❌ Falha ao fazer check-in")
@@ -74,13 +116,12 @@ class BookedState(BookingState):
 
 # ===== ESTADO 2: CHECKED IN =====
 class CheckedInState(BookingState):
-    def can_cancel(self) -> bool: return False
-    def can_check_in(self) -> bool: return False
-    def can_change_seat(self) -> bool: return False
+    code = CHECKED_IN
 
-    def cancel(self, booking: "Booking") -> bool:
-        print("❌ Impossível cancelar: check-in já realizado")
-        print("   Entre em contato com atendimento ao cliente")
+    def cancel(self, booking: "Booking", verbose: bool = True) -> bool:
+        if verbose:
+            print("❌ Impossível cancelar: check-in já realizado")
+            print("   Entre em contato com atendimento ao cliente")
         return False
 
     def check_in(self, booking: "Booking") -> bool:
@@ -93,12 +134,11 @@ class CheckedInState(BookingState):
 
 # ===== ESTADO 3: CANCELLED =====
 class CancelledState(BookingState):
-    def can_cancel(self) -> bool: return False
-    def can_check_in(self) -> bool: return False
-    def can_change_seat(self) -> bool: return False
+    code = CANCELLED
 
-    def cancel(self, booking: "Booking") -> bool:
-        print("ℹ️  Esta reserva já está cancelada")
+    def cancel(self, booking: "Booking", verbose: bool = True) -> bool:
+        if verbose:
+            print("ℹ️  Esta reserva já está cancelada")
         return False
 
     def check_in(self, booking: "Booking") -> bool:
@@ -106,4 +146,14 @@ class CancelledState(BookingState):
         return False
 
     def get_status_name(self) -> str:
-        return "cancelled"
\ No newline at end of file
+        return "cancelled"
+
+
+# ===== FLYWEIGHTS POR CÓDIGO =====
+STATES: dict[int, BookingState] = {
+    state.code: state for state in (BookedState(), CheckedInState(), CancelledState())
+}
+
+
+def state_for(code: int) -> BookingState:
+    return STATES[code]
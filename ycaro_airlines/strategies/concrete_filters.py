@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import Optional, List, TYPE_CHECKING
+from typing import Iterable, Iterator, Optional, List, Tuple, TYPE_CHECKING
 from math import inf
+from time import perf_counter
+from ycaro_airlines.strategies.filter_statistics import FilterStatistics
 from ycaro_airlines.strategies.flight_filter_strategy import FlightFilterStrategy
 
 # Import apenas para type checking, não em runtime
@@ -13,6 +15,9 @@ class CityFilterStrategy(FlightFilterStrategy):
     Estratégia para filtrar voos por cidade de origem e/ou destino.
     """
     
+    # Cada rota tem sua seletividade; o número de cidades é limitado
+    stats_params = ("from_city", "to_city")
+    
     def __init__(self, from_city: Optional[str] = None, to_city: Optional[str] = None):
         self.from_city = from_city
         self.to_city = to_city
@@ -28,6 +33,17 @@ class CityFilterStrategy(FlightFilterStrategy):
         
         return result
     
+    def stream(self, flights: Iterable["Flight"]) -> Iterator["Flight"]:
+        result = flights
+        
+        if self.from_city is not None:
+            result = (flight for flight in result if flight.From == self.from_city)
+        
+        if self.to_city is not None:
+            result = (flight for flight in result if flight.To == self.to_city)
+        
+        return iter(result)
+    
     def description(self) -> str:
         parts = []
         if self.from_city:
@@ -53,6 +69,12 @@ class PriceFilterStrategy(FlightFilterStrategy):
             if self.min_price <= flight.price <= self.max_price
         ]
     
+    def stream(self, flights: Iterable["Flight"]) -> Iterator["Flight"]:
+        return (
+            flight for flight in flights
+            if self.min_price <= flight.price <= self.max_price
+        )
+    
     def description(self) -> str:
         return f"Preço: R${self.min_price:.2f} - R${self.max_price:.2f}"
 
@@ -74,6 +96,12 @@ class DepartureDateFilterStrategy(FlightFilterStrategy):
             if self.start_date <= flight.departure <= self.end_date
         ]
     
+    def stream(self, flights: Iterable["Flight"]) -> Iterator["Flight"]:
+        return (
+            flight for flight in flights
+            if self.start_date <= flight.departure <= self.end_date
+        )
+    
     def description(self) -> str:
         start = self.start_date.strftime("%d/%m/%Y") if self.start_date != datetime.min else "Qualquer"
         end = self.end_date.strftime("%d/%m/%Y") if self.end_date != datetime.max else "Qualquer"
@@ -97,6 +125,12 @@ class ArrivalDateFilterStrategy(FlightFilterStrategy):
             if self.start_date <= flight.arrival <= self.end_date
         ]
     
+    def stream(self, flights: Iterable["Flight"]) -> Iterator["Flight"]:
+        return (
+            flight for flight in flights
+            if self.start_date <= flight.arrival <= self.end_date
+        )
+    
     def description(self) -> str:
         start = self.start_date.strftime("%d/%m/%Y") if self.start_date != datetime.min else "Qualquer"
         end = self.end_date.strftime("%d/%m/%Y") if self.end_date != datetime.max else "Qualquer"
@@ -115,37 +149,187 @@ class FlightIdFilterStrategy(FlightFilterStrategy):
     def filter(self, flights: List["Flight"]) -> List["Flight"]:
         return [flight for flight in flights if flight.id == self.flight_id]
     
+    def stream(self, flights: Iterable["Flight"]) -> Iterator["Flight"]:
+        return (flight for flight in flights if flight.id == self.flight_id)
+    
     def description(self) -> str:
         return f"ID do Voo: {self.flight_id}"
 
 
+# ===== ESTRATÉGIA 6: Filtro por Assentos Disponíveis =====
+class SeatsAvailableFilterStrategy(FlightFilterStrategy):
+    """
+    Estratégia para filtrar voos com pelo menos N assentos livres.
+    Usa o contador de disponibilidade do voo, sem percorrer os assentos
+    (seats_remaining: voo cancelado conta como sem assentos).
+    """
+    
+    def __init__(self, min_seats: int = 1):
+        self.min_seats = min_seats
+    
+    def filter(self, flights: List["Flight"]) -> List["Flight"]:
+        return [flight for flight in flights if flight.seats_remaining >= self.min_seats]
+    
+    def stream(self, flights: Iterable["Flight"]) -> Iterator["Flight"]:
+        return (flight for flight in flights if flight.seats_remaining >= self.min_seats)
+    
+    def description(self) -> str:
+        return f"Assentos livres: {self.min_seats}+"
+
+
+# (estratégia, voos de entrada, voos de saída, segundos) de uma execução
+StrategyRecord = Tuple[FlightFilterStrategy, int, int, float]
+
+
+class _Tap:
+    """Iterador que conta e cronometra o que uma etapa puxa da anterior."""
+    
+    __slots__ = ("source", "rows", "elapsed")
+    
+    def __init__(self, source: Iterator["Flight"]):
+        self.source = source
+        self.rows = 0
+        self.elapsed = 0.0
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> "Flight":
+        start = perf_counter()
+        try:
+            flight = next(self.source)
+        finally:
+            self.elapsed += perf_counter() - start
+        self.rows += 1
+        return flight
+
+
 # ===== ESTRATÉGIA COMPOSTA: Múltiplos Filtros =====
 class CompositeFilterStrategy(FlightFilterStrategy):
     """
     Estratégia que permite combinar múltiplas estratégias..
+    
+    Coleta a taxa de aprovação e o custo de cada estratégia a cada execução.
+    No modo adaptativo, reordena as estratégias antes de aplicar para que as
+    baratas e mais seletivas rodem primeiro.
     """
     
-    def __init__(self):
+    def __init__(self, adaptive: bool = False, statistics: Optional[FilterStatistics] = None):
         self.strategies: List[FlightFilterStrategy] = []
+        self.adaptive = adaptive
+        self.statistics = statistics if statistics is not None else FilterStatistics()
+    
+    def __getstate__(self) -> dict:
+        # Cópias enviadas aos workers do filtro paralelo não levam o registro
+        # compartilhado (que cresce com o tráfego): as medições voltam pelo
+        # resultado da tarefa e são somadas no processo principal
+        state = self.__dict__.copy()
+        del state["statistics"]
+        return state
+    
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.statistics = FilterStatistics()
     
     def add_strategy(self, strategy: FlightFilterStrategy):
         self.strategies.append(strategy)
         return self
     
-    def filter(self, flights: List["Flight"]) -> List["Flight"]:
+    def reorder(self):
+        """Ordena as estratégias pelo rank de seletividade/custo observado."""
+        # sorted é estável: estratégias sem amostras mantêm a ordem de inserção.
+        # Troca a lista em vez de ordenar no lugar para não afetar execuções em
+        # andamento que compartilham este composite (consultas compiladas).
+        self.strategies = sorted(
+            self.strategies, key=lambda s: self.statistics.rank(s.stats_key())
+        )
+        return self
+    
+    def filter(self, flights: List["Flight"], run: Optional[List[StrategyRecord]] = None) -> List["Flight"]:
+        """
+        Aplica as estratégias em ordem. Com run, anexa a ele a medição de
+        cada estratégia desta chamada: o composite é compartilhado entre
+        buscas concorrentes, então a execução não fica guardada nele.
+        """
+        if self.adaptive:
+            self.reorder()
+        
         result = flights
         
         for strategy in self.strategies:
+            rows_in = len(result)
+            start = perf_counter()
             result = strategy.filter(result)
+            elapsed = perf_counter() - start
+            self.statistics.record(strategy.stats_key(), rows_in, len(result), elapsed)
+            if run is not None:
+                run.append((strategy, rows_in, len(result), elapsed))
             
             if not result:
                 break
         
         return result
     
+    def stream(self, flights: Iterable["Flight"]) -> Iterator["Flight"]:
+        if self.adaptive:
+            self.reorder()
+        
+        # Encadeia os geradores: cada voo atravessa o pipeline inteiro antes
+        # do próximo ser lido, então o consumidor pode parar a qualquer momento
+        result = iter(flights)
+        
+        for strategy in self.strategies:
+            result = self._measured(strategy, result)
+        
+        return result
+    
+    def _measured(self, strategy: FlightFilterStrategy, source: Iterator["Flight"]) -> Iterator["Flight"]:
+        """
+        Etapa do pipeline preguiçoso que registra as estatísticas quando
+        termina ou é abandonada. O tempo gasto nas etapas anteriores (ao
+        puxar a entrada) é descontado.
+        """
+        tap = _Tap(source)
+        stage = strategy.stream(tap)
+        rows_out = 0
+        elapsed = 0.0
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    flight = next(stage)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += perf_counter() - start
+                rows_out += 1
+                yield flight
+        finally:
+            self.statistics.record(strategy.stats_key(), tap.rows, rows_out, elapsed - tap.elapsed)
+    
+    def stats_key(self) -> str:
+        return f"{type(self).__name__}({', '.join(s.stats_key() for s in self.strategies)})"
+    
     def description(self) -> str:
         if not self.strategies:
             return "Sem filtros aplicados"
         
         descriptions = [s.description() for s in self.strategies]
-        return " + ".join(descriptions)
\ No newline at end of file
+        return " + ".join(descriptions)
+    
+    def stats_report(self) -> str:
+        """
+        Relatório das estatísticas das estratégias deste composite,
+        na ordem em que serão aplicadas.
+        """
+        lines = []
+        for strategy in self.strategies:
+            stats = self.statistics.get(strategy.stats_key())
+            if stats is None:
+                lines.append(f"{strategy.description()}: sem amostras")
+                continue
+            lines.append(
+                f"{strategy.description()}: aprovação {stats.pass_rate:.1%} | "
+                f"{stats.cost_per_row * 1e6:.2f}µs/voo | {stats.calls} execuções"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from typing import List, Sequence, Tuple
+
+
+class FareCurve(ABC):
+    """
+    Estratégia de precificação: devolve o multiplicador aplicado à tarifa base
+    a partir da ocupação do voo e do tempo que falta para a partida.
+    """
+    
+    @abstractmethod
+    def multiplier(self, load_factor: float, hours_to_departure: float) -> float:
+        pass
+    
+    @abstractmethod
+    def description(self) -> str:
+        pass
+
+
+def _interpolate(points: List[Tuple[float, float]], x: float) -> float:
+    """Interpolação linear por partes; fora dos pontos usa o valor da ponta."""
+    xs = [p[0] for p in points]
+    position = bisect_right(xs, x)
+    if position == 0:
+        return points[0][1]
+    if position == len(points):
+        return points[-1][1]
+    (x0, y0), (x1, y1) = points[position - 1], points[position]
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+
+# ===== CURVA 1: Ocupação =====
+class LoadFactorFareCurve(FareCurve):
+    """
+    Multiplicador em função da ocupação (0.0 a 1.0), por pontos interpolados.
+    """
+    
+    def __init__(self, points: Sequence[Tuple[float, float]] = ((0.0, 0.8), (0.5, 1.0), (0.9, 1.6), (1.0, 2.0))):
+        self.points = sorted(points)
+    
+    def multiplier(self, load_factor: float, hours_to_departure: float) -> float:
+        return _interpolate(self.points, load_factor)
+    
+    def description(self) -> str:
+        return "Ocupação: " + ", ".join(f"{x:.0%}->{y:.2f}x" for x, y in self.points)
+
+
+# ===== CURVA 2: Antecedência =====
+class TimeToDepartureFareCurve(FareCurve):
+    """
+    Multiplicador em função das horas que faltam para a partida.
+    """
+    
+    def __init__(self, points: Sequence[Tuple[float, float]] = ((0, 1.5), (24, 1.3), (72, 1.1), (168, 1.0))):
+        self.points = sorted(points)
+    
+    def multiplier(self, load_factor: float, hours_to_departure: float) -> float:
+        return _interpolate(self.points, hours_to_departure)
+    
+    def description(self) -> str:
+        return "Antecedência: " + ", ".join(f"{x:.0f}h->{y:.2f}x" for x, y in self.points)
+
+
+# ===== CURVA COMPOSTA =====
+class CombinedFareCurve(FareCurve):
+    """
+    Combina curvas multiplicando seus multiplicadores.
+    """
+    
+    def __init__(self, *curves: FareCurve):
+        self.curves = list(curves)
+    
+    def multiplier(self, load_factor: float, hours_to_departure: float) -> float:
+        result = 1.0
+        for curve in self.curves:
+            result *= curve.multiplier(load_factor, hours_to_departure)
+        return result
+    
+    def description(self) -> str:
+        return " x ".join(curve.description() for curve in self.curves)
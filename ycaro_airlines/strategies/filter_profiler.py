@@ -0,0 +1,108 @@
+"""
+Instrumentação opcional do pipeline de filtros.
+
+Cada busca gera um QueryProfile com as contagens de entrada/saída e o tempo
+de cada estratégia, a latência total e o índice usado (se algum). Os perfis
+ficam em memória no FilterProfiler e podem ser exportados em JSON.
+"""
+import json
+from collections import deque
+from datetime import datetime
+from math import isinf
+from typing import Any, Deque, Dict, List, Optional
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, float) and isinf(value):
+        return "inf" if value > 0 else "-inf"
+    return value
+
+
+class StrategyProfile:
+    """Medição de uma estratégia dentro de uma busca."""
+    
+    def __init__(self, description: str, rows_in: int, rows_out: int, elapsed: float):
+        self.description = description
+        self.rows_in = rows_in
+        self.rows_out = rows_out
+        self.elapsed = elapsed
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.description,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "elapsed_ms": self.elapsed * 1000,
+        }
+
+
+class QueryProfile:
+    """Perfil completo de uma busca."""
+    
+    def __init__(self, query: Dict[str, Any], strategies: List[StrategyProfile],
+                 total_elapsed: float, result_count: int,
+                 index_used: Optional[str] = None):
+        self.query = query
+        self.strategies = strategies
+        self.total_elapsed = total_elapsed
+        self.result_count = result_count
+        self.index_used = index_used
+        self.recorded_at = datetime.now()
+    
+    def explain(self) -> str:
+        """Plano executado em formato legível, no estilo EXPLAIN ANALYZE."""
+        lines = [
+            f"Busca: {self.result_count} voos em {self.total_elapsed * 1000:.3f}ms",
+            f"Índice: {self.index_used or 'nenhum (varredura completa)'}",
+        ]
+        for step, strategy in enumerate(self.strategies, start=1):
+            lines.append(
+                f"  {step}. {strategy.description}: "
+                f"{strategy.rows_in} -> {strategy.rows_out} voos "
+                f"({strategy.elapsed * 1000:.3f}ms)"
+            )
+        return "\n".join(lines)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "recorded_at": self.recorded_at.isoformat(),
+            "query": {key: _jsonable(value) for key, value in self.query.items()},
+            "index_used": self.index_used,
+            "result_count": self.result_count,
+            "total_elapsed_ms": self.total_elapsed * 1000,
+            "strategies": [s.to_dict() for s in self.strategies],
+        }
+
+
+class FilterProfiler:
+    """
+    Guarda os perfis das últimas buscas (até max_profiles).
+    """
+    
+    def __init__(self, max_profiles: int = 1000):
+        self._profiles: Deque[QueryProfile] = deque(maxlen=max_profiles)
+    
+    def record(self, profile: QueryProfile):
+        self._profiles.append(profile)
+    
+    @property
+    def profiles(self) -> List[QueryProfile]:
+        return list(self._profiles)
+    
+    def last(self) -> Optional[QueryProfile]:
+        return self._profiles[-1] if self._profiles else None
+    
+    def slowest(self, n: int = 10) -> List[QueryProfile]:
+        return sorted(self._profiles, key=lambda p: p.total_elapsed, reverse=True)[:n]
+    
+    def to_json(self) -> str:
+        return json.dumps([p.to_dict() for p in self._profiles], ensure_ascii=False)
+    
+    def dump_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_json())
+    
+    def clear(self):
+        self._profiles.clear()
@@ -0,0 +1,116 @@
+import threading
+from collections import OrderedDict
+from math import inf
+from typing import List
+
+
+class StrategyStats:
+    """
+    Estatísticas acumuladas de execução de uma estratégia de filtro.
+    """
+    
+    def __init__(self):
+        self.calls = 0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.elapsed = 0.0
+    
+    @property
+    def pass_rate(self) -> float:
+        """Fração dos voos de entrada que passaram no filtro."""
+        if self.rows_in == 0:
+            return 1.0
+        return self.rows_out / self.rows_in
+    
+    @property
+    def cost_per_row(self) -> float:
+        """Tempo médio (em segundos) gasto por voo avaliado."""
+        if self.rows_in == 0:
+            return 0.0
+        return self.elapsed / self.rows_in
+    
+    @property
+    def rank(self) -> float:
+        """
+        Custo por voo descartado. Ordenar filtros conjuntivos por esse valor
+        crescente minimiza o custo esperado do pipeline.
+        """
+        rejection = 1.0 - self.pass_rate
+        if rejection <= 0:
+            return inf
+        return self.cost_per_row / rejection
+
+
+class FilterStatistics:
+    """
+    Registro de estatísticas de seletividade e custo por estratégia.
+    
+    As estatísticas são agrupadas por FlightFilterStrategy.stats_key(), então
+    um mesmo registro pode ser compartilhado entre várias consultas (e entre
+    as threads que executam buscas ao mesmo tempo). Guarda no máximo
+    max_keys chaves: a usada há mais tempo é descartada primeiro.
+    """
+    
+    def __init__(self, min_samples: int = 3, max_keys: int = 1024):
+        self.min_samples = min_samples
+        self.max_keys = max_keys
+        self._stats: "OrderedDict[str, StrategyStats]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __getstate__(self) -> dict:
+        # Locks não são serializáveis
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def record(self, key: str, rows_in: int, rows_out: int, elapsed: float):
+        with self._lock:
+            if (stats := self._stats.get(key)) is None:
+                stats = self._stats[key] = StrategyStats()
+                if len(self._stats) > self.max_keys:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(key)
+            stats.calls += 1
+            stats.rows_in += rows_in
+            stats.rows_out += rows_out
+            stats.elapsed += elapsed
+    
+    def get(self, key: str) -> StrategyStats | None:
+        return self._stats.get(key)
+    
+    def is_sampled(self, key: str) -> bool:
+        stats = self._stats.get(key)
+        return stats is not None and stats.calls >= self.min_samples
+    
+    def rank(self, key: str) -> float:
+        """
+        Rank usado na ordenação. Estratégias ainda sem amostras suficientes
+        recebem rank 0 para rodarem primeiro e serem medidas.
+        """
+        if not self.is_sampled(key):
+            return 0.0
+        return self._stats[key].rank
+    
+    def report(self) -> List[dict]:
+        with self._lock:
+            items = list(self._stats.items())
+        return [
+            {
+                "strategy": key,
+                "calls": stats.calls,
+                "rows_in": stats.rows_in,
+                "rows_out": stats.rows_out,
+                "pass_rate": stats.pass_rate,
+                "cost_per_row": stats.cost_per_row,
+            }
+            for key, stats in sorted(items, key=lambda item: item[1].rank)
+        ]
+    
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
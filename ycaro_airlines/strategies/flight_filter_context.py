@@ -1,5 +1,9 @@
-from typing import List, TYPE_CHECKING
+import heapq
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TYPE_CHECKING
+from ycaro_airlines.strategies.concrete_filters import CompositeFilterStrategy, StrategyRecord
 from ycaro_airlines.strategies.flight_filter_strategy import FlightFilterStrategy
+from ycaro_airlines.strategies.parallel_filter import ParallelFilterExecutor
 
 if TYPE_CHECKING:
     from ycaro_airlines.models.flight import Flight
@@ -9,18 +13,59 @@ class FlightFilterContext:
     Mantém referência para uma estratégia e delega o trabalho de filtro para ela.
     """
     
-    def __init__(self, strategy: FlightFilterStrategy = None):
+    def __init__(self, strategy: FlightFilterStrategy = None,
+                 parallel: ParallelFilterExecutor = None):
         self._strategy = strategy
+        self._parallel = parallel
     
     def set_strategy(self, strategy: FlightFilterStrategy):
         self._strategy = strategy
     
-    def apply_filter(self, flights: List["Flight"]) -> List["Flight"]:
+    def set_parallel(self, parallel: ParallelFilterExecutor | None):
+        """Ativa (ou desativa, com None) a execução paralela em apply_filter."""
+        self._parallel = parallel
+    
+    def apply_filter(self, flights: List["Flight"], run: Optional[List[StrategyRecord]] = None) -> List["Flight"]:
+        """Com run e uma estratégia composta, recebe as medições desta chamada."""
         if self._strategy is None:
             raise ValueError("Nenhuma estratégia de filtro definida")
         
+        if self._parallel is not None:
+            return self._parallel.run(self._strategy, flights, run)
+        
+        if isinstance(self._strategy, CompositeFilterStrategy):
+            return self._strategy.filter(flights, run)
         return self._strategy.filter(flights)
     
+    # ===== MODO PREGUIÇOSO (STREAMING) =====
+    
+    def stream_filter(self, flights: Iterable["Flight"]) -> Iterator["Flight"]:
+        """
+        Aplica a estratégia de forma preguiçosa: nenhum voo é avaliado até
+        que o consumidor peça o próximo resultado.
+        """
+        if self._strategy is None:
+            raise ValueError("Nenhuma estratégia de filtro definida")
+        
+        return self._strategy.stream(flights)
+    
+    def first(self, flights: Iterable["Flight"], n: int, offset: int = 0) -> List["Flight"]:
+        """Retorna uma página de até n voos, parando assim que ela estiver cheia."""
+        return list(islice(self.stream_filter(flights), offset, offset + n))
+    
+    def exists(self, flights: Iterable["Flight"]) -> bool:
+        """Verifica se algum voo passa no filtro, parando no primeiro encontrado."""
+        return next(self.stream_filter(flights), None) is not None
+    
+    def top_k(
+        self,
+        flights: Iterable["Flight"],
+        k: int,
+        key: Callable[["Flight"], Any] = lambda flight: flight.price,
+    ) -> List["Flight"]:
+        """Retorna os k menores voos segundo key, mantendo só k itens em memória."""
+        return heapq.nsmallest(k, self.stream_filter(flights), key=key)
+    
     def get_description(self) -> str:
         if self._strategy is None:
             return "Nenhum filtro aplicado"
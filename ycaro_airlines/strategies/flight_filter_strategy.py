@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, TYPE_CHECKING
+from typing import ClassVar, Iterable, Iterator, List, Tuple, TYPE_CHECKING
 
 # TYPE_CHECKING é True apenas durante verificação de tipos, não em runtime
 if TYPE_CHECKING:
@@ -10,6 +10,9 @@ class FlightFilterStrategy(ABC):
     Interface abstrata para estratégias de filtro.
     """
     
+    # Parâmetros que entram na chave das estatísticas (ver stats_key)
+    stats_params: ClassVar[Tuple[str, ...]] = ()
+    
     @abstractmethod
     def filter(self, flights: List["Flight"]) -> List["Flight"]:  #usando string para type hint
         """
@@ -23,9 +26,33 @@ class FlightFilterStrategy(ABC):
         """
         pass
     
+    def stream(self, flights: Iterable["Flight"]) -> Iterator["Flight"]:
+        """
+        Variante preguiçosa do filtro: consome e produz iteradores.
+
+        A implementação padrão materializa a entrada e delega para filter(),
+        então estratégias que só implementam filter() continuam funcionando.
+        Estratégias concretas sobrescrevem com geradores para permitir
+        parada antecipada (paginação, existência, top-k).
+        """
+        yield from self.filter(list(flights))
+    
+    def stats_key(self) -> str:
+        """
+        Chave usada para agrupar estatísticas de execução desta estratégia.
+        
+        Só a classe e os parâmetros grosseiros de stats_params (ex.: cidades):
+        limites de preço e de data mudam a cada busca e gerariam uma chave
+        nova por consulta, que nunca acumularia amostras suficientes.
+        """
+        if not self.stats_params:
+            return type(self).__name__
+        params = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.stats_params)
+        return f"{type(self).__name__}({params})"
+    
     @abstractmethod
     def description(self) -> str:
         """
         Retorna descrição do filtro aplicado.
         """
-        pass
\ No newline at end of file
+        pass
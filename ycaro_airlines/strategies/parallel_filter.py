@@ -0,0 +1,195 @@
+"""
+Execução paralela de estratégias de filtro.
+
+Os voos são copiados para um snapshot colunar somente leitura e cada tarefa
+leva só a fatia de colunas da sua partição, então cada voo é serializado
+uma única vez por execução. O pool de processos é criado na primeira
+execução e reaproveitado nas seguintes. As tarefas devolvem os IDs
+aprovados e, para filtros compostos, as medições de cada estratégia, que
+são somadas nas estatísticas do processo principal.
+"""
+import copy
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from ycaro_airlines.strategies.concrete_filters import CompositeFilterStrategy, StrategyRecord
+from ycaro_airlines.strategies.flight_filter_strategy import FlightFilterStrategy
+
+if TYPE_CHECKING:
+    from ycaro_airlines.models.flight import Flight
+
+
+# Linha leve com os mesmos atributos que as estratégias leem de Flight
+FlightRow = namedtuple(
+    "FlightRow", ["id", "From", "To", "price", "departure", "arrival", "seats_remaining"]
+)
+
+
+class FlightSnapshot:
+    """
+    Cópia colunar e imutável dos campos filtráveis de um conjunto de voos.
+    """
+    
+    def __init__(self, ids: tuple, origins: tuple, destinations: tuple,
+                 prices: tuple, departures: tuple, arrivals: tuple,
+                 seats_remaining: tuple):
+        self.ids = ids
+        self.origins = origins
+        self.destinations = destinations
+        self.prices = prices
+        self.departures = departures
+        self.arrivals = arrivals
+        self.seats_remaining = seats_remaining
+    
+    @classmethod
+    def from_flights(cls, flights: Sequence["Flight"]) -> "FlightSnapshot":
+        return cls(
+            ids=tuple(f.id for f in flights),
+            origins=tuple(f.From for f in flights),
+            destinations=tuple(f.To for f in flights),
+            prices=tuple(f.price for f in flights),
+            departures=tuple(f.departure for f in flights),
+            arrivals=tuple(f.arrival for f in flights),
+            seats_remaining=tuple(f.seats_remaining for f in flights),
+        )
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def slice(self, start: int, end: int) -> "FlightSnapshot":
+        """Partição [start, end) com as mesmas colunas (o que vai para o worker)."""
+        return FlightSnapshot(
+            self.ids[start:end],
+            self.origins[start:end],
+            self.destinations[start:end],
+            self.prices[start:end],
+            self.departures[start:end],
+            self.arrivals[start:end],
+            self.seats_remaining[start:end],
+        )
+    
+    def rows(self, start: int, end: int) -> List[FlightRow]:
+        return list(map(
+            FlightRow,
+            self.ids[start:end],
+            self.origins[start:end],
+            self.destinations[start:end],
+            self.prices[start:end],
+            self.departures[start:end],
+            self.arrivals[start:end],
+            self.seats_remaining[start:end],
+        ))
+
+
+# ===== LADO DO WORKER =====
+
+# (posição da estratégia no composite, voos de entrada, voos de saída, segundos)
+StrategyRun = Tuple[int, int, int, float]
+
+
+def _filter_partition(task: Tuple[FlightFilterStrategy, FlightSnapshot]) -> Tuple[List[int], List[StrategyRun]]:
+    strategy, partition = task
+    # O composite do worker é uma cópia sem as estatísticas do processo
+    # principal: as medições voltam junto com os IDs
+    rows = partition.rows(0, len(partition))
+    if not isinstance(strategy, CompositeFilterStrategy):
+        return [row.id for row in strategy.filter(rows)], []
+    
+    positions = {id(s): i for i, s in enumerate(strategy.strategies)}
+    records: List[StrategyRecord] = []
+    ids = [row.id for row in strategy.filter(rows, records)]
+    runs = [
+        (positions[id(s)], rows_in, rows_out, elapsed)
+        for s, rows_in, rows_out, elapsed in records
+    ]
+    return ids, runs
+
+
+# ===== EXECUTOR =====
+
+class ParallelFilterExecutor:
+    """
+    Avalia uma estratégia em partições do inventário usando um pool de processos.
+    
+    Abaixo de `threshold` voos o custo de copiar os voos para os processos
+    supera o ganho, então o filtro roda em série no processo atual. O pool
+    vive até close().
+    """
+    
+    def __init__(self, threshold: int = 50_000, max_workers: Optional[int] = None,
+                 partitions_per_worker: int = 4):
+        if threshold < 0:
+            raise ValueError("Threshold must not be negative")
+        self.threshold = threshold
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.partitions_per_worker = partitions_per_worker
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+    
+    def _partitions(self, size: int) -> List[Tuple[int, int]]:
+        if size == 0:
+            return []
+        count = max(1, min(size, self.max_workers * self.partitions_per_worker))
+        step = -(-size // count)
+        return [(start, min(start + step, size)) for start in range(0, size, step)]
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+    
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+    
+    def run(self, strategy: FlightFilterStrategy, flights: List["Flight"],
+            run: Optional[List[StrategyRecord]] = None) -> List["Flight"]:
+        """
+        Filtra flights com strategy. Para filtros compostos, run recebe as
+        medições somadas de cada estratégia (como em CompositeFilterStrategy.filter).
+        """
+        composite = strategy if isinstance(strategy, CompositeFilterStrategy) else None
+        if not flights or len(flights) < self.threshold or self.max_workers < 2:
+            return composite.filter(flights, run) if composite is not None else strategy.filter(flights)
+        
+        if composite is not None:
+            if composite.adaptive:
+                composite.reorder()
+            # Cópia com a ordem atual: outra busca pode reordenar o composite
+            # compartilhado enquanto as tarefas são serializadas, e as posições
+            # devolvidas pelos workers precisam valer para esta ordem
+            strategy = copy.copy(composite)
+        
+        snapshot = FlightSnapshot.from_flights(flights)
+        tasks = [(strategy, snapshot.slice(start, end)) for start, end in self._partitions(len(snapshot))]
+        # map preserva a ordem das partições, então o resultado mantém a ordem da entrada
+        results = list(self._executor().map(_filter_partition, tasks))
+        
+        if composite is not None:
+            self._merge_runs(composite, strategy.strategies, [runs for _, runs in results], run)
+        
+        by_id = {flight.id: flight for flight in flights}
+        return [by_id[flight_id] for ids, _ in results for flight_id in ids]
+    
+    def _merge_runs(self, composite: CompositeFilterStrategy, strategies: List[FlightFilterStrategy],
+                    partition_runs: List[List[StrategyRun]], run: Optional[List[StrategyRecord]] = None):
+        """Soma as medições das partições: uma execução por estratégia, como no filtro serial."""
+        totals: Dict[int, List] = {}
+        for runs in partition_runs:
+            for position, rows_in, rows_out, elapsed in runs:
+                total = totals.setdefault(position, [0, 0, 0.0])
+                total[0] += rows_in
+                total[1] += rows_out
+                total[2] += elapsed
+        
+        for position in sorted(totals):
+            rows_in, rows_out, elapsed = totals[position]
+            strategy = strategies[position]
+            composite.statistics.record(strategy.stats_key(), rows_in, rows_out, elapsed)
+            if run is not None:
+                run.append((strategy, rows_in, rows_out, elapsed))
@@ -4,7 +4,9 @@ import questionary
 from ycaro_airlines.views import menu_factory, customer_menu
 from ycaro_airlines.views.menu import ActionView, MenuView, UIView
 from ycaro_airlines.views.customer_menu import CustomerMenu
+from ycaro_airlines.views.customer_service_menu import CustomerServiceMenu
 from ycaro_airlines.models.customer import Customer
+from ycaro_airlines.models.customer_service import CustomerServiceWorker
 from ycaro_airlines.models.user import User
 
 
@@ -69,6 +71,8 @@ class LoginMenu(MenuView):
             print("Invalid User")
             return self.parent
 
+        if isinstance(user, CustomerServiceWorker):
+            return CustomerServiceMenu(user, parent=self.parent)
         return CustomerMenu(user, parent=self.parent)
 
 
@@ -5,6 +5,7 @@ SUBSTITUIR O ARQUIVO EXISTENTE POR ESTE
 Agora usa DECORATOR PATTERN para calcular preços
 """
 import re
+from datetime import datetime
 import questionary
 from rich.table import Table
 from ycaro_airlines.views.menu import ActionView, UIView
@@ -68,19 +69,17 @@ class BookFlightAction(ActionView):
         if not isinstance(self.user, Customer):
             return self.parent
 
-        # Selecionar voo
-        flight_id = questionary.autocomplete(
-            "Type the id of the flight you want to book:(type q to go back)",
-            choices=[str(k) for k, _ in Flight.flights.items()],
-            validate=lambda x: True
-            if x in {str(k) for k, _ in Flight.flights.items()} or x == "q"
-            else False,
-        ).ask()
+        # Voos recorrentes só existem nas datas já buscadas: a data escolhida é gerada aqui
+        if len(Flight.schedules) and questionary.confirm(
+            "Book a recurring flight by date?", default=False
+        ).ask():
+            flight = self._select_scheduled_flight()
+        else:
+            flight = self._select_flight()
 
-        if flight_id == "q" or not flight_id:
+        if flight is None:
             return self.parent
 
-        flight = Flight.flights[int(flight_id)]
         flight.print_flight_table(console)
 
         wants_to_book = questionary.confirm(
@@ -108,9 +107,15 @@ class BookFlightAction(ActionView):
         # ============================================
         print("\n💼 Building your flight package...")
         
-        # Começar com preço base
-        pricing = BasicFlightPricing(flight)
-        print(f"Base price: R${pricing.get_price():.2f}")
+        # Começar com a tarifa da classe aberta mais barata
+        fare_class = flight.lowest_fare_class
+        if fare_class is None:
+            print("❌ This flight is sold out")
+            self._offer_waitlist(flight, passenger_name, passenger_cpf)
+            return self.parent
+
+        pricing = BasicFlightPricing(flight, base_price=flight.fare_for(fare_class))
+        print(f"Base price ({fare_class} fare): R${pricing.get_price():.2f}")
 
         # Perguntar sobre extras
         extras = questionary.checkbox(
@@ -153,6 +158,7 @@ class BookFlightAction(ActionView):
             print(f"  + Insurance ({insurance_type}): R${29.90 if insurance_type == 'basic' else 79.90:.2f}")
 
         # Desconto de fidelidade
+        points_spent = 0
         if self.user.loyalty_points.points >= 100:
             wants_discount = questionary.confirm(
                 f"Use loyalty points for discount? (you have: {self.user.loyalty_points.points} points)"
@@ -177,6 +183,7 @@ class BookFlightAction(ActionView):
                     discount_pct, points_cost = selected
                     pricing = LoyaltyDiscountDecorator(pricing, discount_pct)
                     self.user.spend_loyalty_points(points_cost)
+                    points_spent = points_cost
                     print(f"  - Loyalty Discount ({discount_pct}%)")
 
         # Mostrar resumo
@@ -188,20 +195,35 @@ class BookFlightAction(ActionView):
             print("❌ Booking cancelled")
             return self.parent
 
-        # Criar booking
-        booking = Booking(
-            flight_id=flight.id,
-            owner_id=self.user.id,
-            passenger_name=passenger_name,
-            passenger_cpf=passenger_cpf,
-            price=final_price,
-        )
+        # Criar booking (a classe pode ter esgotado enquanto o cliente escolhia)
+        try:
+            booking = Booking(
+                flight_id=flight.id,
+                owner_id=self.user.id,
+                passenger_name=passenger_name,
+                passenger_cpf=passenger_cpf,
+                price=final_price,
+                fare_class=fare_class,
+            )
+        except ValueError:
+            if points_spent:
+                self.user.gain_loyalty_points(points_spent)
+            print(f"❌ The {fare_class} fare sold out while you were booking")
+            if flight.lowest_fare_class is None:
+                self._offer_waitlist(flight, passenger_name, passenger_cpf)
+            else:
+                print("   Start again to see the current fare")
+            return self.parent
 
         # Selecionar assento se escolheu essa opção
         if "seat" in extras:
             select_seat_action(booking)
 
+        # Assento e tarifa ficam seguros só até o prazo de pagamento
+        Booking.holds.hold(booking)
+        minutes = int(Booking.holds.ttl.total_seconds() // 60)
         print(f"\n✅ Flight booked! Booking ID: {booking.id}")
+        print(f"⏳ Complete the payment within {minutes} minutes or the booking expires")
 
         # ============================================
         # 🔌 ADAPTER PATTERN - Processar pagamento
@@ -221,6 +243,58 @@ class BookFlightAction(ActionView):
 
         return self.parent
 
+    def _select_flight(self) -> Flight | None:
+        # Cancelados não são vendidos nem têm lista de espera
+        flight_ids = [str(k) for k, f in Flight.flights.items() if not f.cancelled]
+        flight_id = questionary.autocomplete(
+            "Type the id of the flight you want to book:(type q to go back)",
+            choices=flight_ids,
+            validate=lambda x: True
+            if x in flight_ids or x == "q"
+            else False,
+        ).ask()
+
+        if flight_id == "q" or not flight_id:
+            return None
+        return Flight.flights[int(flight_id)]
+
+    def _select_scheduled_flight(self) -> Flight | None:
+        """Escolhe um voo recorrente e a data; só aquele dia é materializado"""
+        schedule = questionary.select(
+            "Choose the recurring flight:",
+            choices=[questionary.Choice(str(s), s) for s in Flight.schedules.schedules()],
+        ).ask()
+        day = questionary.text(
+            "Departure date (dd/mm/yyyy):",
+            validate=lambda x: True
+            if re.fullmatch(r"\d{2}/\d{2}/\d{4}", x)
+            else False,
+        ).ask()
+        if schedule is None or not day:
+            return None
+
+        try:
+            flight = Flight.schedules.flight_on(schedule, datetime.strptime(day, "%d/%m/%Y").date())
+        except ValueError:
+            flight = None
+        if flight is None or flight.cancelled:
+            print("❌ This flight is not available on that date")
+            return None
+        return flight
+
+    def _offer_waitlist(self, flight: Flight, passenger_name: str, passenger_cpf: str):
+        """Oferece a lista de espera de um voo esgotado"""
+        if not questionary.confirm("Join the waitlist for this flight?").ask():
+            return
+        try:
+            entry = Booking.waitlist.join(self.user, flight, passenger_name, passenger_cpf)
+        except ValueError as e:
+            print(f"❌ Could not join the waitlist: {e}")
+            return
+        position = Booking.waitlist.position(entry)
+        print(f"📝 You are #{position} on the waitlist ({entry.tier.name.title()} priority)")
+        print("   We will book the first seat released for you")
+
     def _print_summary(self, pricing, final_price):
         """Mostra resumo do pacote"""
         table = Table(title="📋 Booking Summary")
@@ -291,6 +365,11 @@ class BookFlightAction(ActionView):
                 "cpf": booking.passenger_cpf
             }
 
+        # O prazo pode ter vencido durante os prompts: só cobra reserva ativa e ainda não paga
+        if not Booking.holds.claim(booking):
+            print("\n❌ Payment refused: this booking has expired or was already paid")
+            return False
+
         # ADAPTER EM AÇÃO - Interface unificada!
         gateway = PaymentGatewayFactory.create_gateway(payment_method)
         result = gateway.process_payment(booking.price, customer_data)
@@ -300,6 +379,8 @@ class BookFlightAction(ActionView):
             print(f"🔖 Transaction ID: {result['transaction_id']}")
             return True
         else:
+            # Sem pagamento a reserva volta a ter prazo
+            Booking.holds.hold(booking)
             print(f"\n❌ Payment failed: {result['message']}")
             return False
 
@@ -1,8 +1,8 @@
-from ycaro_airlines.views.actions.booking_actions import select_seat_action
+from ycaro_airlines.views.actions.booking_actions import book_lowest_fare, select_seat_action
 from ycaro_airlines.views.menu import ActionView, UIView
 import re
 import questionary
-from ycaro_airlines.models import Flight, Booking, Customer
+from ycaro_airlines.models import Flight, Customer
 from ycaro_airlines.views import console
 
 
@@ -15,11 +15,12 @@ class BookMultiFlightAction(ActionView):
         if not isinstance(self.user, Customer):
             raise ValueError("User must be customer")
 
+        flight_ids = [str(k) for k, f in Flight.flights.items() if not f.cancelled]
         flight_id = questionary.autocomplete(
             "Type the id of the flight you want to book:(type q to go back)",
-            choices=[str(k) for k, _ in Flight.flights.items()],
+            choices=flight_ids,
             validate=lambda x: True
-            if x in {str(k) for k, _ in Flight.flights.items()} or x == "q"
+            if x in flight_ids or x == "q"
             else False,
         ).ask()
 
@@ -34,7 +35,7 @@ class BookMultiFlightAction(ActionView):
             choices=[
                 str(k)
                 for k, _ in filter(
-                    lambda x: True if x[1].From == flight_1.To else False,
+                    lambda x: True if x[1].From == flight_1.To and not x[1].cancelled else False,
                     Flight.flights.items(),
                 )
             ],
@@ -43,7 +44,7 @@ class BookMultiFlightAction(ActionView):
             in {
                 str(k)
                 for k, _ in filter(
-                    lambda x: True if x[1].From == flight_1.To else False,
+                    lambda x: True if x[1].From == flight_1.To and not x[1].cancelled else False,
                     Flight.flights.items(),
                 )
             }
@@ -77,20 +78,19 @@ class BookMultiFlightAction(ActionView):
             print("Operation Cancelled")
             return self.parent
 
-        booking_1 = Booking(
-            flight_id=flight_1.id,
-            owner_id=self.user.id,
-            passenger_name=passenger_name,
-            passenger_cpf=passenger_cpf,
-            price=flight_1.price,
-        )
-        booking_2 = Booking(
-            flight_id=flight_2.id,
-            owner_id=self.user.id,
-            passenger_name=passenger_name,
-            passenger_cpf=passenger_cpf,
-            price=flight_1.price,
-        )
+        # Cada trecho consome a classe aberta mais barata do seu voo
+        try:
+            booking_1 = book_lowest_fare(flight_1, self.user.id, passenger_name, passenger_cpf)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return self.parent
+        try:
+            booking_2 = book_lowest_fare(flight_2, self.user.id, passenger_name, passenger_cpf)
+        except ValueError as e:
+            # Sem o segundo trecho a conexão não serve: desfaz o primeiro
+            booking_1.cancel_booking(verbose=False)
+            print(f"❌ {e}")
+            return self.parent
 
         wants_to_spend_loyalty_points = questionary.confirm(
             f"Do you wish to spend loyalty points to get a discount?(you have: {self.user.loyalty_points} loyalty points)"
@@ -9,6 +9,20 @@ from ycaro_airlines.models.flight import SeatStatus
 from ycaro_airlines.models.user import User
 
 
+def book_lowest_fare(flight: Flight, owner_id: int, passenger_name: str, passenger_cpf: str) -> Booking:
+    """Reserva na classe aberta mais barata do voo, pelo preço dela. ValueError se esgotado."""
+    if (fare_class := flight.lowest_fare_class) is None:
+        raise ValueError(f"Flight {flight.id} is sold out")
+    return Booking(
+        flight_id=flight.id,
+        owner_id=owner_id,
+        passenger_name=passenger_name,
+        passenger_cpf=passenger_cpf,
+        price=flight.fare_for(fare_class),
+        fare_class=fare_class,
+    )
+
+
 def book_flight_action(user: User):
     if not isinstance(user, Customer):
         return
@@ -47,13 +61,11 @@ def book_flight_action(user: User):
 
     # voce quer comprar essa passagem
 
-    booking = Booking(
-        flight_id=flight.id,
-        owner_id=user.id,
-        passenger_name=passenger_name,
-        passenger_cpf=passenger_cpf,
-        price=flight.price,
-    )
+    try:
+        booking = book_lowest_fare(flight, user.id, passenger_name, passenger_cpf)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
 
     wants_to_spend_loyalty_points = questionary.confirm(
         f"Do you wish to spend loyalty points to get a discount?(you have: {user.loyalty_points} loyalty points)"
@@ -149,20 +161,18 @@ def book_multi_flight_action(user: Customer):
         print("Operation Cancelled")
         return
 
-    booking_1 = Booking(
-        flight_id=flight_1.id,
-        owner_id=user.id,
-        passenger_name=passenger_name,
-        passenger_cpf=passenger_cpf,
-        price=flight_1.price,
-    )
-    booking_2 = Booking(
-        flight_id=flight_2.id,
-        owner_id=user.id,
-        passenger_name=passenger_name,
-        passenger_cpf=passenger_cpf,
-        price=flight_1.price,
-    )
+    try:
+        booking_1 = book_lowest_fare(flight_1, user.id, passenger_name, passenger_cpf)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    try:
+        booking_2 = book_lowest_fare(flight_2, user.id, passenger_name, passenger_cpf)
+    except ValueError as e:
+        # Sem o segundo trecho a conexão não serve: desfaz o primeiro
+        booking_1.cancel_booking(verbose=False)
+        print(f"❌ {e}")
+        return
 
     wants_to_spend_loyalty_points = questionary.confirm(
         f"Do you wish to spend loyalty points to get a discount?(you have: {user.loyalty_points} loyalty points)"
@@ -148,6 +148,7 @@ class SearchFlightAction(ActionView):
             "city",
             "departure date",
             "arrival date",
+            "flexible departure date",
             "flight id",
         ]
 
@@ -255,6 +256,24 @@ class SearchFlightAction(ActionView):
                     minute=0,
                 )
 
+        if "flexible departure date" in selected:
+            around = questionary.text(
+                "Departure around:(dd/mm/yyyy)", "", validate=str_can_be_date
+            ).ask()
+            flex_days = questionary.text(
+                "Plus or minus how many days? (default: 3)",
+                default="3",
+                validate=lambda x: x.isdigit(),
+            ).ask()
+
+            if around != "" and around:
+                around = list(map(lambda x: int(x), around.split("/")))
+                flight_query_params["date_departure_around"] = datetime(
+                    day=around[0], month=around[1], year=around[2]
+                )
+                flight_query_params["flex_days"] = int(flex_days or 3)
+                Flight.print_flexible_table(console=console, **flight_query_params)
+
         Flight.print_flights_table(console=console, **flight_query_params)
         wants_to_book = questionary.confirm(
             "Do you wish to book one of those flights?"
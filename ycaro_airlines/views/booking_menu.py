@@ -6,9 +6,10 @@ from typing import Callable, Tuple
 import questionary
 from ycaro_airlines.views import console, menu_factory
 from ycaro_airlines.views.menu import ActionView, UIView
-from ycaro_airlines.models.booking import Booking, BookingStatus
+from ycaro_airlines.models.booking import Booking, BookingStatus, normalize_cpf
 from ycaro_airlines.models.flight import SeatStatus
 from ycaro_airlines.models.customer import Customer
+from ycaro_airlines.models.customer_service import CustomerServiceWorker
 import re
 
 # ADAPTER para pagamentos
@@ -104,7 +105,8 @@ def check_in_action(user, booking: Booking):
             print("❌ Invalid CPF format! Use: 123.456.789-12")
             return False
 
-        if cpf_confirmation != booking.passenger_cpf:
+        # Compara os CPFs normalizados (pontuação não importa)
+        if normalize_cpf(booking.passenger_cpf) != normalize_cpf(cpf_confirmation):
             print("❌ Incorrect CPF!")
             return False
 
@@ -116,6 +118,19 @@ def check_in_action(user, booking: Booking):
         if not confirm_check_in:
             return False
 
+        return complete_check_in(user, booking)
+        
+    except ValueError as e:
+        print(f"❌ Invalid value: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Error during check-in: {e}")
+        return False
+
+
+def complete_check_in(user, booking: Booking) -> bool:
+    """Assento, check-in e pontos de fidelidade (comum ao check-in online e por CPF)"""
+    try:
         # Garantir que tem assento selecionado
         if booking.seat_id is None:
             print("⚠️  You need to select a seat first!")
@@ -136,11 +151,12 @@ def check_in_action(user, booking: Booking):
             print("❌ Couldn't check-in booking")
             return False
 
-        # Dar pontos de fidelidade
-        if isinstance(user, Customer):
+        # Dar pontos de fidelidade ao dono da reserva
+        owner = user if isinstance(user, Customer) else Customer.get(booking.owner_id)
+        if isinstance(owner, Customer):
             points = int(booking.price // 10)
-            user.gain_loyalty_points(points)
-            print(f"✅ You earned {points} loyalty points!")
+            owner.gain_loyalty_points(points)
+            print(f"✅ {owner.username} earned {points} loyalty points!")
 
         return True
         
@@ -152,6 +168,62 @@ def check_in_action(user, booking: Booking):
         return False
 
 
+class CpfCheckInAction(ActionView):
+    """
+    Check-in pelo CPF do passageiro (totem e balcão).
+
+    Busca as reservas direto no índice de CPF. Atendentes veem as reservas
+    de qualquer cliente; clientes só as próprias.
+    """
+    title: str = "Check-in by CPF"
+
+    def operation(self) -> UIView | None:
+        try:
+            if self.user is None:
+                raise ValueError("User must be logged")
+
+            cpf = questionary.text(
+                "Passenger CPF (format: 123.456.789-12): (type 'q' to go back)",
+                validate=lambda x: x == "q" or normalize_cpf(x) is not None and len(normalize_cpf(x)) == 11,
+            ).ask()
+
+            if not cpf or cpf == "q":
+                return self.parent
+
+            bookings = [b for b in Booking.find_by_cpf(cpf) if b.can_check_in()]
+            if not isinstance(self.user, CustomerServiceWorker):
+                bookings = [b for b in bookings if b.owner_id == self.user.id]
+
+            if not bookings:
+                print("📋 No bookings awaiting check-in for this CPF")
+                questionary.press_any_key_to_continue().ask()
+                return self.parent
+
+            console.print(Booking._bookings_table(Booking.joined_rows(bookings)))
+
+            booking = questionary.select(
+                "Select the booking to check-in:",
+                choices=[
+                    questionary.Choice(f"{b.id} - {b.passenger_name} (flight {b.flight_id})", b)
+                    for b in bookings
+                ],
+            ).ask()
+
+            if booking is None:
+                return self.parent
+
+            if complete_check_in(self.user, booking):
+                booking.print_booking_table(console)
+
+            questionary.press_any_key_to_continue().ask()
+            return self.parent
+
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            questionary.press_any_key_to_continue().ask()
+            return self.parent
+
+
 class BookingMenu(ActionView):
     title: str = "See Bookings"
 
@@ -402,6 +474,12 @@ Have a nice flight! ✈️
                 questionary.press_any_key_to_continue().ask()
                 return
 
+            # O prazo pode ter vencido durante os prompts: só cobra reserva ativa e ainda não paga
+            if not Booking.holds.claim(booking):
+                console.print("\n❌ Payment refused: this booking has expired or was already paid", style="bold red")
+                questionary.press_any_key_to_continue().ask()
+                return
+
             # ADAPTER EM AÇÃO - Criar gateway apropriado
             print("\n⏳ Processing payment...")
             gateway = PaymentGatewayFactory.create_gateway(payment_method)
@@ -419,6 +497,8 @@ Have a nice flight! ✈️
                     console.print("• Pay at any bank or authorized agent")
                     console.print("• Payment confirmation: up to 2 business days")
             else:
+                # Sem pagamento a reserva volta a ter prazo
+                Booking.holds.hold(booking)
                 console.print(f"\n❌ {result['message']}", style="bold red")
 
             questionary.press_any_key_to_continue().ask()
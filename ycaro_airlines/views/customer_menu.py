@@ -1,4 +1,4 @@
-from ycaro_airlines.views.booking_menu import BookingMenu
+from ycaro_airlines.views.booking_menu import BookingMenu, CpfCheckInAction
 from ycaro_airlines.views.flight_menu import FlightsMenu
 from ycaro_airlines.views.menu import MenuView, UIView
 from ycaro_airlines.models.user import User
@@ -12,6 +12,7 @@ class CustomerMenu(MenuView):
         self.children: list[UIView] = [
             FlightsMenu(user, self),
             BookingMenu(user, self),
+            CpfCheckInAction(user, self),
             LoyaltyMenu(user, self),
         ]
         super().__init__(user, parent, self.children)
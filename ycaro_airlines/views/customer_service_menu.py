@@ -0,0 +1,14 @@
+from ycaro_airlines.views.booking_menu import CpfCheckInAction
+from ycaro_airlines.views.menu import MenuView, UIView
+from ycaro_airlines.models.user import User
+
+
+class CustomerServiceMenu(MenuView):
+    title: str = "Customer Service Menu"
+
+    def __init__(self, user: User, parent) -> None:
+        self.children: list[UIView] = [
+            # Balcão: check-in de qualquer passageiro pelo CPF
+            CpfCheckInAction(user, self),
+        ]
+        super().__init__(user, parent, self.children)